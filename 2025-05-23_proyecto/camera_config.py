@@ -0,0 +1,34 @@
+"""
+Configuración de cámara y de resolución de inferencia de GESTIK
+"""
+
+# Cámara
+CAMERA_INDEX = 0
+CAMERA_WIDTH = 1280
+CAMERA_HEIGHT = 720
+
+# Resolución con la que se alimentan los modelos de MediaPipe.
+# - (ancho, alto): se redimensiona el frame una vez, conservando el aspecto
+# - None: se usa el frame completo de la cámara
+# - "auto": se elige la menor resolución que mantenga la confianza objetivo
+INFERENCE_RESOLUTION = (640, 360)
+
+# Resoluciones candidatas para el modo automático (de menor a mayor)
+INFERENCE_RESOLUTIONS = [(480, 270), (640, 360), (960, 540), (1280, 720)]
+
+# Confianza mínima de detección que debe mantener el modo automático
+AUTO_TARGET_CONFIDENCE = 0.8
+
+# Tras detectar una mano, procesar solo un recorte alrededor de ella
+# (hand_roi_benchmark.py mide si compensa en cada equipo)
+HAND_ROI_TRACKING = True
+
+# Exportador de métricas Prometheus/OpenMetrics (None: desactivado)
+METRICS_EXPORTER_PORT = 9108
+
+# Modelo de pose (Hollow Knight): complejidad 0 (lite), 1 (full) o 2 (heavy).
+# Con POSE_AUTO_DOWNGRADE se baja la complejidad si el modelo excede el
+# presupuesto de tiempo por frame (ver pose_benchmark.py para comparar)
+POSE_MODEL_COMPLEXITY = 1
+POSE_AUTO_DOWNGRADE = True
+POSE_FRAME_BUDGET_MS = 25
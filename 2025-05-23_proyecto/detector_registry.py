@@ -0,0 +1,124 @@
+"""
+Registro de detectores de MediaPipe por estado del juego
+Declara qué modelos necesita cada GameState, los construye de forma perezosa
+la primera vez que se requieren y en cada frame solo ejecuta esos modelos.
+"""
+import numpy as np
+from mediapipe.python.solutions.hands import Hands
+
+from camera_config import HAND_ROI_TRACKING
+from game_states import GameState
+from hand_roi import HandROITracker
+from pose_backend import PoseBackend
+from stage_tracer import StageTracer
+
+
+def create_hands():
+    """Detector de manos: una sola mano para reducir cómputo"""
+    hands = Hands(
+        static_image_mode=False,
+        max_num_hands=1,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5,
+    )
+    if HAND_ROI_TRACKING:
+        # Entre detecciones solo se procesa un recorte alrededor de la mano
+        return HandROITracker(hands)
+    return hands
+
+
+def create_pose():
+    """Detector de pose corporal con la complejidad de camera_config"""
+    return PoseBackend()
+
+
+DETECTOR_FACTORIES = {
+    "hands": create_hands,
+    "pose": create_pose,
+}
+
+
+def hands_confidence(results):
+    """Confianza de la mano detectada (None si no hay mano)"""
+    if not results.multi_handedness:
+        return None
+    return min(hand.classification[0].score for hand in results.multi_handedness)
+
+
+def pose_confidence(results):
+    """Visibilidad promedio de los landmarks de pose (None si no hay persona)"""
+    if not results.pose_landmarks:
+        return None
+    landmarks = results.pose_landmarks.landmark
+    return sum(lm.visibility for lm in landmarks) / len(landmarks)
+
+
+DETECTOR_CONFIDENCE = {
+    "hands": hands_confidence,
+    "pose": pose_confidence,
+}
+
+# Detectores que consume cada estado; Hollow Knight ignora las manos
+# y los demás modos no usan la pose
+STATE_DETECTORS = {
+    GameState.MAIN_MENU: ("hands",),
+    GameState.DINO_GAME: ("hands",),
+    GameState.LABERINTO_GAME: ("hands",),
+    GameState.HOLLOW_KNIGHT: ("pose",),
+    GameState.CLOSED: (),
+}
+
+
+class DetectorRegistry:
+    def __init__(self, factories=None, state_detectors=None, tracer=None):
+        self.factories = factories or DETECTOR_FACTORIES
+        self.state_detectors = state_detectors or STATE_DETECTORS
+        # Cada modelo se mide como una etapa con su propio nombre
+        self.tracer = tracer or StageTracer(enabled=False)
+        self._detectors = {}
+
+    def required(self, state):
+        """Nombres de los detectores que necesita un estado"""
+        return self.state_detectors.get(state, ())
+
+    def get(self, name, warmup_shape=None):
+        """Retorna el detector, construyéndolo y calentándolo si aún no existe"""
+        detector = self._detectors.get(name)
+        if detector is None:
+            print(f"Inicializando detector '{name}'...")
+            detector = self.factories[name]()
+            if warmup_shape is not None:
+                # Una inferencia en vacío inicializa el grafo antes del primer frame real
+                detector.process(np.zeros(warmup_shape, dtype=np.uint8))
+            self._detectors[name] = detector
+        return detector
+
+    def prepare(self, state, warmup_shape=(720, 1280, 3)):
+        """Construye y calienta por adelantado los detectores de un estado"""
+        for name in self.required(state):
+            self.get(name, warmup_shape)
+
+    def run(self, state, image_rgb):
+        """Ejecuta solo los detectores del estado; retorna {nombre: resultados}"""
+        results = {}
+        for name in self.required(state):
+            detector = self.get(name)
+            with self.tracer.span(name):
+                results[name] = detector.process(image_rgb)
+        return results
+
+    def confidence(self, results):
+        """Menor confianza entre los detectores que encontraron algo (o None)"""
+        scores = [
+            DETECTOR_CONFIDENCE[name](output)
+            for name, output in results.items()
+            if name in DETECTOR_CONFIDENCE
+        ]
+        scores = [score for score in scores if score is not None]
+        return min(scores) if scores else None
+
+    def close(self):
+        """Libera los recursos de todos los detectores construidos"""
+        for detector in self._detectors.values():
+            detector.close()
+        self._detectors = {}
@@ -0,0 +1,148 @@
+"""
+Pipeline por etapas para GESTIK: captura → inferencia → render
+Cada etapa corre en su propio hilo y se comunica con la siguiente mediante
+colas acotadas que descartan el elemento más antiguo. Así una etapa lenta
+nunca bloquea a las demás y la interfaz solo muestra el último frame listo.
+"""
+import threading
+import time
+from collections import deque
+
+
+class LatestQueue:
+    """Cola acotada que descarta el elemento más antiguo cuando está llena"""
+
+    def __init__(self, maxsize=1):
+        self._items = deque(maxlen=maxsize)
+        self._condition = threading.Condition()
+        self._closed = False
+        self.dropped = 0  # Elementos descartados por llegar uno más nuevo
+
+    def put(self, item):
+        """Agrega un elemento, descartando el más antiguo si no hay espacio"""
+        with self._condition:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._condition.notify()
+
+    def get(self, timeout=None):
+        """Espera un elemento; retorna None si expira el tiempo o se cerró la cola"""
+        with self._condition:
+            if not self._items and not self._closed:
+                self._condition.wait(timeout)
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def get_nowait(self):
+        """Retorna el elemento más antiguo disponible o None sin bloquear"""
+        with self._condition:
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def close(self):
+        """Despierta a los consumidores en espera para que puedan terminar"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class FramePipeline:
+    """
+    Conecta tres etapas en hilos dedicados:
+    - read_frame(): retorna un frame de la cámara o None
+    - infer(frame, captured_ns): ejecuta los modelos y la lógica de juego;
+      captured_ns es el perf_counter_ns del momento de captura del frame
+    - render(inference): dibuja overlays y retorna el frame final
+    El hilo de tkinter solo consulta latest_frame() para mostrarlo.
+    """
+
+    def __init__(self, read_frame, infer, render, queue_size=1):
+        self.read_frame = read_frame
+        self.infer = infer
+        self.render = render
+
+        self.captured = LatestQueue(queue_size)
+        self.inferred = LatestQueue(queue_size)
+        self.rendered = LatestQueue(1)
+
+        self.running = False
+        self._threads = []
+
+    def start(self):
+        """Lanza los hilos de captura, inferencia y render"""
+        if self.running:
+            return
+        self.running = True
+        stages = (
+            ("captura", self._capture_loop),
+            ("inferencia", self._inference_loop),
+            ("render", self._render_loop),
+        )
+        for name, target in stages:
+            thread = threading.Thread(target=target, name=f"gestik-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=1.0):
+        """Detiene las etapas y espera a que terminen sus hilos"""
+        self.running = False
+        for queue in (self.captured, self.inferred, self.rendered):
+            queue.close()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def latest_frame(self):
+        """Retorna el último frame renderizado (o None si no hay uno nuevo)"""
+        return self.rendered.get_nowait()
+
+    def dropped_frames(self):
+        """Frames descartados por etapa al llegar uno más reciente"""
+        return {
+            "captura": self.captured.dropped,
+            "inferencia": self.inferred.dropped,
+            "render": self.rendered.dropped,
+        }
+
+    def _capture_loop(self):
+        while self.running:
+            try:
+                frame = self.read_frame()
+            except Exception as e:
+                print(f"Error capturando frame: {e}")
+                frame = None
+            if frame is None:
+                # Evitar un ciclo ocupado si la cámara no entrega frames
+                time.sleep(0.005)
+                continue
+            # El instante de captura viaja con el frame para medir la latencia total
+            self.captured.put((frame, time.perf_counter_ns()))
+
+    def _inference_loop(self):
+        while self.running:
+            captured = self.captured.get(timeout=0.1)
+            if captured is None:
+                continue
+            try:
+                inference = self.infer(*captured)
+            except Exception as e:
+                print(f"Error en inferencia: {e}")
+                continue
+            if inference is not None:
+                self.inferred.put(inference)
+
+    def _render_loop(self):
+        while self.running:
+            inference = self.inferred.get(timeout=0.1)
+            if inference is None:
+                continue
+            try:
+                frame = self.render(inference)
+            except Exception as e:
+                print(f"Error renderizando frame: {e}")
+                continue
+            if frame is not None:
+                self.rendered.put(frame)
@@ -0,0 +1,243 @@
+"""
+Fuentes de frames para GESTIK
+La aplicación lee frames de una fuente con read()/release() en lugar de usar
+cv2.VideoCapture directamente:
+- CameraSource: la cámara en vivo
+- VideoFileSource: un video grabado
+- LandmarkReplaySource: un flujo de landmarks guardado (.npz); entrega frames
+  vacíos y reemplaza a los detectores de MediaPipe por los resultados grabados
+- LandmarkRecorder: envuelve otra fuente y graba su flujo de landmarks
+
+Las fuentes grabadas se reproducen a su velocidad original (realtime=True) o
+tan rápido como sea posible, y exponen timestamp_ms (instante del frame dentro
+de la grabación) para que los temporizadores vean el tiempo de la grabación.
+
+Formato del flujo de landmarks (.npz, una fila por frame, NaN si no hubo detección):
+    t_ms (n,) float64, frame_size (alto, ancho),
+    hands (n, 21, 3) float32, hand_score (n,) float32,
+    pose (n, 33, 4) float32 (x, y, z, visibilidad)
+"""
+import time
+from abc import ABC, abstractmethod
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+from mediapipe.framework.formats import classification_pb2, landmark_pb2
+
+from camera_config import CAMERA_HEIGHT, CAMERA_INDEX, CAMERA_WIDTH
+
+HAND_POINTS = 21
+POSE_POINTS = 33
+
+
+class FrameSource(ABC):
+    """Interfaz común: read() retorna un frame BGR o None al terminar"""
+
+    timestamp_ms = None  # None: tiempo real (cámara)
+    detector_factories = None  # Reemplazo de DETECTOR_FACTORIES (solo replay)
+
+    def __init__(self, realtime=True):
+        self.realtime = realtime
+        self._start = None
+
+    def _pace(self, timestamp_ms):
+        """En modo realtime espera hasta el instante del frame en la grabación"""
+        self.timestamp_ms = timestamp_ms
+        if not self.realtime:
+            return
+        now = time.perf_counter()
+        if self._start is None:
+            self._start = now - timestamp_ms / 1000
+        delay = self._start + timestamp_ms / 1000 - now
+        if delay > 0:
+            time.sleep(delay)
+
+    @abstractmethod
+    def read(self):
+        """Siguiente frame BGR, o None al terminar la fuente"""
+
+    def release(self):
+        pass
+
+
+class CameraSource(FrameSource):
+    def __init__(self, index=CAMERA_INDEX, width=CAMERA_WIDTH, height=CAMERA_HEIGHT):
+        super().__init__(realtime=True)
+        self.capture = cv2.VideoCapture(index)
+        self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+    def read(self):
+        ret, frame = self.capture.read()
+        return frame if ret else None
+
+    def release(self):
+        self.capture.release()
+
+
+class VideoFileSource(FrameSource):
+    def __init__(self, path, realtime=True, max_frames=None):
+        super().__init__(realtime)
+        self.path = path
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            raise OSError(f"No se pudo abrir el video: {path}")
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 30.0
+        self.max_frames = max_frames
+        self.index = 0
+
+    def read(self):
+        if self.max_frames is not None and self.index >= self.max_frames:
+            return None
+        ret, frame = self.capture.read()
+        if not ret:
+            return None
+        self._pace(self.index * 1000 / self.fps)
+        self.index += 1
+        return frame
+
+    def release(self):
+        self.capture.release()
+
+
+def _landmark_list(points):
+    landmarks = landmark_pb2.NormalizedLandmarkList()
+    for point in points.tolist():
+        landmark = landmarks.landmark.add()
+        landmark.x, landmark.y, landmark.z = point[:3]
+        if len(point) > 3:
+            landmark.visibility = point[3]
+    return landmarks
+
+
+class _ReplayDetector:
+    """Detector que retorna los resultados grabados del frame actual"""
+
+    def __init__(self, source, name):
+        self.source = source
+        self.name = name
+
+    def process(self, image_rgb):
+        index = self.source.index - 1
+        if self.name == "hands":
+            points = self.source.hands[index]
+            if np.isnan(points[0, 0]):
+                return SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+            handedness = classification_pb2.ClassificationList()
+            handedness.classification.add(score=float(self.source.hand_score[index]))
+            return SimpleNamespace(multi_hand_landmarks=[_landmark_list(points)], multi_handedness=[handedness])
+
+        points = self.source.pose[index]
+        if np.isnan(points[0, 0]):
+            return SimpleNamespace(pose_landmarks=None)
+        return SimpleNamespace(pose_landmarks=_landmark_list(points))
+
+    def close(self):
+        pass
+
+
+class LandmarkReplaySource(FrameSource):
+    def __init__(self, path, realtime=True, max_frames=None):
+        super().__init__(realtime)
+        self.path = path
+        with np.load(path) as data:
+            self.t_ms = data["t_ms"]
+            self.hands = data["hands"]
+            self.hand_score = data["hand_score"]
+            self.pose = data["pose"]
+            height, width = data["frame_size"]
+        self.length = len(self.t_ms) if max_frames is None else min(max_frames, len(self.t_ms))
+        self.index = 0
+        # Frame vacío reutilizado (nadie lo modifica: infer_frame trabaja sobre la copia volteada)
+        self.frame = np.zeros((height, width, 3), dtype=np.uint8)
+        self.detector_factories = {
+            "hands": lambda: _ReplayDetector(self, "hands"),
+            "pose": lambda: _ReplayDetector(self, "pose"),
+        }
+
+    def read(self):
+        if self.index >= self.length:
+            return None
+        self._pace(self.t_ms[self.index] - self.t_ms[0])
+        self.index += 1
+        return self.frame
+
+
+class LandmarkRecorder(FrameSource):
+    """
+    Envuelve otra fuente y graba los resultados de los detectores como flujo
+    de landmarks: cada read() abre la fila del frame y los detectores
+    envueltos (detector_factories) la completan.
+    """
+
+    def __init__(self, source, factories):
+        super().__init__(source.realtime)
+        self.source = source
+        self.detector_factories = {
+            name: (lambda factory=factory, name=name: _RecordingDetector(factory(), self, name))
+            for name, factory in factories.items()
+        }
+        self.frame_size = None
+        self.t_ms = []
+        self.hands = []
+        self.hand_score = []
+        self.pose = []
+
+    def read(self):
+        frame = self.source.read()
+        if frame is None:
+            return None
+        self.timestamp_ms = self.source.timestamp_ms
+        self.frame_size = frame.shape[:2]
+        self.t_ms.append(self.timestamp_ms or 0.0)
+        self.hands.append(np.full((HAND_POINTS, 3), np.nan, dtype=np.float32))
+        self.hand_score.append(np.nan)
+        self.pose.append(np.full((POSE_POINTS, 4), np.nan, dtype=np.float32))
+        return frame
+
+    def release(self):
+        self.source.release()
+
+    def save(self, path):
+        np.savez(
+            path,
+            t_ms=np.array(self.t_ms, dtype=np.float64),
+            frame_size=np.array(self.frame_size),
+            hands=np.array(self.hands, dtype=np.float32).reshape(-1, HAND_POINTS, 3),
+            hand_score=np.array(self.hand_score, dtype=np.float32),
+            pose=np.array(self.pose, dtype=np.float32).reshape(-1, POSE_POINTS, 4),
+        )
+        return path
+
+
+class _RecordingDetector:
+    def __init__(self, detector, recorder, name):
+        self.detector = detector
+        self.recorder = recorder
+        self.name = name
+
+    def process(self, image_rgb):
+        results = self.detector.process(image_rgb)
+        if not self.recorder.t_ms:
+            return results  # Calentamiento antes del primer frame
+        if self.name == "hands" and results.multi_hand_landmarks:
+            landmarks = results.multi_hand_landmarks[0].landmark
+            self.recorder.hands[-1][:] = [(lm.x, lm.y, lm.z) for lm in landmarks]
+            self.recorder.hand_score[-1] = results.multi_handedness[0].classification[0].score
+        elif self.name == "pose" and results.pose_landmarks:
+            landmarks = results.pose_landmarks.landmark
+            self.recorder.pose[-1][:] = [(lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks]
+        return results
+
+    def close(self):
+        self.detector.close()
+
+
+def open_source(spec, realtime=True, max_frames=None):
+    """Índice de cámara, video o flujo de landmarks (.npz) → FrameSource"""
+    if isinstance(spec, int) or str(spec).isdigit():
+        return CameraSource(int(spec))
+    if str(spec).endswith(".npz"):
+        return LandmarkReplaySource(spec, realtime, max_frames)
+    return VideoFileSource(spec, realtime, max_frames)
@@ -0,0 +1,280 @@
+"""
+Motor de reglas de gestos basado en tabla
+Los gestos se declaran como niveles por dedo (extendido, doblado, relajado...)
+más la dirección del pulgar y la orientación del índice. Cada nivel tiene sus
+propios umbrales, los mismos que usaban las reglas originales de
+GestureDetector, así que cada gesto conserva exactamente su comportamiento.
+Clasificar un frame consiste en evaluar los niveles de cada dedo, armar el
+código con los gestos que coinciden y leer el ganador en una tabla compilada
+una sola vez, sin importar cuántos gestos haya declarados.
+
+Las reglas se solapan (un puño con el pulgar afuera también es pulgar
+derecha), así que cada estado del juego tiene su propia tabla con solo los
+gestos que consulta, en el orden de sus manejadores (STATE_GESTURES).
+"""
+import numpy as np
+
+from hand_features import INDEX
+
+# Dedos largos a los que se aplican los niveles
+FINGER_NAMES = ("index", "middle", "ring", "pinky")
+
+# Dirección del pulgar
+THUMB_DIRECTIONS = {"none": 0, "left": 1, "right": 2}
+
+# Umbrales de las reglas (coordenadas normalizadas)
+FINGER_THRESHOLDS = {
+    "extended_pip": 0.02,      # rock, paz, mano abierta: punta por encima de la PIP
+    "extended_mcp": 0.04,      # mano abierta: además por encima de la MCP
+    "folded_pip": 0.02,        # rock, paz: punta claramente por debajo de la PIP
+    "raised_pip": 0.025,       # apuntar arriba, meñique arriba: dedo levantado
+    "relaxed_pip": 0.0125,     # apuntar, meñique: los otros dedos no tan extendidos
+    "index_folded_pip": 0.025, # apuntar abajo: punta del índice bajo la PIP
+    "open_folded_mcp": 0.01,   # mano abierta: dedo claramente doblado (bajo la MCP)
+    "fist_mcp": 0.02,          # puño: punta por debajo de la MCP...
+    "fist_extended_pip": 0.03, # ...y ningún dedo claramente extendido
+    "thumb": 0.025,            # Desplazamiento horizontal del pulgar respecto a IP y MCP
+    "index_down": 0.025,       # Punta del índice por debajo de la muñeca
+}
+
+# Niveles por dedo: condiciones (característica, comparación, umbral) que deben
+# cumplirse todas. El umbral es un nombre de FINGER_THRESHOLDS ("-" delante lo
+# niega) o un número. tip_pip / tip_mcp: y de la punta - y de la articulación.
+FINGER_LEVELS = {
+    "extended": (("tip_pip", "<", "-extended_pip"),),
+    "folded": (("tip_pip", ">", "folded_pip"),),
+    "raised": (("tip_pip", "<", "-raised_pip"),),
+    "relaxed": (("tip_pip", ">", "-relaxed_pip"),),
+    "below_pip": (("tip_pip", ">", 0.0),),
+    "index_folded": (("tip_pip", ">", "index_folded_pip"),),
+    "open_extended": (("tip_pip", "<", "-extended_pip"), ("tip_mcp", "<", "-extended_mcp")),
+    "open_folded": (("tip_mcp", ">", "open_folded_mcp"),),
+    "fist_folded": (("tip_mcp", ">=", "fist_mcp"), ("tip_pip", ">=", "-fist_extended_pip")),
+}
+
+FEATURES = ("tip_pip", "tip_mcp")
+HAND_FLAGS = ("thumb_right", "thumb_left", "index_down")
+
+# Especificación declarativa; el orden define la prioridad si varias reglas coinciden.
+# - fingers: nivel requerido por dedo (los no declarados aceptan cualquier estado)
+# - thumb: dirección requerida del pulgar
+# - index_down: la punta del índice debe estar por debajo de la muñeca
+# - min_count / max_count: cantidad de dedos largos en un nivel
+# - cooldown: grupo de cooldown compartido; label/action: texto para la interfaz
+GESTURE_SPEC = [
+    {
+        "name": "rock", "label": "signo rock",
+        "fingers": {"index": "extended", "middle": "folded", "ring": "folded", "pinky": "extended"},
+    },
+    {
+        "name": "peace", "label": "signo de paz",
+        "fingers": {"index": "extended", "middle": "extended", "ring": "folded", "pinky": "folded"},
+    },
+    {
+        "name": "open_hand", "label": "mano abierta",
+        "min_count": {"open_extended": 3}, "max_count": {"open_folded": 1},
+        "cooldown": "open_hand", "action": "seleccionar", "actions": {"DINO_GAME": "saltar"},
+    },
+    {
+        "name": "pointing_up", "label": "apuntar arriba",
+        "fingers": {"index": "raised", "middle": "relaxed", "ring": "relaxed", "pinky": "relaxed"},
+        "cooldown": "pointing", "action": "opción anterior",
+    },
+    {
+        "name": "pointing_down", "label": "apuntar abajo",
+        "fingers": {"index": "index_folded", "middle": "relaxed", "ring": "relaxed", "pinky": "relaxed"},
+        "index_down": True,
+        "cooldown": "pointing", "action": "siguiente opción",
+    },
+    {
+        "name": "pinky_up", "label": "meñique arriba",
+        "fingers": {"index": "relaxed", "middle": "relaxed", "ring": "relaxed", "pinky": "raised"},
+        "cooldown": "pointing", "action": "izquierda",
+    },
+    {
+        "name": "thumb_right", "label": "pulgar derecha",
+        "fingers": {"index": "below_pip", "middle": "below_pip", "ring": "below_pip", "pinky": "below_pip"},
+        "thumb": "right",
+        "cooldown": "pointing", "action": "derecha",
+    },
+    {
+        "name": "thumb_left", "label": "pulgar izquierda",
+        "fingers": {"index": "below_pip", "middle": "below_pip", "ring": "below_pip", "pinky": "below_pip"},
+        "thumb": "left",
+        "cooldown": "pointing", "action": "izquierda",
+    },
+    {
+        "name": "fist", "label": "puno",
+        "fingers": {"index": "fist_folded", "middle": "fist_folded", "ring": "fist_folded",
+                    "pinky": "fist_folded"},
+        "cooldown": "fist", "action": "detectado",
+    },
+]
+
+# Gestos que consulta cada estado, en el orden en que los revisan sus
+# manejadores en main.py; rock y paz (sostenidos) se evalúan aparte en todos
+STATE_GESTURES = {
+    "MAIN_MENU": ("pointing_up", "pointing_down", "open_hand", "fist"),
+    "DINO_GAME": ("open_hand", "fist"),
+    "LABERINTO_GAME": ("pointing_up", "open_hand", "pinky_up", "thumb_right"),
+}
+
+
+def _resolve(threshold, thresholds):
+    """Umbral de una condición: nombre de FINGER_THRESHOLDS (con "-" opcional) o número"""
+    if isinstance(threshold, str):
+        return -thresholds[threshold[1:]] if threshold.startswith("-") else thresholds[threshold]
+    return threshold
+
+
+class GestureTable:
+    """Especificación compilada: máscaras de niveles por regla y tabla ganador por código
+
+    El código de un frame tiene un bit por regla (bit g = la regla g coincide),
+    así que la tabla de ganadores tiene 2**reglas entradas. winner usa el orden
+    de la especificación; state_winners, el de los gestos de cada estado.
+    """
+
+    def __init__(self, spec, thresholds, state_gestures=None):
+        self.spec = spec
+        self.thresholds = thresholds
+        self.names = [rule["name"] for rule in spec]
+        self.rules = {rule["name"]: rule for rule in spec}
+        self._positions = {name: g for g, name in enumerate(self.names)}
+
+        # Solo se evalúan los niveles que usa la especificación
+        used = set()
+        for rule in spec:
+            used.update(rule.get("fingers", {}).values())
+            used.update(rule.get("min_count", {}))
+            used.update(rule.get("max_count", {}))
+        self.levels = [name for name in FINGER_LEVELS if name in used]
+        rules, levels, fingers = len(spec), len(self.levels), len(FINGER_NAMES)
+
+        # Condiciones de todos los niveles en arreglos planos; "<" y "<=" se
+        # convierten en ">" y ">=" cambiando el signo del valor y del umbral, y
+        # "v >= t" se evalúa como "v > t'" con t' el float inmediatamente menor
+        conditions = [(l, feature, op, _resolve(threshold, thresholds))
+                      for l, name in enumerate(self.levels)
+                      for feature, op, threshold in FINGER_LEVELS[name]]
+        self._cond_feature = np.array([FEATURES.index(c[1]) for c in conditions], dtype=np.intp)
+        self._cond_sign = np.array([1.0 if c[2].startswith(">") else -1.0 for c in conditions])
+        threshold = self._cond_sign * np.array([c[3] for c in conditions], dtype=np.float64)
+        inclusive = np.array([c[2].endswith("=") for c in conditions])
+        self._cond_threshold = np.where(inclusive, np.nextafter(threshold, -np.inf), threshold)
+        # cond_level[c, l] = la condición c pertenece al nivel l
+        self._cond_level = np.zeros((len(conditions), levels), dtype=np.int64)
+        for c, condition in enumerate(conditions):
+            self._cond_level[c, condition[0]] = 1
+        self._level_size = self._cond_level.sum(axis=0)
+
+        # Requisitos por regla: niveles de cada dedo, condiciones de la mano
+        # (pulgar a la derecha, a la izquierda, índice bajo la muñeca) y conteos
+        # de dedos en un nivel ("al menos k" como conteo > k - 1, "a lo sumo k"
+        # como -conteo > -(k + 1))
+        counts = sorted({(level, "min", k) for rule in spec for level, k in rule.get("min_count", {}).items()}
+                        | {(level, "max", k) for rule in spec for level, k in rule.get("max_count", {}).items()})
+        self._count_level = np.array([self.levels.index(c[0]) for c in counts], dtype=np.intp)
+        self._count_sign = np.array([1 if c[1] == "min" else -1 for c in counts], dtype=np.int64)
+        self._count_threshold = np.array([c[2] - 1 if c[1] == "min" else -(c[2] + 1) for c in counts],
+                                         dtype=np.int64)
+
+        required = np.zeros((rules, fingers, levels), dtype=bool)
+        required_hand = np.zeros((rules, len(HAND_FLAGS)), dtype=bool)
+        required_count = np.zeros((rules, len(counts)), dtype=bool)
+        for g, rule in enumerate(spec):
+            for finger, level in rule.get("fingers", {}).items():
+                required[g, FINGER_NAMES.index(finger), self.levels.index(level)] = True
+            if "thumb" in rule:
+                required_hand[g, HAND_FLAGS.index("thumb_" + rule["thumb"])] = True
+            if rule.get("index_down"):
+                required_hand[g, HAND_FLAGS.index("index_down")] = True
+            for level, k in rule.get("min_count", {}).items():
+                required_count[g, counts.index((level, "min", k))] = True
+            for level, k in rule.get("max_count", {}).items():
+                required_count[g, counts.index((level, "max", k))] = True
+        self._required = required.reshape(rules, fingers * levels).T.copy()
+        self._required_hand = required_hand.T.copy()
+        self._required_count = required_count.T.copy()
+        self._rule_bits = np.int64(1) << np.arange(rules, dtype=np.int64)
+
+        # winner[code] = índice de la regla con mayor prioridad entre las que coinciden (-1 = ninguna)
+        membership = (np.arange(2 ** rules)[:, None] >> np.arange(rules)) & 1
+        self.winner = np.where(membership.any(axis=1), membership.argmax(axis=1), -1).astype(np.int16)
+
+        # Nombre por código como tupla para búsquedas escalares sin numpy
+        self._names_by_code = tuple(
+            self.names[g] if g >= 0 else None for g in self.winner.tolist()
+        )
+
+        # Por estado: gestos del estado que coinciden con cada código, en el
+        # orden del estado, y el primero de ellos como índice de regla
+        self.state_gestures = dict(state_gestures or {})
+        self._candidates = {}
+        self.state_winners = {}
+        for state, names in self.state_gestures.items():
+            order = [self._positions[name] for name in names]
+            candidates = tuple(
+                tuple(self.names[g] for g in order if code >> g & 1) for code in range(2 ** rules)
+            )
+            self._candidates[state] = candidates
+            self.state_winners[state] = np.array(
+                [self._positions[c[0]] if c else -1 for c in candidates], dtype=np.int16)
+
+    def encode(self, features):
+        """Calcula el código de gestos que coinciden (escalar o por lote)"""
+        t = self.thresholds
+        values = np.stack((features.tip_pip[..., INDEX:], features.tip_mcp[..., INDEX:]), axis=-1)
+
+        # Niveles por dedo: (..., 4, niveles)
+        passed = values[..., self._cond_feature] * self._cond_sign > self._cond_threshold
+        levels = (passed @ self._cond_level) == self._level_size
+
+        # Condiciones de la mano y conteos de dedos por nivel
+        thumb, index_down = t["thumb"], t["index_down"]
+        if np.ndim(features.index_below_wrist) == 0:
+            # Una sola mano: comparaciones escalares, sin arreglos intermedios
+            dx_ip, dx_mcp = float(features.thumb_dx_ip), float(features.thumb_dx_mcp)
+            hand = np.array((dx_ip > thumb and dx_mcp > thumb, dx_ip < -thumb and dx_mcp < -thumb,
+                             float(features.index_below_wrist) > index_down))
+        else:
+            hand = np.stack((
+                (features.thumb_dx_ip > thumb) & (features.thumb_dx_mcp > thumb),
+                (features.thumb_dx_ip < -thumb) & (features.thumb_dx_mcp < -thumb),
+                features.index_below_wrist > index_down,
+            ), axis=-1)
+        counted = levels[..., self._count_level].sum(axis=-2) * self._count_sign > self._count_threshold
+
+        # Una regla coincide si no le falta ninguna condición
+        missing = ~levels.reshape(levels.shape[:-2] + (-1,))
+        matched = ~((missing @ self._required) | (~hand @ self._required_hand)
+                    | (~counted @ self._required_count))
+        return matched @ self._rule_bits
+
+    def classify_code(self, code, state=None):
+        """Gesto ganador de un código (None si ninguno coincide); con state, solo entre los del estado"""
+        if state is None:
+            return self._names_by_code[int(code)]
+        candidates = self._candidates[state][int(code)]
+        return candidates[0] if candidates else None
+
+    def classify(self, features, state=None):
+        """Gesto ganador para unas características de la mano"""
+        return self.classify_code(self.encode(features), state)
+
+    def candidates(self, code, state):
+        """Gestos del estado que coinciden con el código, en el orden del estado"""
+        return self._candidates[state][int(code)]
+
+    def matches(self, code, name):
+        """Indica si un gesto coincide con el código, aunque no sea el ganador"""
+        return bool((int(code) >> self._positions[name]) & 1)
+
+
+def compile_rules(spec=GESTURE_SPEC, thresholds=FINGER_THRESHOLDS, state_gestures=STATE_GESTURES):
+    """Compila una especificación de gestos en una GestureTable"""
+    return GestureTable(spec, thresholds, state_gestures)
+
+
+# Tabla por defecto, compilada una vez al importar el módulo
+GESTURE_TABLE = compile_rules()
@@ -0,0 +1,59 @@
+"""
+Extracción vectorizada de características de la mano
+Convierte los 21 landmarks de MediaPipe en un arreglo (21, 3) una sola vez
+por frame y precalcula las diferencias por dedo que usan las reglas de gestos
+(ver gesture_rules.py). Las funciones aceptan también lotes (..., 21, 3).
+"""
+import numpy as np
+from mediapipe.python.solutions.hands import HandLandmark
+
+# Índices por dedo en orden: pulgar, índice, medio, anular, meñique
+# (para el pulgar se usa la articulación IP en lugar de la PIP)
+FINGER_TIPS = np.array([
+    HandLandmark.THUMB_TIP, HandLandmark.INDEX_FINGER_TIP, HandLandmark.MIDDLE_FINGER_TIP,
+    HandLandmark.RING_FINGER_TIP, HandLandmark.PINKY_TIP,
+], dtype=np.intp)
+FINGER_PIPS = np.array([
+    HandLandmark.THUMB_IP, HandLandmark.INDEX_FINGER_PIP, HandLandmark.MIDDLE_FINGER_PIP,
+    HandLandmark.RING_FINGER_PIP, HandLandmark.PINKY_PIP,
+], dtype=np.intp)
+FINGER_MCPS = np.array([
+    HandLandmark.THUMB_MCP, HandLandmark.INDEX_FINGER_MCP, HandLandmark.MIDDLE_FINGER_MCP,
+    HandLandmark.RING_FINGER_MCP, HandLandmark.PINKY_MCP,
+], dtype=np.intp)
+
+# Posición de cada dedo en los arreglos por dedo
+THUMB, INDEX, MIDDLE, RING, PINKY = range(5)
+
+
+def landmarks_to_array(hand_landmarks):
+    """Convierte los landmarks de MediaPipe en un arreglo (21, 3) de float32"""
+    return np.array(
+        [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32
+    )
+
+
+class HandFeatures:
+    """Landmarks de una mano (o un lote) con diferencias precalculadas por dedo"""
+
+    def __init__(self, points):
+        self.points = points
+        x = points[..., 0]
+        y = points[..., 1]
+
+        # Diferencias verticales punta - articulación (y crece hacia abajo):
+        # negativo = punta por encima (dedo extendido)
+        self.tip_pip = y[..., FINGER_TIPS] - y[..., FINGER_PIPS]
+        self.tip_mcp = y[..., FINGER_TIPS] - y[..., FINGER_MCPS]
+
+        # Dirección horizontal del pulgar respecto a IP y MCP
+        self.thumb_dx_ip = x[..., HandLandmark.THUMB_TIP] - x[..., HandLandmark.THUMB_IP]
+        self.thumb_dx_mcp = x[..., HandLandmark.THUMB_TIP] - x[..., HandLandmark.THUMB_MCP]
+
+        # Punta del índice respecto a la muñeca (positivo = por debajo)
+        self.index_below_wrist = y[..., HandLandmark.INDEX_FINGER_TIP] - y[..., HandLandmark.WRIST]
+
+
+def extract_features(hand_landmarks):
+    """Atajo: landmarks de MediaPipe → HandFeatures"""
+    return HandFeatures(landmarks_to_array(hand_landmarks))
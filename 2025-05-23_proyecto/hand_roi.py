@@ -0,0 +1,95 @@
+"""
+Seguimiento de la región de interés (ROI) de la mano
+Una vez que Hands encuentra una mano, los frames siguientes solo envían al
+modelo un recorte ampliado alrededor de los landmarks del frame anterior.
+Los landmarks del recorte se convierten de vuelta a coordenadas normalizadas
+del frame completo, y si se pierde la mano se vuelve a procesar todo el frame.
+La ROI se guarda normalizada (0-1), así sigue siendo válida cuando
+InferenceScaler cambia la resolución de inferencia en modo automático.
+
+Hands en modo video ya sigue la mano por su cuenta: mientras la tiene, omite
+el detector de palmas y corre el modelo de landmarks sobre su propio recorte
+del frame anterior, así que este recorte no abarata ese modelo. Lo que
+ahorra es el trabajo proporcional al tamaño de la entrada: copiar la imagen
+al grafo y transformarla en cada frame. Además, cuando el seguimiento interno
+se pierde, el detector de palmas corre sobre el recorte y la mano ocupa más de
+su entrada, lo que ayuda con manos lejanas. La ganancia depende del equipo y
+de la resolución: hand_roi_benchmark.py la mide sobre clips grabados y
+HAND_ROI_TRACKING (camera_config) desactiva el recorte.
+"""
+import numpy as np
+
+
+class HandROITracker:
+    """Envuelve un detector Hands con la misma interfaz process()/close()"""
+
+    def __init__(self, detector, expansion=1.8, min_size=96):
+        self.detector = detector
+        self.expansion = expansion  # Factor de ampliación de la caja de la mano
+        self.min_size = min_size    # Lado mínimo del recorte en píxeles
+
+        self.roi = None  # (x0, y0, x1, y1) normalizados al frame de inferencia
+        self.tracked_frames = 0
+        self.full_frames = 0
+        self.lost_count = 0
+
+    def process(self, image_rgb):
+        """Procesa el recorte si hay una mano seguida; si no, el frame completo"""
+        height, width = image_rgb.shape[:2]
+
+        if self.roi is not None:
+            x0, y0, x1, y1 = self._to_pixels(self.roi, width, height)
+            crop = np.ascontiguousarray(image_rgb[y0:y1, x0:x1])
+            results = self.detector.process(crop)
+            if results.multi_hand_landmarks:
+                self._to_full_frame(results, x0, y0, x1 - x0, y1 - y0, width, height)
+                self.roi = self._roi_from(results, width, height)
+                self.tracked_frames += 1
+                return results
+            # Mano perdida en el recorte: volver a buscar en todo el frame
+            self.roi = None
+            self.lost_count += 1
+
+        results = self.detector.process(image_rgb)
+        self.full_frames += 1
+        if results.multi_hand_landmarks:
+            self.roi = self._roi_from(results, width, height)
+        return results
+
+    def _to_full_frame(self, results, x0, y0, crop_width, crop_height, width, height):
+        """Convierte landmarks normalizados del recorte a normalizados del frame"""
+        for hand_landmarks in results.multi_hand_landmarks:
+            for lm in hand_landmarks.landmark:
+                lm.x = (lm.x * crop_width + x0) / width
+                lm.y = (lm.y * crop_height + y0) / height
+                lm.z = lm.z * crop_width / width  # z usa la misma escala que x
+
+    @staticmethod
+    def _to_pixels(roi, width, height):
+        """Caja normalizada → píxeles de la imagen actual (al menos 1 píxel de lado)"""
+        x0 = min(int(roi[0] * width), width - 1)
+        y0 = min(int(roi[1] * height), height - 1)
+        x1 = min(max(round(roi[2] * width), x0 + 1), width)
+        y1 = min(max(round(roi[3] * height), y0 + 1), height)
+        return x0, y0, x1, y1
+
+    def _roi_from(self, results, width, height):
+        """Caja cuadrada ampliada alrededor de los landmarks, dentro de la imagen (normalizada)"""
+        xs = [lm.x for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        ys = [lm.y for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        center_x = (min(xs) + max(xs)) / 2 * width
+        center_y = (min(ys) + max(ys)) / 2 * height
+        side = max((max(xs) - min(xs)) * width, (max(ys) - min(ys)) * height)
+        side = int(min(max(side * self.expansion, self.min_size), width, height))
+
+        # Desplazar la caja (sin encogerla) para que quede dentro de la imagen
+        x0 = int(min(max(center_x - side / 2, 0), width - side))
+        y0 = int(min(max(center_y - side / 2, 0), height - side))
+        return x0 / width, y0 / height, (x0 + side) / width, (y0 + side) / height
+
+    def reset(self):
+        """Olvida la ROI actual; el siguiente frame se procesa completo"""
+        self.roi = None
+
+    def close(self):
+        self.detector.close()
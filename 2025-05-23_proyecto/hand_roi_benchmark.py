@@ -0,0 +1,105 @@
+"""
+Benchmark del recorte de la mano (HandROITracker) sobre clips grabados
+Procesa cada clip dos veces con Hands en modo video, una con el frame completo
+y otra con el recorte de hand_roi, y compara contra el frame completo:
+- FPS del modelo (sin contar la lectura del video)
+- detección: frames con mano encontrada
+- recorte: frames resueltos con el recorte (sin volver al frame completo)
+- error: distancia media (normalizada) de los landmarks
+- acuerdo: frames en que el gesto ganador de gesture_rules es el mismo
+
+Uso:
+    python hand_roi_benchmark.py clip1.mp4 [clip2.mp4 ...] [--resolution 640 360]
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from camera_config import INFERENCE_RESOLUTION
+from detector_registry import create_hands
+from gesture_rules import GESTURE_TABLE
+from hand_features import HandFeatures, landmarks_to_array
+from hand_roi import HandROITracker
+from inference_scaler import InferenceScaler
+
+
+def create_plain_hands():
+    """Hands con la configuración de la aplicación, sin recorte"""
+    hands = create_hands()
+    return hands.detector if isinstance(hands, HandROITracker) else hands
+
+
+def run_clip(path, detector, scaler, max_frames=None):
+    """Procesa el clip; retorna (segundos de inferencia, puntos (n, 21, 3) con NaN sin mano)"""
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise OSError(f"No se pudo abrir el clip: {path}")
+    points = []
+    elapsed = 0.0
+    try:
+        while max_frames is None or len(points) < max_frames:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            image_rgb = scaler.prepare(frame)
+            start = time.perf_counter()
+            results = detector.process(image_rgb)
+            elapsed += time.perf_counter() - start
+            if results.multi_hand_landmarks:
+                points.append(landmarks_to_array(results.multi_hand_landmarks[0]))
+            else:
+                points.append(np.full((21, 3), np.nan, dtype=np.float32))
+    finally:
+        detector.close()
+        capture.release()
+    return elapsed, np.array(points).reshape(-1, 21, 3)
+
+
+def compare(points, reference):
+    """(detección, error medio, acuerdo de gestos) frente a la referencia"""
+    detected = ~np.isnan(points[:, 0, 0])
+    both = detected & ~np.isnan(reference[:, 0, 0])
+    if not both.any():
+        return detected.mean(), np.nan, np.nan
+    error = np.linalg.norm(points[both, :, :2] - reference[both, :, :2], axis=-1).mean()
+    winners = GESTURE_TABLE.winner[GESTURE_TABLE.encode(HandFeatures(points[both]))]
+    reference_winners = GESTURE_TABLE.winner[GESTURE_TABLE.encode(HandFeatures(reference[both]))]
+    return detected.mean(), error, (winners == reference_winners).mean()
+
+
+def benchmark(clips, resolution=INFERENCE_RESOLUTION, max_frames=None):
+    scaler = InferenceScaler(resolution=resolution)
+    rows = []
+    for clip in clips:
+        full_elapsed, reference = run_clip(clip, create_plain_hands(), scaler, max_frames)
+        tracker = HandROITracker(create_plain_hands())
+        roi_elapsed, points = run_clip(clip, tracker, scaler, max_frames)
+        for mode, elapsed, result, cropped in (("completo", full_elapsed, reference, 0.0),
+                                               ("recorte", roi_elapsed, points,
+                                                tracker.tracked_frames / max(len(points), 1))):
+            detection, error, agreement = compare(result, reference)
+            fps = len(result) / elapsed if elapsed else 0.0
+            rows.append((clip, mode, len(result), fps, detection, cropped, error, agreement))
+    return rows
+
+
+def print_table(rows):
+    print(f"{'clip':<32} {'modo':>9} {'frames':>7} {'FPS':>7} {'detección':>10} {'recorte':>8} "
+          f"{'error':>7} {'acuerdo':>8}   (referencia: frame completo)")
+    for clip, mode, frames, fps, detection, cropped, error, agreement in rows:
+        print(f"{clip[-32:]:<32} {mode:>9} {frames:>7} {fps:>7.1f} {detection:>10.1%} {cropped:>8.1%} "
+              f"{error:>7.4f} {agreement:>8.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FPS y precisión de Hands con y sin recorte de la mano")
+    parser.add_argument("clips", nargs="+", help="videos grabados")
+    parser.add_argument("--resolution", type=int, nargs=2, default=None, metavar=("ANCHO", "ALTO"),
+                        help="resolución de inferencia (por defecto la de camera_config)")
+    parser.add_argument("--max-frames", type=int, default=None)
+    args = parser.parse_args()
+
+    resolution = tuple(args.resolution) if args.resolution else INFERENCE_RESOLUTION
+    print_table(benchmark(args.clips, resolution, max_frames=args.max_frames))
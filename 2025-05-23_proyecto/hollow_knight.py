@@ -1,15 +1,17 @@
 # hollow_knight.py
-import time
 import cv2
-import keyboard
-import threading
+
+from input_dispatcher import default_dispatcher
+from overlay_cache import OverlayCache
+from timing import FrameClock
 
 class HollowKnightGame:
-    def __init__(self):
-        self.last_jump_time = 0
-        self.jump_cooldown = 0.8  # Reducido para permitir saltos más frecuentes
-        self.last_z_time = 0
-        self.z_cooldown = 0.3  # Reducido para ataques más responsivos
+    def __init__(self, clock=None, dispatcher=None):
+        self.clock = clock or FrameClock()
+        self.input = dispatcher or default_dispatcher()
+        self.jump_cooldown = self.clock.cooldown(800)  # Reducido para permitir saltos más frecuentes
+        self.z_cooldown = self.clock.cooldown(300)  # Reducido para ataques más responsivos
+        self.jump_hold_ms = 250  # Duración de la tecla de salto
         
         # Estado de teclas presionadas para evitar conflictos
         self.keys_pressed = {
@@ -17,38 +19,39 @@ class HollowKnightGame:
             "right": False
         }
 
+        # Capa estática con panel e instrucciones
+        self.info_layer = OverlayCache(self._build_info)
+
     def handle_pose_output(self, action):
         """
         Ejecuta una acción basada en el gesto detectado por pose_detector
         Maneja los nuevos comandos press/release
         """
-        current_time = time.time()
-        
         # Manejar comandos de movimiento con press/release
         if action == "press_left":
             if not self.keys_pressed["left"]:
-                keyboard.press("left")
+                self.input.press("left", source=action, origin_ns=self.clock.frame_ns)
                 self.keys_pressed["left"] = True
                 print("DEBUG HK: Presionando LEFT")
             return True
             
         elif action == "release_left":
             if self.keys_pressed["left"]:
-                keyboard.release("left")
+                self.input.release("left", source=action, origin_ns=self.clock.frame_ns)
                 self.keys_pressed["left"] = False
                 print("DEBUG HK: Soltando LEFT")
             return True
             
         elif action == "press_right":
             if not self.keys_pressed["right"]:
-                keyboard.press("right")
+                self.input.press("right", source=action, origin_ns=self.clock.frame_ns)
                 self.keys_pressed["right"] = True
                 print("DEBUG HK: Presionando RIGHT")
             return True
             
         elif action == "release_right":
             if self.keys_pressed["right"]:
-                keyboard.release("right")
+                self.input.release("right", source=action, origin_ns=self.clock.frame_ns)
                 self.keys_pressed["right"] = False
                 print("DEBUG HK: Soltando RIGHT")
             return True
@@ -67,26 +70,18 @@ class HollowKnightGame:
             return True
             
         elif action == "z":
-            if current_time - self.last_z_time > self.z_cooldown:
-                keyboard.press_and_release("z")
-                self.last_z_time = current_time
+            if self.z_cooldown.try_trigger():
+                self.input.tap("z", source=action, origin_ns=self.clock.frame_ns)
                 print("DEBUG HK: Ataque Z")
                 return True
                 
         elif action == "x":
-            if current_time - self.last_jump_time > self.jump_cooldown:
+            if self.jump_cooldown.try_trigger():
                 # Salto con duración para alcanzar 60% de altura
                 # Hold por ~0.25 segundos según documentación de Hollow Knight
-                keyboard.press("x")
+                # El hilo de teclado suelta la tecla tras jump_hold_ms
+                self.input.hold("x", self.jump_hold_ms, source=action, origin_ns=self.clock.frame_ns)
                 print("DEBUG HK: Iniciando salto (hold 0.25s para 60% altura)")
-                
-                # Programar release después de 0.25s
-                def release_jump():
-                    keyboard.release("x")
-                    print("DEBUG HK: Finalizando salto")
-                
-                threading.Timer(0.25, release_jump).start()
-                self.last_jump_time = current_time
                 return True
                 
         elif action == "menu":
@@ -98,11 +93,8 @@ class HollowKnightGame:
     
     def release_all_keys(self):
         """Suelta todas las teclas que podrían estar presionadas"""
-        for key in ["left", "right", "x", "z"]:
-            try:
-                keyboard.release(key)
-            except:
-                pass  # Ignorar errores si la tecla no estaba presionada
+        # Cancela también el release pendiente de un salto en curso
+        self.input.release_all(["left", "right", "x", "z"])
         
         self.keys_pressed = {"left": False, "right": False}
         print("DEBUG HK: Todas las teclas liberadas")
@@ -111,12 +103,11 @@ class HollowKnightGame:
         """
         Dibuja instrucciones del juego Hollow Knight sobre la pantalla
         """
-        height, width = frame.shape[:2]
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (50, 50), (width - 50, height - 50), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.6, frame, 0.4, 0, frame)
+        # Panel e instrucciones estáticas: un solo sprite cacheado por resolución
+        self.info_layer.draw(frame)
 
-        y = 100
+        # Las líneas dinámicas continúan debajo de las instrucciones
+        y = 100 + 6 * 35
         spacing = 35
 
         def put(text, color=(255, 255, 255)):
@@ -124,13 +115,6 @@ class HollowKnightGame:
             cv2.putText(frame, text, (80, y), cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
             y += spacing
 
-        put("HOLLOW KNIGHT (control corporal MEJORADO)", (0, 255, 255))
-        put("Inclinar hombros izquierda:      LEFT (press/release)")
-        put("Inclinar hombros derecha:        RIGHT (press/release)")
-        put("Levantar brazo arriba clavícula: Z (disparo)")
-        put("Manos cerca de rodillas:         X (salto 60% altura)")
-        put("Palmas tocándose (3s):           Volver al menú")
-        
         # Mostrar estado de teclas presionadas
         y += 10
         keys_status = f"Teclas activas: L:{self.keys_pressed['left']} R:{self.keys_pressed['right']}"
@@ -162,3 +146,23 @@ class HollowKnightGame:
             put(f"Estado: {pose_description}", color)
         
         return frame
+
+    def _build_info(self, canvas, key):
+        """Capa estática de instrucciones del modo Hollow Knight"""
+        height, width = canvas.height, canvas.width
+        canvas.panel((50, 50), (width - 50, height - 50), 0.6)
+
+        y = 100
+        spacing = 35
+
+        def put(text, color=(255, 255, 255)):
+            nonlocal y
+            canvas.text(text, (80, y), 0.8, color, 2)
+            y += spacing
+
+        put("HOLLOW KNIGHT (control corporal MEJORADO)", (0, 255, 255))
+        put("Inclinar hombros izquierda:      LEFT (press/release)")
+        put("Inclinar hombros derecha:        RIGHT (press/release)")
+        put("Levantar brazo arriba clavícula: Z (disparo)")
+        put("Manos cerca de rodillas:         X (salto 60% altura)")
+        put("Palmas tocándose (3s):           Volver al menú")
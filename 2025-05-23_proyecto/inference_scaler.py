@@ -0,0 +1,78 @@
+"""
+Escalado de la entrada de inferencia
+El frame de la cámara se redimensiona una sola vez a la resolución de
+inferencia y esa misma imagen alimenta a todos los detectores. Los landmarks
+de MediaPipe son coordenadas normalizadas (0-1), por lo que se dibujan sobre
+el frame de visualización sin ninguna conversión adicional.
+"""
+import cv2
+
+from camera_config import (
+    AUTO_TARGET_CONFIDENCE,
+    INFERENCE_RESOLUTION,
+    INFERENCE_RESOLUTIONS,
+)
+
+
+class InferenceScaler:
+    def __init__(self, resolution=INFERENCE_RESOLUTION, candidates=INFERENCE_RESOLUTIONS,
+                 target_confidence=AUTO_TARGET_CONFIDENCE):
+        self.auto = resolution == "auto"
+        self.candidates = sorted(candidates, key=lambda size: size[0] * size[1])
+        self.target_confidence = target_confidence
+
+        # Modo automático: se empieza por la menor resolución y se sube
+        # solo si la confianza promedio cae por debajo del objetivo
+        self.level = 0
+        self.resolution = self.candidates[0] if self.auto else resolution
+
+        self.confidence_avg = None
+        self.smoothing = 0.1  # Peso de cada nueva muestra en el promedio
+        self.samples_at_level = 0
+        self.min_samples = 30  # Detecciones antes de decidir un cambio
+        self.stable_samples = 900  # Detecciones con margen antes de probar a bajar
+        self.margin = 0.05
+
+    def input_size(self, frame_width, frame_height):
+        """Tamaño de inferencia que cabe en la resolución configurada sin deformar"""
+        if self.resolution is None:
+            return frame_width, frame_height
+        max_width, max_height = self.resolution
+        scale = min(max_width / frame_width, max_height / frame_height, 1.0)
+        return max(1, round(frame_width * scale)), max(1, round(frame_height * scale))
+
+    def prepare(self, frame):
+        """Redimensiona el frame BGR una vez y lo convierte a RGB para los detectores"""
+        height, width = frame.shape[:2]
+        size = self.input_size(width, height)
+        if size != (width, height):
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    def report(self, confidence):
+        """Registra la confianza de una detección y ajusta la resolución en modo automático"""
+        if not self.auto or confidence is None:
+            return
+
+        if self.confidence_avg is None:
+            self.confidence_avg = confidence
+        else:
+            self.confidence_avg += self.smoothing * (confidence - self.confidence_avg)
+        self.samples_at_level += 1
+
+        if self.samples_at_level < self.min_samples:
+            return
+
+        if self.confidence_avg < self.target_confidence and self.level < len(self.candidates) - 1:
+            self._set_level(self.level + 1)
+        elif (self.samples_at_level >= self.stable_samples and self.level > 0
+              and self.confidence_avg > self.target_confidence + self.margin):
+            # Las condiciones mejoraron (p. ej. iluminación): probar una resolución menor
+            self._set_level(self.level - 1)
+
+    def _set_level(self, level):
+        self.level = level
+        self.resolution = self.candidates[level]
+        self.samples_at_level = 0
+        self.confidence_avg = None
+        print(f"Resolución de inferencia: {self.resolution[0]}x{self.resolution[1]}")
@@ -0,0 +1,207 @@
+"""
+Envío asíncrono de teclas a los juegos
+Los juegos encolan eventos (press, release, tap, hold) y un único hilo los
+envía al sistema operativo con la librería keyboard cuando vencen. Así las
+llamadas de entrada del SO no bloquean el hilo de visión y los saltos con
+duración no crean un hilo nuevo por acción.
+
+Los eventos redundantes se descartan (coalescing): un press de una tecla que
+ya está abajo, un release de una tecla que no está presionada o un evento
+idéntico a otro que sigue pendiente en la cola.
+
+Un evento puede indicar su origen (gesto o acción) y el instante de captura
+del frame que lo provocó; al enviarlo se reporta la latencia total desde la
+captura hasta la emisión de la tecla.
+
+La aplicación comparte un solo dispatcher entre todos los juegos;
+default_dispatcher() retorna uno común para los juegos creados sin él.
+"""
+import heapq
+import itertools
+import threading
+import time
+
+PRESS = "press"
+RELEASE = "release"
+TAP = "tap"
+
+
+class NullKeyboard:
+    """Backend sin efecto para ejecutar sin teclado (benchmarks, replay)"""
+
+    def press(self, key):
+        pass
+
+    def release(self, key):
+        pass
+
+    def press_and_release(self, key):
+        pass
+
+
+class InputDispatcher:
+    def __init__(self, backend=None):
+        if backend is None:
+            import keyboard  # Solo se necesita para enviar teclas reales
+            backend = keyboard
+        self.backend = backend
+
+        # Heap de (vence_ns, orden, tipo, tecla, encolado_ns, origen, captura_ns)
+        self._queue = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._pending = {}  # tecla -> (tipo, orden) de su último evento inmediato aún en cola
+        self._down = set()  # Teclas presionadas (las modifica el hilo con el lock)
+        self._running = True
+
+        # Estadísticas de envío
+        self.dispatched = 0
+        self.coalesced = 0
+        self.total_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self.last_latency_ms = 0.0
+        # callback(tipo, tecla, latencia_ms, origen, respuesta_ms) tras cada envío;
+        # respuesta_ms (captura → tecla) es None si el evento no trae su captura
+        self.listeners = []
+
+        self._thread = threading.Thread(target=self._run, name="gestik-teclado", daemon=True)
+        self._thread.start()
+
+    def press(self, key, delay_ms=0, source=None, origin_ns=None):
+        self._schedule(PRESS, key, delay_ms, source, origin_ns)
+
+    def release(self, key, delay_ms=0, source=None, origin_ns=None):
+        self._schedule(RELEASE, key, delay_ms, source, origin_ns)
+
+    def tap(self, key, source=None, origin_ns=None):
+        """Presiona y suelta la tecla de inmediato"""
+        self._schedule(TAP, key, 0, source, origin_ns)
+
+    def hold(self, key, duration_ms, source=None, origin_ns=None):
+        """Mantiene la tecla presionada duration_ms (la respuesta es el press)"""
+        self._schedule(PRESS, key, 0, source, origin_ns)
+        self._schedule(RELEASE, key, duration_ms)
+
+    def release_all(self, keys=None):
+        """Cancela los eventos pendientes y suelta las teclas presionadas"""
+        with self._condition:
+            self._queue = [event for event in self._queue
+                           if keys is not None and event[3] not in keys]
+            heapq.heapify(self._queue)
+            # Solo los inmediatos (vence == encolado) se registran en _pending;
+            # un evento con retardo nunca se descuenta de ahí al enviarse
+            self._pending = {event[3]: (event[2], event[1])
+                             for event in sorted(self._queue, key=lambda event: event[1])
+                             if event[0] == event[4]}
+            targets = list(keys if keys is not None else self._down)
+        for key in targets:
+            self._schedule(RELEASE, key, 0)
+
+    def _schedule(self, kind, key, delay_ms, source=None, origin_ns=None):
+        now = time.perf_counter_ns()
+        with self._condition:
+            order = next(self._counter)
+            if delay_ms == 0:
+                # Solo se descarta si repite el último evento pendiente de la tecla:
+                # en press → release → press el segundo press sigue siendo necesario
+                last = self._pending.get(key)
+                if last is not None and last[0] == kind:
+                    self.coalesced += 1
+                    return
+                self._pending[key] = (kind, order)
+            due = now + int(delay_ms * 1_000_000)
+            heapq.heappush(self._queue, (due, order, kind, key, now, source, origin_ns))
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and not self._ready():
+                    timeout = None
+                    if self._queue:
+                        timeout = (self._queue[0][0] - time.perf_counter_ns()) / 1e9
+                    self._condition.wait(timeout)
+                if not self._running:
+                    return
+                due, order, kind, key, enqueued, source, origin_ns = heapq.heappop(self._queue)
+                if due == enqueued and self._pending.get(key) == (kind, order):
+                    del self._pending[key]
+            self._dispatch(kind, key, due, source, origin_ns)
+
+    def _ready(self):
+        return bool(self._queue) and self._queue[0][0] <= time.perf_counter_ns()
+
+    def _dispatch(self, kind, key, due, source, origin_ns):
+        # Estado de la tecla ya es el pedido: el evento es redundante
+        if (kind == PRESS and key in self._down) or (kind == RELEASE and key not in self._down):
+            self.coalesced += 1
+            return
+
+        try:
+            if kind == PRESS:
+                self.backend.press(key)
+                with self._condition:
+                    self._down.add(key)
+            elif kind == RELEASE:
+                self.backend.release(key)
+                with self._condition:
+                    self._down.discard(key)
+            else:
+                self.backend.press_and_release(key)
+        except Exception as e:
+            print(f"Error simulando tecla {key}: {e}")
+            return
+
+        # Latencia: desde que el evento debía enviarse hasta que se envió
+        sent = time.perf_counter_ns()
+        latency_ms = (sent - due) / 1_000_000
+        # Respuesta: desde la captura del frame que originó el evento
+        response_ms = (sent - origin_ns) / 1_000_000 if origin_ns is not None else None
+        self.dispatched += 1
+        self.total_latency_ms += latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        self.last_latency_ms = latency_ms
+        for listener in self.listeners:
+            listener(kind, key, latency_ms, source, response_ms)
+
+    def is_down(self, key):
+        return key in self._down
+
+    def stats(self):
+        """Resumen de eventos enviados, descartados y latencia de envío"""
+        mean = self.total_latency_ms / self.dispatched if self.dispatched else 0.0
+        return {
+            "dispatched": self.dispatched,
+            "coalesced": self.coalesced,
+            "latency_ms_mean": mean,
+            "latency_ms_max": self.max_latency_ms,
+            "latency_ms_last": self.last_latency_ms,
+        }
+
+    def stop(self, timeout=1.0):
+        """Suelta las teclas presionadas y detiene el hilo"""
+        self.release_all()
+        deadline = time.monotonic() + timeout
+        while self._down and time.monotonic() < deadline:
+            time.sleep(0.005)
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._thread.join(timeout)
+
+        stats = self.stats()
+        print(f"Teclado: {stats['dispatched']} eventos enviados, {stats['coalesced']} descartados, "
+              f"latencia media {stats['latency_ms_mean']:.2f} ms (máx {stats['latency_ms_max']:.2f} ms)")
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_dispatcher():
+    """Dispatcher con teclado real compartido por los juegos creados sin uno propio"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = InputDispatcher()
+        return _default
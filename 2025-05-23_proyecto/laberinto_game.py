@@ -1,19 +1,23 @@
-import cv2
-import keyboard
-import time
+from input_dispatcher import default_dispatcher
+from overlay_cache import OverlayCache
+from timing import FrameClock
 
 class LaberintoGame:
-    def __init__(self):
-        self.last_gesture_time = 0
-        self.gesture_cooldown = 0.3  # segundos entre gestos
+    def __init__(self, clock=None, dispatcher=None):
+        self.clock = clock or FrameClock()
+        self.input = dispatcher or default_dispatcher()
+        self.gesture_cooldown = self.clock.cooldown(300)  # ms entre gestos
 
-    def handle_gesture(self, gesture_type):
+        # Capa estática de instrucciones
+        self.info_layer = OverlayCache(self._build_info)
+
+    def handle_gesture(self, gesture_type, source=None):
         """
         Ejecuta una acción en el juego según el gesto detectado.
         gesture_type: 'up', 'down', 'left', 'right'
+        source: nombre del gesto que la provocó (para las métricas)
         """
-        current_time = time.time()
-        if current_time - self.last_gesture_time < self.gesture_cooldown:
+        if not self.gesture_cooldown.ready():
             return False
 
         key_mapping = {
@@ -24,33 +28,32 @@ class LaberintoGame:
         }
 
         if gesture_type in key_mapping:
-            try:
-                keyboard.press_and_release(key_mapping[gesture_type])
-                self.last_gesture_time = current_time
-                print(f"Laberinto: Tecla {key_mapping[gesture_type]} presionada")
-                return True
-            except Exception as e:
-                print(f"Error simulando tecla: {e}")
+            # Los errores de envío los reporta el hilo de teclado
+            self.input.tap(key_mapping[gesture_type], source=source or gesture_type,
+                           origin_ns=self.clock.frame_ns)
+            self.gesture_cooldown.trigger()
+            print(f"Laberinto: Tecla {key_mapping[gesture_type]} presionada")
+            return True
         return False
 
     def draw_info(self, frame):
         """Muestra un overlay con instrucciones del juego del laberinto"""
-        height, width = frame.shape[:2]
+        return self.info_layer.draw(frame)
+
+    def _build_info(self, canvas, key):
+        """Dibuja la capa estática de instrucciones (se cachea por resolución)"""
+        height, width = canvas.height, canvas.width
         margin_x = int(width * 0.1)
         margin_y = int(height * 0.1)
 
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (margin_x, margin_y),
-                      (width - margin_x, height - margin_y), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.6, frame, 0.4, 0, frame)
+        canvas.panel((margin_x, margin_y), (width - margin_x, height - margin_y), 0.6)
 
         y = margin_y + 40
         spacing = 35
 
         def put(text, color=(255, 255, 255)):
             nonlocal y
-            cv2.putText(frame, text, (margin_x + 30, y),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+            canvas.text(text, (margin_x + 30, y), 0.7, color, 2)
             y += spacing
 
         put("Indice arriba        Mover ARRIBA ")
@@ -59,5 +62,3 @@ class LaberintoGame:
         put("Pulgar derecha        Mover DERECHA ")
         put("Signo paz (1.2s)      Volver al menu")
         put("Signo rock (2s)       Cerrar programa")
-
-        return frame
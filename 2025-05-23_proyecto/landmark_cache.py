@@ -0,0 +1,244 @@
+"""
+Caché de landmarks en disco y evaluación por lotes de los gestos
+MediaPipe se ejecuta una sola vez sobre las grabaciones; los landmarks quedan
+en archivos binarios de registros de ancho fijo (float32 por frame) que se
+abren con np.memmap, sin cargarlos completos en memoria. Sobre esa caché las
+reglas de gestos de la mano (gesture_rules) y las pruebas de pose
+(pose_features) se evalúan vectorizadas por bloques, lo que permite barrer
+umbrales sobre millones de frames en segundos.
+
+Estructura de la carpeta:
+    hands.f32       (n, 21, 3) x, y, z; NaN sin mano
+    hand_score.f32  (n,)
+    pose.f32        (n, 33, 4) x, y, z, visibilidad; NaN sin persona
+    t_ms.f64        (n,) instante de cada frame dentro de su grabación
+    meta.json       cantidad de frames y rango de frames de cada grabación
+
+Uso:
+    python landmark_cache.py build cache/ clip1.mp4 sesion.npz ...
+    python landmark_cache.py sweep cache/ --hand extended_pip=0.01,0.02,0.03 --pose jump=0.15,0.18
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+import pose_features as pf
+from frame_source import HAND_POINTS, POSE_POINTS, LandmarkRecorder, VideoFileSource
+from gesture_rules import FINGER_THRESHOLDS, compile_rules
+from hand_features import HandFeatures
+
+# Columnas de la caché: archivo → (dtype, forma de un frame)
+COLUMNS = {
+    "hands": ("hands.f32", np.float32, (HAND_POINTS, 3)),
+    "hand_score": ("hand_score.f32", np.float32, ()),
+    "pose": ("pose.f32", np.float32, (POSE_POINTS, 4)),
+    "t_ms": ("t_ms.f64", np.float64, ()),
+}
+
+CHUNK_FRAMES = 131072  # Frames por bloque al evaluar (~33 MB de landmarks de mano)
+
+
+class LandmarkCacheWriter:
+    """Agrega grabaciones a la caché escribiendo registros al final de cada archivo"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.meta = load_meta(path)
+        self._files = {
+            name: open(os.path.join(path, filename), "ab")
+            for name, (filename, _, _) in COLUMNS.items()
+        }
+
+    def append(self, name, t_ms, hands, hand_score, pose):
+        """Agrega los frames de una grabación (arreglos con una fila por frame)"""
+        arrays = {"hands": hands, "hand_score": hand_score, "pose": pose, "t_ms": t_ms}
+        count = len(t_ms)
+        for column, (_, dtype, shape) in COLUMNS.items():
+            data = np.ascontiguousarray(arrays[column], dtype=dtype).reshape((count,) + shape)
+            self._files[column].write(data.tobytes())
+        self.meta["clips"].append({"name": name, "start": self.meta["frames"], "count": count})
+        self.meta["frames"] += count
+
+    def close(self):
+        for file in self._files.values():
+            file.close()
+        with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+
+
+def load_meta(path):
+    meta_path = os.path.join(path, "meta.json")
+    if not os.path.exists(meta_path):
+        return {"frames": 0, "clips": []}
+    with open(meta_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class LandmarkCache:
+    """Columnas de la caché como arreglos de solo lectura mapeados a memoria"""
+
+    def __init__(self, path):
+        self.path = path
+        self.meta = load_meta(path)
+        self.frames = self.meta["frames"]
+        for column, (filename, dtype, shape) in COLUMNS.items():
+            data = np.memmap(os.path.join(path, filename), dtype=dtype, mode="r",
+                             shape=(self.frames,) + shape) if self.frames else np.empty((0,) + shape, dtype)
+            setattr(self, column, data)
+
+    def __len__(self):
+        return self.frames
+
+    def chunks(self, size=CHUNK_FRAMES):
+        """Rangos (inicio, fin) para recorrer la caché por bloques"""
+        for start in range(0, self.frames, size):
+            yield start, min(start + size, self.frames)
+
+
+def build_cache(cache_path, recordings, max_frames=None):
+    """Ejecuta MediaPipe una vez sobre videos (o copia flujos .npz) y los agrega a la caché"""
+    # Los modelos solo se cargan al construir la caché, no al barrer umbrales
+    from detector_registry import DETECTOR_FACTORIES
+    from inference_scaler import InferenceScaler
+    from pose_backend import PoseBackend
+
+    # Complejidad de pose fija: una bajada automática a mitad de la caché
+    # mezclaría landmarks de dos modelos distintos
+    factories = {**DETECTOR_FACTORIES, "pose": lambda: PoseBackend(auto_downgrade=False)}
+    writer = LandmarkCacheWriter(cache_path)
+    scaler = InferenceScaler()
+    try:
+        for recording in recordings:
+            name = os.path.basename(recording)
+            if recording.endswith(".npz"):
+                with np.load(recording) as data:
+                    stream = {key: data[key] for key in ("t_ms", "hands", "hand_score", "pose")}
+            else:
+                recorder = LandmarkRecorder(VideoFileSource(recording, realtime=False, max_frames=max_frames),
+                                            factories)
+                detectors = [factory() for factory in recorder.detector_factories.values()]
+                try:
+                    while (frame := recorder.read()) is not None:
+                        image_rgb = scaler.prepare(frame)
+                        for detector in detectors:
+                            detector.process(image_rgb)
+                finally:
+                    for detector in detectors:
+                        detector.close()
+                    recorder.release()
+                stream = {"t_ms": recorder.t_ms, "hands": recorder.hands,
+                          "hand_score": recorder.hand_score, "pose": recorder.pose}
+            writer.append(name, **stream)
+            print(f"[INFO] {name}: {len(stream['t_ms'])} frames agregados a la caché")
+    finally:
+        writer.close()
+    return LandmarkCache(cache_path)
+
+
+def evaluate_hands(cache, table):
+    """Frames por gesto ganador (None: mano sin gesto) para una tabla de gestos"""
+    counts = np.zeros(len(table.names) + 1, dtype=np.int64)  # Último: sin gesto
+    for start, end in cache.chunks():
+        points = np.asarray(cache.hands[start:end])
+        points = points[~np.isnan(points[:, 0, 0])]
+        winners = table.winner[table.encode(HandFeatures(points))]
+        # -1 (sin gesto) cae en la última cubeta
+        counts += np.bincount(winners.astype(np.intp) % len(counts), minlength=len(counts))
+    return dict(zip(table.names + [None], counts.tolist()))
+
+
+def evaluate_pose(cache, enter=pf.ENTER, exit=pf.EXIT):
+    """Frames en que se cumple cada prueba de pose y las palmas (sin suavizado ni histéresis)"""
+    counts = np.zeros(len(pf.TESTS) + 1, dtype=np.int64)
+    for start, end in cache.chunks():
+        pose = np.asarray(cache.pose[start:end])
+        pose = pose[~np.isnan(pose[:, 0, 0])]
+        tests = pf.evaluate(pf.pose_measures(pose[:, pf.POSE_POINTS, :2]), enter=enter, exit=exit)
+        counts[:-1] += tests.sum(axis=0)
+        counts[-1] += pf.palms_touching(tests).sum()
+    return dict(zip(pf.TEST_NAMES + ("palms_touching",), counts.tolist()))
+
+
+def sweep_hands(cache, parameter, values):
+    """[(valor, frames por gesto, frames/s)] variando un umbral de FINGER_THRESHOLDS"""
+    if parameter not in FINGER_THRESHOLDS:
+        raise ValueError(f"Umbral desconocido: {parameter} (usa {', '.join(FINGER_THRESHOLDS)})")
+    results = []
+    for value in values:
+        table = compile_rules(thresholds={**FINGER_THRESHOLDS, parameter: value})
+        start = time.perf_counter()
+        counts = evaluate_hands(cache, table)
+        results.append((value, counts, len(cache) / (time.perf_counter() - start)))
+    return results
+
+
+def sweep_pose(cache, test, values):
+    """[(valor, frames por prueba, frames/s)] variando el umbral de entrada de una prueba"""
+    if test not in pf.TEST_NAMES:
+        raise ValueError(f"Prueba desconocida: {test} (usa {', '.join(pf.TEST_NAMES)})")
+    results = []
+    column = pf.TEST_NAMES.index(test)
+    for value in values:
+        enter = pf.ENTER.copy()
+        enter[column] = value
+        start = time.perf_counter()
+        counts = evaluate_pose(cache, enter=enter)
+        results.append((value, counts, len(cache) / (time.perf_counter() - start)))
+    return results
+
+
+def print_sweep(title, results):
+    print(f"\n{title}")
+    for value, counts, throughput in results:
+        summary = ", ".join(f"{name}={count}" for name, count in counts.items())
+        print(f"  {value!s:<8} {throughput / 1e6:6.1f} M frames/s | {summary}")
+
+
+def _sweep_argument(names):
+    """Tipo de argparse para NOMBRE=v1,v2,...; el nombre debe estar en names"""
+    def parse(spec):
+        name, _, values = spec.partition("=")
+        if name not in names:
+            raise argparse.ArgumentTypeError(f"'{name}' no es uno de: {', '.join(names)}")
+        try:
+            return name, [float(value) for value in values.split(",")]
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"valores inválidos en '{spec}' (se esperaba {name}=v1,v2,...)")
+    return parse
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Caché de landmarks y barrido de umbrales")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="agregar grabaciones a la caché")
+    build.add_argument("cache")
+    build.add_argument("recordings", nargs="+", help="videos o flujos de landmarks (.npz)")
+    build.add_argument("--max-frames", type=int, default=None)
+    sweep = commands.add_parser("sweep", help="evaluar umbrales sobre la caché")
+    sweep.add_argument("cache")
+    sweep.add_argument("--hand", action="append", default=[], metavar="UMBRAL=v1,v2",
+                       type=_sweep_argument(tuple(FINGER_THRESHOLDS)),
+                       help=f"umbral de gesture_rules ({', '.join(FINGER_THRESHOLDS)})")
+    sweep.add_argument("--pose", action="append", default=[], metavar="PRUEBA=v1,v2",
+                       type=_sweep_argument(pf.TEST_NAMES),
+                       help=f"umbral de entrada de pose_features ({', '.join(pf.TEST_NAMES)})")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        cache = build_cache(args.cache, args.recordings, args.max_frames)
+        print(f"[INFO] Caché con {len(cache)} frames en {args.cache}")
+    else:
+        cache = LandmarkCache(args.cache)
+        print(f"[INFO] {len(cache)} frames en caché")
+        if not args.hand and not args.pose:
+            # Sin barrido: solo los umbrales actuales
+            args.hand = [("extended_pip", [FINGER_THRESHOLDS["extended_pip"]])]
+            args.pose = [("jump", [float(f"{pf.ENTER[pf.JUMP]:g}")])]
+        for parameter, values in args.hand:
+            print_sweep(f"Gestos variando {parameter}", sweep_hands(cache, parameter, values))
+        for test, values in args.pose:
+            print_sweep(f"Pose variando {test}", sweep_pose(cache, test, values))
@@ -3,9 +3,10 @@ import tkinter as tk
 from tkinter import ttk
 from PIL import Image, ImageTk
 import threading
+import time
 from mediapipe.python.solutions import drawing_utils as mp_drawing
-from mediapipe.python.solutions.hands import HAND_CONNECTIONS, Hands
-from mediapipe.python.solutions.pose import Pose, POSE_CONNECTIONS
+from mediapipe.python.solutions.hands import HAND_CONNECTIONS
+from mediapipe.python.solutions.pose import POSE_CONNECTIONS
 
 
 from game_states import GameState
@@ -15,10 +16,78 @@ from menu_renderer import MenuRenderer
 from dino_game import DinoGame
 from laberinto_game import LaberintoGame
 from hollow_knight import HollowKnightGame
-# from metrics_collector import MetricsCollector  # DESHABILITADO
+from frame_pipeline import FramePipeline
+from tk_display import TkFrameDisplay
+from detector_registry import DetectorRegistry
+from inference_scaler import InferenceScaler
+from camera_config import CAMERA_WIDTH, CAMERA_HEIGHT, METRICS_EXPORTER_PORT
+from frame_source import CameraSource
+from timing import FrameClock
+from input_dispatcher import InputDispatcher, NullKeyboard
+from metrics_collector import MetricsCollector
+from metrics_exporter import MetricsExporter
 
 class GestureGameApp:
-    def __init__(self):
+    def __init__(self, source=None, headless=False, initial_state=GameState.MAIN_MENU):
+        """
+        source: fuente de frames (por defecto la cámara, ver frame_source.py).
+        headless: sin ventana, sin teclado real, sin exportador ni registro de
+        sesión; se avanza llamando process_frame() (benchmarks y replay).
+        """
+        self.headless = headless
+        # Variables de control
+        self.running = True
+        self.closed = False  # Evita liberar los recursos dos veces al cerrar
+
+        # Configurar cámara (o video / landmarks grabados)
+        self.source = source or CameraSource()
+
+        if not headless:
+            self._create_window()
+
+        # Configurar estados del juego
+        self.current_state = initial_state
+
+        # Inicializar sistema de métricas
+        # Buffers de tamaño fijo: puede quedar activo toda la sesión
+        self.metrics = MetricsCollector(sessions_dir=None) if headless else MetricsCollector()
+        # Latencia de cada etapa del frame, reportada junto a las métricas
+        self.tracer = self.metrics.tracer
+        # /metrics para Prometheus, servido desde su propio hilo
+        self.exporter = None
+        if METRICS_EXPORTER_PORT is not None and not headless:
+            self.exporter = MetricsExporter(self.metrics, port=METRICS_EXPORTER_PORT)
+            self.exporter.start()
+
+        # Configurar MediaPipe: cada estado solo ejecuta los modelos que consume,
+        # alimentados con el frame reducido a la resolución de inferencia.
+        # Un replay de landmarks reemplaza a los modelos por los resultados grabados
+        self.scaler = InferenceScaler()
+        self.detectors = DetectorRegistry(factories=self.source.detector_factories, tracer=self.tracer)
+        inference_width, inference_height = self.scaler.input_size(CAMERA_WIDTH, CAMERA_HEIGHT)
+        self.detectors.prepare(self.current_state, (inference_height, inference_width, 3))
+
+        # Reloj común de cooldowns y gestos sostenidos (un tick por frame).
+        # Con una grabación el reloj sigue el tiempo de la grabación
+        self.clock = FrameClock()
+        self.media_origin_ms = self.clock.now_ms
+        # Un único hilo envía las teclas de todos los juegos
+        self.input = InputDispatcher(NullKeyboard() if headless else None)
+        self.gesture_detector = GestureDetector(self.clock)
+        self.pose_detector = PoseDetector(self.clock)
+        self.menu_renderer = MenuRenderer()
+        self.dino_game = DinoGame(self.clock, self.input)
+        self.laberinto_game = LaberintoGame(self.clock, self.input)
+        self.hollow_knight_game = HollowKnightGame(self.clock, self.input)
+        # Latencia real gesto → tecla: captura del frame hasta el envío de la tecla
+        self.input.listeners.append(self.on_key_dispatched)
+
+        # Pipeline por etapas: captura, inferencia y render en hilos propios.
+        # El loop de tkinter solo muestra el último frame terminado.
+        self.pipeline = FramePipeline(self.read_frame, self.infer_frame, self.render_frame)
+        self.display_interval_ms = 10  # Frecuencia de sondeo del loop de tkinter
+
+    def _create_window(self):
         # Configurar ventana de tkinter
         self.root = tk.Tk()
         self.root.title("🎮 GESTIK - Control por Gestos")
@@ -38,58 +107,14 @@ class GestureGameApp:
         # Configurar canvas para mostrar video
         self.canvas = tk.Canvas(self.root, bg='black')
         self.canvas.pack(fill=tk.BOTH, expand=True)
-        
-        # Variables de control
-        self.running = True
-        
-        # Configurar cámara
-        self.camera_index = 0  # Fijo en cámara 1 como solicitaste
-        self.cap = cv2.VideoCapture(self.camera_index)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-
-        # Configurar MediaPipe
-        self.hands = Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
-        )
-        self.pose = Pose(static_image_mode=False, model_complexity=1, enable_segmentation=False)
-
-        # Configurar estados del juego
-        self.current_state = GameState.MAIN_MENU
-        self.gesture_detector = GestureDetector()
-        self.pose_detector = PoseDetector()
-        self.menu_renderer = MenuRenderer()
-        self.dino_game = DinoGame()
-        self.laberinto_game = LaberintoGame()
-        self.hollow_knight_game = HollowKnightGame()
+        self.display = TkFrameDisplay(self.canvas)
 
-        # Inicializar sistema de métricas
-        # self.metrics = MetricsCollector()  # DESHABILITADO
-        
-        self.state_change_cooldown = 0
-        
         # Configurar eventos de cierre de ventana
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
     def on_closing(self):
-        """Maneja el cierre de la aplicación"""
-        print("Cerrando aplicación...")
-        self.running = False
-        
-        # Generar reporte de métricas antes de cerrar
-        # if hasattr(self, 'metrics'):
-        #     self.metrics.generate_report()  # DESHABILITADO
-        
-        if self.cap:
-            self.cap.release()
-        # Liberar recursos de MediaPipe
-        if hasattr(self, 'hands'):
-            self.hands.close()
-        if hasattr(self, 'pose'):
-            self.pose.close()
+        """Maneja el cierre de la aplicación (ventana o gesto rock)"""
+        self.cleanup()
         # Cerrar ventana de tkinter
         try:
             self.root.quit()  # Salir del mainloop
@@ -97,132 +122,140 @@ class GestureGameApp:
         except:
             pass
 
-    def convert_cv2_to_tkinter(self, cv2_image):
-        """Convierte imagen de OpenCV a formato compatible con tkinter"""
-        # Convertir de BGR a RGB
-        rgb_image = cv2.cvtColor(cv2_image, cv2.COLOR_BGR2RGB)
-        
-        # Convertir a PIL Image
-        pil_image = Image.fromarray(rgb_image)
-        
-        # Obtener tamaño del canvas
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-        
-        # Si el canvas aún no tiene tamaño, usar tamaño por defecto
-        if canvas_width <= 1 or canvas_height <= 1:
-            canvas_width, canvas_height = 1280, 720
-        
-        # Redimensionar manteniendo aspect ratio
-        img_width, img_height = pil_image.size
-        aspect_ratio = img_width / img_height
-        canvas_aspect_ratio = canvas_width / canvas_height
-        
-        if aspect_ratio > canvas_aspect_ratio:
-            # La imagen es más ancha
-            new_width = canvas_width
-            new_height = int(canvas_width / aspect_ratio)
-        else:
-            # La imagen es más alta
-            new_height = canvas_height
-            new_width = int(canvas_height * aspect_ratio)
-        
-        # Redimensionar imagen
-        pil_image = pil_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        
-        # Convertir a ImageTk
-        tk_image = ImageTk.PhotoImage(pil_image)
-        
-        return tk_image, new_width, new_height
-
     def update_frame(self):
-        """Actualiza el frame de video en la ventana de tkinter"""
+        """Muestra en la ventana de tkinter el último frame terminado por el pipeline"""
         if not self.running:
             return
+
+        # El cierre por gesto se marca desde el hilo de inferencia;
+        # tkinter solo puede destruirse desde su propio hilo
+        if self.current_state == GameState.CLOSED:
+            self.on_closing()
+            return
             
-        frame = self.process_frame()
+        frame = self.pipeline.latest_frame()
         
         if frame is not None:
             try:
-                # Convertir frame para tkinter
-                tk_image, img_width, img_height = self.convert_cv2_to_tkinter(frame)
-                
-                # Limpiar canvas
-                self.canvas.delete("all")
-                
-                # Centrar imagen en canvas
-                canvas_width = self.canvas.winfo_width()
-                canvas_height = self.canvas.winfo_height()
-                x = (canvas_width - img_width) // 2
-                y = (canvas_height - img_height) // 2
-                
-                # Mostrar imagen
-                self.canvas.create_image(x, y, anchor=tk.NW, image=tk_image)
-                
-                # Mantener referencia para evitar garbage collection
-                self.canvas.image = tk_image
-                
+                # Actualiza en sitio la imagen del canvas (sin crear objetos nuevos)
+                with self.tracer.span("display"):
+                    self.display.show(frame)
             except Exception as e:
                 print(f"Error actualizando frame: {e}")
         
-        # Programar siguiente actualización
+        # Programar siguiente consulta; solo se dibuja cuando hay un frame nuevo
         if self.running:
-            self.root.after(30, self.update_frame)  # ~33 FPS
-
-    def process_frame(self):
-        ret, frame = self.cap.read()
-        if not ret:
+            self.root.after(self.display_interval_ms, self.update_frame)
+
+    def read_frame(self):
+        """Etapa de captura: lee un frame de la fuente (None si no hay frame)"""
+        with self.tracer.span("capture"):
+            return self.source.read()
+
+    def on_key_dispatched(self, kind, key, latency_ms, source, response_ms):
+        """Registra cada tecla enviada por un gesto con su latencia desde la captura"""
+        if source is not None and response_ms is not None:
+            self.metrics.record_gesture_attempt(source, True, response_ms)
+
+    def infer_frame(self, frame, captured_ns=None, now_ms=None):
+        """
+        Etapa de inferencia: ejecuta MediaPipe y la lógica de gestos del juego.
+        now_ms fija el instante del reloj (tiempo de una grabación).
+        """
+        if self.current_state == GameState.CLOSED:
             return None
 
         # Registrar métricas de frame
-        # if hasattr(self, 'metrics'):
-        #     self.metrics.record_frame()
-        #     self.metrics.record_system_resources()  # DESHABILITADO
-
-        frame = cv2.flip(frame, 1)
-        image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        hand_results = self.hands.process(image_rgb)
-        pose_results = self.pose.process(image_rgb)
-        # print(GameState.__members__)  # imprime todos los miembros del Enum
-
-        if self.current_state == GameState.HOLLOW_KNIGHT:
-            if pose_results.pose_landmarks:
-                # 🔽 Dibuja los landmarks sobre el frame
-                mp_drawing.draw_landmarks(
-                    frame,
-                    pose_results.pose_landmarks,
-                    POSE_CONNECTIONS,
-                    landmark_drawing_spec=mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=3),
-                    connection_drawing_spec=mp_drawing.DrawingSpec(color=(0, 100, 255), thickness=2),
-                )
-
-                # 🔽 Procesa la acción
-                action = self.pose_detector.detect_action(pose_results.pose_landmarks.landmark)
-                if action:
-                    result = self.hollow_knight_game.handle_pose_output(action)
-                    if result == "menu":
-                        self.current_state = GameState.MAIN_MENU
-
-        else:
-            self.gesture_detector.update_cooldown()
-            if self.state_change_cooldown > 0:
-                self.state_change_cooldown -= 1
-            if hand_results.multi_hand_landmarks:
+        self.metrics.record_frame()
+        self.metrics.record_system_resources()
+
+        # Todos los temporizadores ven el mismo instante durante este frame,
+        # y las acciones que provoque el frame parten de su instante de captura
+        self.clock.tick(now_ms, frame_ns=captured_ns)
+
+        with self.tracer.span("flip"):
+            frame = cv2.flip(frame, 1)
+        with self.tracer.span("preprocess"):
+            image_rgb = self.scaler.prepare(frame)
+
+        # Solo se ejecutan los detectores que consume el estado actual
+        state = self.current_state
+        results = self.detectors.run(state, image_rgb)
+        if self.scaler.auto:
+            self.scaler.report(self.detectors.confidence(results))
+        hand_results = results.get("hands")
+        pose_results = results.get("pose")
+
+        with self.tracer.span("gesture_logic"):
+            if state == GameState.HOLLOW_KNIGHT:
+                if pose_results.pose_landmarks:
+                    # 🔽 Procesa la acción
+                    action = self.pose_detector.detect_action(pose_results.pose_landmarks.landmark)
+                    if action:
+                        result = self.hollow_knight_game.handle_pose_output(action)
+                        if result is False:
+                            # Acción en cooldown: el gesto no produjo tecla
+                            self.metrics.record_gesture_attempt(action, success=False)
+                        if result == "menu":
+                            self.current_state = GameState.MAIN_MENU
+
+            else:
+                if hand_results.multi_hand_landmarks:
+                    for hand_landmarks in hand_results.multi_hand_landmarks:
+                        self.handle_gestures(hand_landmarks, frame)
+                else:
+                    self.gesture_detector.handle_no_gesture_detected()
+
+        # Al cambiar de estado, preparar los modelos del nuevo estado
+        if self.current_state != state:
+            self.detectors.prepare(self.current_state, image_rgb.shape)
+
+        return frame, state, hand_results, pose_results
+
+    def render_frame(self, inference):
+        """Etapa de render: dibuja landmarks y la interfaz sobre el frame"""
+        frame, state, hand_results, pose_results = inference
+
+        with self.tracer.span("draw_landmarks"):
+            if state == GameState.HOLLOW_KNIGHT:
+                if pose_results.pose_landmarks:
+                    # 🔽 Dibuja los landmarks sobre el frame
+                    mp_drawing.draw_landmarks(
+                        frame,
+                        pose_results.pose_landmarks,
+                        POSE_CONNECTIONS,
+                        landmark_drawing_spec=mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=3),
+                        connection_drawing_spec=mp_drawing.DrawingSpec(color=(0, 100, 255), thickness=2),
+                    )
+            elif hand_results is not None and hand_results.multi_hand_landmarks:
                 for hand_landmarks in hand_results.multi_hand_landmarks:
                     mp_drawing.draw_landmarks(
                         frame, hand_landmarks, list(HAND_CONNECTIONS)
                     )
-                    self.handle_gestures(hand_landmarks, frame)
-            else:
-                self.gesture_detector.handle_no_gesture_detected()
 
-        frame = self.render_ui(frame)
+        with self.tracer.span("render_ui"):
+            frame = self.render_ui(frame)
         return frame
 
+    def process_frame(self):
+        """Ejecuta captura, inferencia y render de forma secuencial (sin hilos)"""
+        frame = self.read_frame()
+        if frame is None:
+            return None
+        captured_ns = time.perf_counter_ns()
+        now_ms = None
+        if self.source.timestamp_ms is not None:
+            now_ms = self.media_origin_ms + self.source.timestamp_ms
+        inference = self.infer_frame(frame, captured_ns, now_ms)
+        if inference is None:
+            return None
+        return self.render_frame(inference)
+
     def handle_gestures(self, hand_landmarks, frame):
         current_state_str = self.current_state.value.upper()
         gesture_detected = False
 
+        # El código de dedos se calcula una vez por frame y se reutiliza en cada consulta
         timed_gesture = self.gesture_detector.detect_timed_gestures(
             hand_landmarks, current_state_str
         )
@@ -231,8 +264,8 @@ class GestureGameApp:
             gesture_detected = True
             if timed_gesture == "rock_hold":
                 print("Rock sign held for 2s - Closing program")
+                # El loop de tkinter detecta el estado y cierra la aplicación
                 self.current_state = GameState.CLOSED
-                self.on_closing()  # Cerrar realmente la aplicación
                 return
             elif timed_gesture == "peace_hold":
                 print("Peace sign held for 1.2s - Toggling menu")
@@ -248,27 +281,28 @@ class GestureGameApp:
                     self.current_state = GameState.MAIN_MENU
                 return
 
-        if self.current_state == GameState.MAIN_MENU:
-            if self.handle_menu_gestures(hand_landmarks):
-                gesture_detected = True
-        elif self.current_state == GameState.DINO_GAME:
-            if self.handle_dino_gestures(hand_landmarks):
-                gesture_detected = True
-        elif self.current_state == GameState.LABERINTO_GAME:
-            if self.handle_laberinto_gestures(hand_landmarks):
-                gesture_detected = True
+        handler = {
+            GameState.MAIN_MENU: self.handle_menu_gestures,
+            GameState.DINO_GAME: self.handle_dino_gestures,
+            GameState.LABERINTO_GAME: self.handle_laberinto_gestures,
+        }.get(self.current_state)
+        if handler is not None:
+            # Solo los gestos que usa el estado, en su orden; uno en cooldown
+            # cede el turno al siguiente que coincida
+            for gesture in self.gesture_detector.candidates(hand_landmarks, current_state_str):
+                if self.gesture_detector.consume(gesture, current_state_str):
+                    gesture_detected = handler(gesture)
+                    break
 
         if not gesture_detected:
             self.gesture_detector.handle_no_gesture_detected()
 
-    def handle_menu_gestures(self, hand_landmarks):
-        if self.gesture_detector.is_pointing_up(hand_landmarks):
+    def handle_menu_gestures(self, gesture):
+        if gesture == "pointing_up":
             self.menu_renderer.navigate_up()
-            return True
-        elif self.gesture_detector.is_pointing_down(hand_landmarks):
+        elif gesture == "pointing_down":
             self.menu_renderer.navigate_down()
-            return True
-        elif self.gesture_detector.is_hand_open(hand_landmarks, "MAIN_MENU"):
+        elif gesture == "open_hand":
             selected_game = self.menu_renderer.get_selected_game()
             if selected_game == 0:
                 print("Selected Dinosaur Game")
@@ -279,31 +313,29 @@ class GestureGameApp:
             elif selected_game == 2:
                 print("Selected Hollow Knight Game")
                 self.current_state = GameState.HOLLOW_KNIGHT
-            return True
-        elif self.gesture_detector.is_fist(hand_landmarks):
-            return True
-        return False
+        # El puno no tiene acción (estado neutral)
+        return True
 
-    def handle_dino_gestures(self, hand_landmarks):
-        if self.gesture_detector.is_hand_open(hand_landmarks, "DINO_GAME"):
+    def handle_dino_gestures(self, gesture):
+        if gesture == "open_hand":
             jumped = self.dino_game.handle_gesture(True)
             if jumped:
                 print("Jump!")
-            return True
-        elif self.gesture_detector.is_fist(hand_landmarks):
-            return True
-        return False
-
-    def handle_laberinto_gestures(self, hand_landmarks):
-        if self.gesture_detector.is_pointing_up(hand_landmarks):
-            return self.laberinto_game.handle_gesture("up")
-        elif self.gesture_detector.is_hand_open(hand_landmarks, "LABERINTO_GAME"):
-            return self.laberinto_game.handle_gesture("down")
-        elif self.gesture_detector.is_pinky_up(hand_landmarks):
-            return self.laberinto_game.handle_gesture("left")
-        elif self.gesture_detector.is_thumb_right(hand_landmarks):
-            return self.laberinto_game.handle_gesture("right")
-        return False
+            else:
+                self.metrics.record_gesture_attempt(gesture, success=False)
+        return True
+
+    def handle_laberinto_gestures(self, gesture):
+        directions = {
+            "pointing_up": "up",
+            "open_hand": "down",
+            "pinky_up": "left",
+            "thumb_right": "right",
+        }
+        moved = self.laberinto_game.handle_gesture(directions[gesture], source=gesture)
+        if not moved:
+            self.metrics.record_gesture_attempt(gesture, success=False)
+        return moved
 
     def render_ui(self, frame):
         if self.current_state == GameState.MAIN_MENU:
@@ -348,7 +380,8 @@ class GestureGameApp:
         print("- Cierra la ventana con X para salir")
         print("- Ventana redimensionable: Puedes cambiar el tamaño!")
         
-        # Iniciar actualización de frames
+        # Iniciar pipeline y actualización de frames
+        self.pipeline.start()
         self.update_frame()
         
         # Iniciar loop principal de tkinter
@@ -360,15 +393,31 @@ class GestureGameApp:
             self.cleanup()
 
     def cleanup(self):
-        """Limpia recursos al cerrar la aplicación"""
+        """Limpia recursos al cerrar la aplicación (solo la primera vez que se llama)"""
+        # on_closing y el finally de run() llegan aquí en el mismo cierre
+        if self.closed:
+            return
+        self.closed = True
         print("Cerrando aplicación...")
         self.running = False
-        if hasattr(self, 'cap') and self.cap:
-            self.cap.release()
-        if hasattr(self, 'hands'):
-            self.hands.close()
-        if hasattr(self, 'pose'):
-            self.pose.close()
+
+        # Detener los hilos antes de liberar cámara y modelos
+        if hasattr(self, 'pipeline'):
+            self.pipeline.stop()
+
+        # Generar reporte de métricas antes de cerrar (ya sin hilos escribiendo)
+        if getattr(self, 'exporter', None):
+            self.exporter.stop()
+        if hasattr(self, 'metrics'):
+            self.metrics.generate_report()
+        if hasattr(self, 'source'):
+            self.source.release()
+        # Soltar teclas que hayan quedado presionadas
+        if hasattr(self, 'input'):
+            self.input.stop()
+        # Liberar recursos de MediaPipe
+        if hasattr(self, 'detectors'):
+            self.detectors.close()
         print("✅ GESTIK cerrado correctamente.")
 
 if __name__ == "__main__":
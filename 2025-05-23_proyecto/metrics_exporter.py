@@ -0,0 +1,202 @@
+"""
+Exportador de métricas de GESTIK en formato Prometheus / OpenMetrics
+Un servidor HTTP en un hilo propio responde /metrics leyendo el estado que ya
+acumula MetricsCollector (contadores, histogramas por cubeta y trazas por
+etapa). El loop del frame no hace ningún trabajo extra: cada consulta arma el
+texto desde el hilo del servidor.
+
+Uso como scraper local (en lugar de un Prometheus real):
+    python metrics_exporter.py http://127.0.0.1:9108/metrics
+"""
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import psutil
+
+OPENMETRICS_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9108
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value):
+    """Valor exacto: enteros sin decimales y floats con todos sus dígitos"""
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _labels(**labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class _Family:
+    """Líneas de una familia de métricas (# TYPE, # HELP y muestras)"""
+
+    def __init__(self, name, kind, help_text, openmetrics):
+        self.name = name
+        self.kind = kind
+        self.openmetrics = openmetrics
+        # En texto Prometheus los contadores se declaran con el sufijo _total
+        type_name = f"{name}_total" if kind == "counter" and not openmetrics else name
+        self.lines = [f"# TYPE {type_name} {kind}", f"# HELP {type_name} {help_text}"]
+
+    def sample(self, value, suffix="", **labels):
+        self.lines.append(f"{self.name}{suffix}{_labels(**labels)} {_number(value)}")
+
+    def histogram(self, buckets, total, count, **labels):
+        for le, cumulative in buckets:
+            self.sample(cumulative, "_bucket", **labels, le=le)
+        self.sample(count, "_count", **labels)
+        self.sample(total, "_sum", **labels)
+
+
+class MetricsExporter:
+    def __init__(self, metrics, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.process = psutil.Process()
+        self.process.cpu_percent(None)  # Primera lectura: fija la referencia
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def start(self):
+        """Levanta el servidor en un hilo daemon; retorna si quedó escuchando"""
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+                body = exporter.render(openmetrics).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", OPENMETRICS_TYPE if openmetrics else PROMETHEUS_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Sin una línea de log por cada consulta
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            print(f"No se pudo iniciar el exportador de métricas en {self.host}:{self.port}: {e}")
+            return False
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]  # Con port=0 se elige uno libre
+        self._thread = threading.Thread(target=self._server.serve_forever, name="gestik-metricas", daemon=True)
+        self._thread.start()
+        print(f"📡 Métricas disponibles en {self.url}")
+        return True
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+    def render(self, openmetrics=True):
+        """Texto de exposición con el estado actual de las métricas"""
+        metrics = self.metrics
+        families = []
+
+        def family(name, kind, help_text):
+            new = _Family(name, kind, help_text, openmetrics)
+            families.append(new)
+            return new
+
+        family("gestik_uptime_seconds", "gauge", "Tiempo desde el inicio de la sesión").sample(
+            time.perf_counter() - metrics.start_perf)
+        family("gestik_frames", "counter", "Frames procesados").sample(metrics.total_frames, "_total")
+        family("gestik_fps", "gauge", "FPS (promedio exponencial)").sample(metrics.current_fps())
+
+        histogram = metrics.frame_time_histogram
+        family("gestik_frame_time_seconds", "histogram", "Tiempo entre frames procesados").histogram(
+            histogram.cumulative(), histogram.sum, histogram.count)
+
+        stages = family("gestik_stage_latency_seconds", "histogram", "Latencia por etapa del frame")
+        for stage, (buckets, total, count) in sorted(metrics.tracer.histograms().items()):
+            stages.histogram(buckets, total, count, stage=stage)
+
+        gestures = family("gestik_gestures", "counter", "Gestos detectados por tipo y resultado")
+        with metrics._gesture_lock:
+            attempts = dict(metrics.gesture_attempts)
+            successes = dict(metrics.gesture_successes)
+            response = metrics.response_time_histogram
+            response_state = (response.cumulative(), response.sum, response.count)
+        for gesture, count in sorted(attempts.items()):
+            success = successes.get(gesture, 0)
+            gestures.sample(success, "_total", gesture=gesture, result="success")
+            gestures.sample(count - success, "_total", gesture=gesture, result="failure")
+
+        family("gestik_gesture_response_seconds", "histogram",
+               "Latencia gesto a tecla (captura del frame hasta el envío)").histogram(*response_state)
+
+        family("gestik_system_cpu_percent", "gauge", "CPU del sistema").sample(metrics.cpu_usage.last())
+        family("gestik_system_memory_percent", "gauge", "Memoria del sistema").sample(metrics.memory_usage.last())
+        try:
+            process_cpu = self.process.cpu_percent(None)
+            process_memory = self.process.memory_info().rss
+        except psutil.Error:
+            process_cpu, process_memory = 0.0, 0
+        family("gestik_process_cpu_percent", "gauge", "CPU del proceso de GESTIK").sample(process_cpu)
+        family("gestik_process_resident_memory_bytes", "gauge", "Memoria residente del proceso").sample(
+            process_memory)
+
+        lines = [line for f in families for line in f.lines]
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def parse_metrics(text):
+    """{(nombre, ((etiqueta, valor), ...)): valor} a partir del texto de exposición"""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        series, value = line.rsplit(" ", 1)
+        name, _, labels = series.partition("{")
+        pairs = []
+        for pair in labels.rstrip("}").split('",'):
+            if pair:
+                key, raw = pair.split("=", 1)
+                pairs.append((key, raw.strip('"').replace('\\"', '"').replace("\\\\", "\\")))
+        samples[(name, tuple(pairs))] = float(value)
+    return samples
+
+
+def scrape(url=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}/metrics", timeout=2.0):
+    """Consulta el exportador como lo haría Prometheus; retorna las muestras"""
+    request = urllib.request.Request(url, headers={"Accept": OPENMETRICS_TYPE})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return parse_metrics(response.read().decode("utf-8"))
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else f"http://{DEFAULT_HOST}:{DEFAULT_PORT}/metrics"
+    try:
+        for (name, labels), value in scrape(target).items():
+            print(f"{name}{_labels(**dict(labels))} {value:g}")
+    except OSError as e:
+        print(f"[ERROR] No se pudo consultar {target}: {e}")
+        sys.exit(1)
@@ -0,0 +1,87 @@
+"""
+Capas de overlay estáticas precalculadas
+Los paneles y textos que no cambian entre frames se dibujan una sola vez en un
+sprite BGRA (color premultiplicado + alfa) por resolución. En cada frame solo
+se mezcla el sprite sobre su región del frame, en lugar de copiar el frame
+completo, aplicar addWeighted y volver a rasterizar cada cv2.putText.
+"""
+import cv2
+import numpy as np
+
+
+class SpriteCanvas:
+    """Lienzo temporal, en coordenadas del frame, para construir un sprite"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.color = np.zeros((height, width, 3), dtype=np.uint8)
+        self.alpha = np.zeros((height, width), dtype=np.uint8)
+
+    def panel(self, top_left, bottom_right, opacity, color=(0, 0, 0)):
+        """Rectángulo relleno semitransparente (opacity = peso del panel)"""
+        cv2.rectangle(self.color, top_left, bottom_right, color, -1)
+        cv2.rectangle(self.alpha, top_left, bottom_right, int(round(opacity * 255)), -1)
+
+    def text(self, text, org, scale, color, thickness=1, font=cv2.FONT_HERSHEY_SIMPLEX):
+        """Texto opaco, igual que cv2.putText sobre el frame"""
+        cv2.putText(self.color, text, org, font, scale, color, thickness)
+        cv2.putText(self.alpha, text, org, font, scale, 255, thickness)
+
+    def to_sprite(self):
+        """Recorta el lienzo a la región dibujada"""
+        ys, xs = np.nonzero(self.alpha)
+        if len(xs) == 0:
+            return None
+        x0, x1 = xs.min(), xs.max() + 1
+        y0, y1 = ys.min(), ys.max() + 1
+        return OverlaySprite(x0, y0, self.color[y0:y1, x0:x1], self.alpha[y0:y1, x0:x1])
+
+
+class OverlaySprite:
+    """Capa BGRA lista para mezclarse sobre una región del frame"""
+
+    def __init__(self, x, y, color, alpha):
+        self.x = int(x)
+        self.y = int(y)
+        self.height, self.width = alpha.shape
+        alpha3 = cv2.merge([alpha, alpha, alpha])
+        # color·α y (255 - α) se precalculan para que la mezcla sean dos operaciones
+        self.premultiplied = cv2.multiply(color, alpha3, scale=1 / 255)
+        self.inverse_alpha = cv2.subtract(np.full_like(alpha3, 255), alpha3)
+
+    def blend(self, frame):
+        """frame = frame·(1 - α) + color·α, solo dentro de la región del sprite"""
+        roi = frame[self.y:self.y + self.height, self.x:self.x + self.width]
+        cv2.multiply(roi, self.inverse_alpha, dst=roi, scale=1 / 255)
+        cv2.add(roi, self.premultiplied, dst=roi)
+        return frame
+
+
+class OverlayCache:
+    """
+    Guarda el sprite de una pantalla y solo lo reconstruye si cambia el tamaño
+    del frame o la clave (p. ej. la opción seleccionada del menú).
+    build(canvas, key) dibuja la capa estática sobre un SpriteCanvas.
+    """
+
+    def __init__(self, build):
+        self.build = build
+        self._cache_key = None
+        self._sprite = None
+
+    def draw(self, frame, key=None):
+        height, width = frame.shape[:2]
+        cache_key = (width, height, key)
+        if cache_key != self._cache_key:
+            canvas = SpriteCanvas(width, height)
+            self.build(canvas, key)
+            self._sprite = canvas.to_sprite()
+            self._cache_key = cache_key
+        if self._sprite is not None:
+            self._sprite.blend(frame)
+        return frame
+
+    def invalidate(self):
+        """Fuerza la reconstrucción del sprite en el siguiente frame"""
+        self._cache_key = None
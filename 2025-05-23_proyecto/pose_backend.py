@@ -0,0 +1,82 @@
+"""
+Modelo de pose configurable para el modo Hollow Knight
+Construye Pose con la complejidad elegida (0: lite, 1: full, 2: heavy) y sin
+las salidas que GESTIK no usa (máscara de segmentación). Mide el tiempo de
+cada inferencia y, si el promedio supera el presupuesto por frame, reconstruye
+el modelo con la complejidad inferior. Solo baja: volver a subir haría oscilar
+el modelo en equipos que están justo en el límite.
+"""
+import time
+
+import numpy as np
+from mediapipe.python.solutions.pose import Pose
+
+from camera_config import POSE_AUTO_DOWNGRADE, POSE_FRAME_BUDGET_MS, POSE_MODEL_COMPLEXITY
+from streaming_stats import EWMA
+
+
+def create_pose_model(complexity):
+    """Pose de MediaPipe sin segmentación; los landmarks se suavizan entre frames"""
+    return Pose(
+        static_image_mode=False,
+        model_complexity=complexity,
+        smooth_landmarks=True,
+        enable_segmentation=False,
+        smooth_segmentation=False,
+    )
+
+
+class PoseBackend:
+    """Envuelve el modelo Pose con la misma interfaz process()/close()"""
+
+    def __init__(self, complexity=POSE_MODEL_COMPLEXITY, auto_downgrade=POSE_AUTO_DOWNGRADE,
+                 budget_ms=POSE_FRAME_BUDGET_MS, factory=create_pose_model):
+        self.complexity = complexity
+        self.auto_downgrade = auto_downgrade
+        self.budget_ms = budget_ms
+        self.factory = factory
+        self.model = factory(complexity)
+
+        self.process_time = EWMA(alpha=0.05)  # ms por inferencia
+        self.samples = 0
+        # La primera inferencia de cada modelo inicializa el grafo (p. ej. el
+        # calentamiento en vacío de DetectorRegistry.get) y tarda varias veces
+        # más que las siguientes; no cuenta para el promedio
+        self.warmup_calls = 1
+        self.min_samples = 60  # Inferencias antes de decidir un cambio
+        self.downgrades = []  # (complejidad anterior, nueva, ms promedio)
+
+    def process(self, image_rgb):
+        start = time.perf_counter_ns()
+        results = self.model.process(image_rgb)
+        elapsed_ms = (time.perf_counter_ns() - start) / 1_000_000
+
+        if self.warmup_calls > 0:
+            self.warmup_calls -= 1
+        elif self.auto_downgrade and self.complexity > 0:
+            average = self.process_time.update(elapsed_ms)
+            self.samples += 1
+            if self.samples >= self.min_samples and average > self.budget_ms:
+                self.downgrade(image_rgb.shape)
+        return results
+
+    def downgrade(self, warmup_shape=None):
+        """Reemplaza el modelo por el de complejidad inferior"""
+        average = self.process_time.value
+        previous = self.complexity
+        self.complexity -= 1
+        print(f"Pose: {average:.1f} ms por frame (presupuesto {self.budget_ms} ms), "
+              f"bajando complejidad {previous} → {self.complexity}")
+        self.model.close()
+        self.model = self.factory(self.complexity)
+        # La primera inferencia inicializa el grafo; no cuenta para el promedio
+        self.warmup_calls = 1
+        if warmup_shape is not None:
+            self.model.process(np.zeros(warmup_shape, dtype=np.uint8))
+            self.warmup_calls = 0
+        self.downgrades.append((previous, self.complexity, average))
+        self.process_time = EWMA(alpha=self.process_time.alpha)
+        self.samples = 0
+
+    def close(self):
+        self.model.close()
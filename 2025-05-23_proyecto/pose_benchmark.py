@@ -0,0 +1,100 @@
+"""
+Benchmark de complejidad del modelo de pose sobre clips grabados
+Para cada clip y cada complejidad mide los FPS del modelo (sin contar la
+lectura del video ni la primera inferencia, de calentamiento) y compara
+contra la complejidad más alta de la lista:
+- detección: frames con persona encontrada
+- error: distancia media (normalizada) de los landmarks que usa PoseDetector
+- acuerdo: frames en que las pruebas de acción (inclinación, salto, ataque,
+  palmas) dan el mismo resultado que la referencia
+
+Uso:
+    python pose_benchmark.py clip1.mp4 [clip2.mp4 ...] [--complexities 0 1 2]
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+import pose_features as pf
+from camera_config import INFERENCE_RESOLUTION
+from inference_scaler import InferenceScaler
+from pose_backend import create_pose_model
+
+
+def run_clip(path, complexity, scaler, max_frames=None):
+    """Procesa el clip; retorna (segundos de inferencia, puntos (n, 6, 2) con NaN sin persona)"""
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise OSError(f"No se pudo abrir el clip: {path}")
+    model = create_pose_model(complexity)
+    points = []
+    elapsed = 0.0
+    try:
+        while max_frames is None or len(points) < max_frames:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            image_rgb = scaler.prepare(frame)
+            if not points:
+                # Calentamiento sin medir: la primera inferencia carga el grafo.
+                # Con una imagen vacía no queda ninguna persona en seguimiento
+                model.process(np.zeros_like(image_rgb))
+            start = time.perf_counter()
+            results = model.process(image_rgb)
+            elapsed += time.perf_counter() - start
+            if results.pose_landmarks:
+                points.append(pf.landmarks_to_array(results.pose_landmarks.landmark))
+            else:
+                points.append(np.full((len(pf.POSE_POINTS), 2), np.nan, dtype=np.float32))
+    finally:
+        model.close()
+        capture.release()
+    return elapsed, np.array(points).reshape(-1, len(pf.POSE_POINTS), 2)
+
+
+def compare(points, reference):
+    """(detección, error medio, acuerdo de acciones) frente a la referencia"""
+    detected = ~np.isnan(points).any(axis=(1, 2))
+    both = detected & ~np.isnan(reference).any(axis=(1, 2))
+    if not both.any():
+        return detected.mean(), np.nan, np.nan
+    error = np.linalg.norm(points[both] - reference[both], axis=-1).mean()
+    tests = pf.evaluate(pf.pose_measures(points[both]))
+    reference_tests = pf.evaluate(pf.pose_measures(reference[both]))
+    agreement = (tests == reference_tests).all(axis=-1).mean()
+    return detected.mean(), error, agreement
+
+
+def benchmark(clips, complexities, resolution=INFERENCE_RESOLUTION, max_frames=None):
+    scaler = InferenceScaler(resolution=resolution)
+    reference_complexity = max(complexities)
+    rows = []
+    for clip in clips:
+        runs = {c: run_clip(clip, c, scaler, max_frames) for c in sorted(complexities, reverse=True)}
+        reference = runs[reference_complexity][1]
+        for complexity in sorted(complexities):
+            elapsed, points = runs[complexity]
+            detection, error, agreement = compare(points, reference)
+            fps = len(points) / elapsed if elapsed else 0.0
+            rows.append((clip, complexity, len(points), fps, detection, error, agreement))
+    return rows, reference_complexity
+
+
+def print_table(rows, reference_complexity):
+    print(f"{'clip':<32} {'compl.':>6} {'frames':>7} {'FPS':>7} {'detección':>10} "
+          f"{'error':>7} {'acuerdo':>8}   (referencia: complejidad {reference_complexity})")
+    for clip, complexity, frames, fps, detection, error, agreement in rows:
+        print(f"{clip[-32:]:<32} {complexity:>6} {frames:>7} {fps:>7.1f} {detection:>10.1%} "
+              f"{error:>7.4f} {agreement:>8.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FPS y precisión del modelo de pose por complejidad")
+    parser.add_argument("clips", nargs="+", help="videos grabados")
+    parser.add_argument("--complexities", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--max-frames", type=int, default=None)
+    args = parser.parse_args()
+
+    print_table(*benchmark(args.clips, args.complexities, max_frames=args.max_frames))
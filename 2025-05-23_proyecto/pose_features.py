@@ -0,0 +1,81 @@
+"""
+Pruebas vectorizadas de las acciones de pose (Hollow Knight)
+Los landmarks que usan las acciones se convierten en un arreglo (6, 2) una sola
+vez por frame. Cada acción se reduce a una medida escalar que se compara con
+su umbral; todas las medidas se evalúan juntas y con histéresis: una prueba se
+activa al cruzar el umbral de entrada y solo se desactiva al volver a cruzar un
+umbral de salida más holgado, así el ruido cerca del límite no genera
+transiciones press/release. Las funciones aceptan también lotes (..., 6, 2).
+"""
+import numpy as np
+from mediapipe.python.solutions.pose import PoseLandmark
+
+# Landmarks usados, en el orden del arreglo
+POSE_POINTS = np.array([
+    PoseLandmark.LEFT_SHOULDER, PoseLandmark.RIGHT_SHOULDER,
+    PoseLandmark.LEFT_WRIST, PoseLandmark.RIGHT_WRIST,
+    PoseLandmark.LEFT_KNEE, PoseLandmark.RIGHT_KNEE,
+], dtype=np.intp)
+L_SHOULDER, R_SHOULDER, L_WRIST, R_WRIST, L_KNEE, R_KNEE = range(len(POSE_POINTS))
+WRISTS = slice(L_WRIST, R_WRIST + 1)
+KNEES = slice(L_KNEE, R_KNEE + 1)
+
+# Pruebas (columnas de pose_measures): nombre, dirección (+1: activa por encima
+# del umbral, -1: por debajo), umbral de entrada y umbral de salida
+TESTS = (
+    # Inclinación: diferencia de altura entre hombros
+    ("tilt_left", +1, 0.08, 0.06),
+    ("tilt_right", +1, 0.08, 0.06),
+    # Salto: ambas muñecas cerca de su rodilla (distancia vertical)
+    ("jump", -1, 0.18, 0.21),
+    # Ataque: alguna muñeca por encima de la clavícula
+    ("attack", +1, 0.05, 0.03),
+    # Palmas tocándose: muñecas juntas y a una altura razonable
+    ("palms_close", -1, 0.08, 0.10),
+    ("palms_above_min", +1, 0.3, 0.3),
+    ("palms_below_max", -1, 0.8, 0.8),
+)
+TEST_NAMES = tuple(test[0] for test in TESTS)
+(TILT_LEFT, TILT_RIGHT, JUMP, ATTACK,
+ PALMS_CLOSE, PALMS_ABOVE_MIN, PALMS_BELOW_MAX) = range(len(TESTS))
+DIRECTION = np.array([test[1] for test in TESTS], dtype=np.float32)
+ENTER = np.array([test[2] for test in TESTS], dtype=np.float32)
+EXIT = np.array([test[3] for test in TESTS], dtype=np.float32)
+
+
+def landmarks_to_array(pose_landmarks):
+    """Convierte la lista de landmarks de pose en un arreglo (6, 2) de float32"""
+    return np.array(
+        [(pose_landmarks[i].x, pose_landmarks[i].y) for i in POSE_POINTS], dtype=np.float32
+    )
+
+
+def pose_measures(points):
+    """Medida de cada prueba de TESTS para (..., 6, 2) puntos → (..., len(TESTS))"""
+    y = points[..., 1]
+    shoulder_diff = y[..., R_SHOULDER] - y[..., L_SHOULDER]
+    clavicle_y = (y[..., L_SHOULDER] + y[..., R_SHOULDER]) / 2
+    wrists_y = y[..., WRISTS]
+    measures = np.empty(points.shape[:-2] + (len(TESTS),), dtype=points.dtype)
+    measures[..., TILT_LEFT] = shoulder_diff
+    measures[..., TILT_RIGHT] = -shoulder_diff
+    measures[..., JUMP] = np.abs(wrists_y - y[..., KNEES]).max(axis=-1)
+    measures[..., ATTACK] = clavicle_y - wrists_y.min(axis=-1)
+    measures[..., PALMS_CLOSE] = np.abs(points[..., L_WRIST, :] - points[..., R_WRIST, :]).max(axis=-1)
+    measures[..., PALMS_ABOVE_MIN] = wrists_y.min(axis=-1)
+    measures[..., PALMS_BELOW_MAX] = wrists_y.max(axis=-1)
+    return measures
+
+
+def evaluate(measures, active=None, enter=ENTER, exit=EXIT):
+    """
+    Resultado booleano de cada prueba. active es el resultado del frame anterior:
+    las pruebas activas usan el umbral de salida (histéresis). Sin active se
+    usan solo los umbrales de entrada (p. ej. para lotes).
+    """
+    thresholds = enter if active is None else np.where(active, exit, enter)
+    return DIRECTION * (measures - thresholds) > 0
+
+
+def palms_touching(tests):
+    return tests[..., PALMS_CLOSE] & tests[..., PALMS_ABOVE_MIN] & tests[..., PALMS_BELOW_MAX]
@@ -0,0 +1,69 @@
+"""
+Benchmark sin cámara del pipeline de gestos
+Reproduce videos grabados o flujos de landmarks (.npz) a través de
+GestureGameApp.process_frame sin ventana ni teclado, y reporta los FPS y la
+latencia por etapa (p50/p95/p99) de cada grabación.
+
+Uso:
+    python replay_benchmark.py clip.mp4 sesion.npz [--state hollow_knight]
+    python replay_benchmark.py clip.mp4 --record-landmarks grabaciones/
+    python replay_benchmark.py clip.mp4 --realtime   # a la velocidad original
+"""
+import argparse
+import os
+import time
+
+from detector_registry import DETECTOR_FACTORIES
+from frame_source import LandmarkRecorder, open_source
+from game_states import GameState
+from main import GestureGameApp
+
+
+def run_recording(path, state, realtime=False, max_frames=None, record_dir=None):
+    """Reproduce una grabación completa; retorna (frames, segundos, resumen por etapa)"""
+    source = open_source(path, realtime=realtime, max_frames=max_frames)
+    if record_dir is not None:
+        source = LandmarkRecorder(source, DETECTOR_FACTORIES)
+    app = GestureGameApp(source=source, headless=True, initial_state=state)
+
+    frames = 0
+    start = time.perf_counter()
+    try:
+        while app.process_frame() is not None:
+            frames += 1
+        elapsed = time.perf_counter() - start
+        stages = app.tracer.summary()
+    finally:
+        app.cleanup()
+
+    if record_dir is not None:
+        os.makedirs(record_dir, exist_ok=True)
+        name = os.path.splitext(os.path.basename(path))[0]
+        print(f"💾 Landmarks guardados en: {source.save(os.path.join(record_dir, name + '.npz'))}")
+    return frames, elapsed, stages
+
+
+def print_result(path, frames, elapsed, stages):
+    fps = frames / elapsed if elapsed else 0.0
+    print(f"\n{path}: {frames} frames en {elapsed:.2f}s → {fps:.1f} FPS")
+    print(f"  {'etapa':<16} {'n':>7} {'media':>8} {'p50':>8} {'p95':>8} {'p99':>8}  (ms)")
+    for stage, values in sorted(stages.items(), key=lambda item: -item[1]["mean_ms"]):
+        print(f"  {stage:<16} {values['count']:>7} {values['mean_ms']:>8.2f} {values['p50']:>8.2f} "
+              f"{values['p95']:>8.2f} {values['p99']:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FPS y latencia por etapa sobre grabaciones")
+    parser.add_argument("recordings", nargs="+", help="videos o flujos de landmarks (.npz)")
+    parser.add_argument("--state", default=GameState.MAIN_MENU.value,
+                        choices=[state.value for state in GameState if state != GameState.CLOSED])
+    parser.add_argument("--realtime", action="store_true", help="reproducir a la velocidad original")
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument("--record-landmarks", metavar="DIR", default=None,
+                        help="guardar el flujo de landmarks de cada video en DIR")
+    args = parser.parse_args()
+
+    for recording in args.recordings:
+        record_dir = args.record_landmarks if not recording.endswith(".npz") else None
+        print_result(recording, *run_recording(
+            recording, GameState(args.state), args.realtime, args.max_frames, record_dir))
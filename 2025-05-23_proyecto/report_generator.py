@@ -0,0 +1,354 @@
+"""
+Generador de reportes de métricas de GESTIK
+Lee la carpeta de una sesión escrita por SessionLog y genera los gráficos y el
+resumen en texto. Se ejecuta en un proceso aparte al cerrar la aplicación (ver
+MetricsCollector.generate_report) y también puede lanzarse a mano para
+regenerar los reportes de una sesión anterior:
+
+    python report_generator.py reports/sessions/20250726_035303
+"""
+import argparse
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+import numpy as np
+
+from session_log import load_channel, load_meta
+from stage_tracer import write_chrome_trace
+
+
+def spawn_report(session_path, reports_dir="reports"):
+    """Lanza la generación de reportes en otro proceso sin esperar a que termine"""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "report_generator.py")
+    return subprocess.Popen(
+        [sys.executable, script, os.path.abspath(session_path), "--output", os.path.abspath(reports_dir)],
+        cwd=os.path.dirname(script),
+    )
+
+
+def load_session(session_path):
+    """Datos de la sesión: {canal: {columna: arreglo}} más "meta" """
+    session = {
+        name: load_channel(session_path, name)
+        for name in ("frames", "fps", "resources", "gestures", "stages")
+    }
+    session["meta"] = load_meta(session_path)
+    return session
+
+
+def generate_report(session_path, reports_dir="reports"):
+    """Genera reporte completo con gráficos"""
+    # Las librerías de gráficos solo se cargan en este proceso
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    print("📊 Generando reporte de métricas...")
+    session = load_session(session_path)
+    meta = session["meta"]
+    session_duration = meta.get("duration_s", 0.0)
+
+    # Crear directorio de reportes
+    if not os.path.exists(reports_dir):
+        os.makedirs(reports_dir)
+
+    # Los reportes llevan la marca de tiempo de la sesión, no la de generación
+    timestamp = meta.get("session_id") or datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    # 1. Reporte de FPS
+    _generate_fps_report(plt, session, reports_dir, timestamp)
+
+    # 2. Reporte de recursos
+    _generate_resource_report(plt, session, reports_dir, timestamp)
+
+    # 3. Reporte de gestos que produjeron una acción
+    _generate_gesture_accuracy_report(plt, session, reports_dir, timestamp)
+
+    # 4. Reporte de responsividad
+    _generate_responsiveness_report(plt, session, reports_dir, timestamp)
+
+    # 5. Desglose de latencia por etapa (+ traza para chrome://tracing)
+    _generate_latency_report(plt, session, reports_dir, timestamp)
+
+    # 6. Resumen general
+    _generate_summary_report(session, reports_dir, timestamp, session_duration)
+
+    print(f"✅ Reportes generados en carpeta: {reports_dir}/")
+    print(f"📈 Duración de sesión: {session_duration:.1f} segundos")
+
+
+def gesture_series(session):
+    """{gesto: (intentos, éxitos, tiempos de respuesta en ms)}"""
+    gestures = session["gestures"]
+    names = session["meta"].get("gesture_names", [])
+    series = {}
+    for index, name in enumerate(names):
+        mask = gestures["gesture"] == index
+        success = gestures["success"][mask]
+        times = gestures["response_ms"][mask]
+        series[name] = (int(mask.sum()), int(success.sum()), times[~np.isnan(times)])
+    return series
+
+
+def stage_summary(session):
+    """{etapa: {"count", "mean_ms", "p50", "p95", "p99"}} desde los eventos guardados"""
+    stages = session["stages"]
+    names = session["meta"].get("stage_names", [])
+    summary = {}
+    for index, name in enumerate(names):
+        durations = stages["duration_ns"][stages["stage"] == index] / 1_000_000
+        if len(durations) == 0:
+            continue
+        p50, p95, p99 = np.percentile(durations, [50, 95, 99])
+        summary[name] = {
+            "count": len(durations), "mean_ms": float(durations.mean()),
+            "p50": float(p50), "p95": float(p95), "p99": float(p99),
+        }
+    return summary
+
+
+def _generate_fps_report(plt, session, reports_dir, timestamp):
+    """Genera gráfico de FPS"""
+    fps = session["fps"]
+    if not fps:
+        return
+
+    fps_history = fps["fps"]
+    plt.figure(figsize=(12, 6))
+    plt.plot(fps["t"], fps_history, 'b-', linewidth=1.5, alpha=0.8)
+    plt.axhline(y=30, color='g', linestyle='--', alpha=0.7, label='Objetivo (30 FPS)')
+    plt.axhline(y=np.mean(fps_history), color='r', linestyle='--', alpha=0.7,
+                label=f'Promedio ({np.mean(fps_history):.1f} FPS)')
+
+    plt.title('Rendimiento de FPS durante la sesión', fontsize=14, fontweight='bold')
+    plt.xlabel('Tiempo (segundos)')
+    plt.ylabel('Frames por Segundo (FPS)')
+    plt.grid(True, alpha=0.3)
+    plt.legend()
+    plt.tight_layout()
+
+    plt.savefig(f'{reports_dir}/fps_report_{timestamp}.png', dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def _generate_resource_report(plt, session, reports_dir, timestamp):
+    """Genera gráfico de uso de recursos"""
+    resources = session["resources"]
+    if not resources:
+        return
+
+    times = resources["t"]
+    cpu_usage = resources["cpu"]
+    memory_usage = resources["memory"]
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
+
+    # CPU Usage
+    ax1.plot(times, cpu_usage, 'r-', linewidth=1.5, label='CPU Usage')
+    ax1.axhline(y=np.mean(cpu_usage), color='r', linestyle='--', alpha=0.7,
+                label=f'Promedio ({np.mean(cpu_usage):.1f}%)')
+    ax1.set_title('Uso de CPU durante la sesión', fontweight='bold')
+    ax1.set_ylabel('CPU (%)')
+    ax1.grid(True, alpha=0.3)
+    ax1.legend()
+    ax1.set_ylim(0, 100)
+
+    # Memory Usage
+    ax2.plot(times, memory_usage, 'b-', linewidth=1.5, label='Memory Usage')
+    ax2.axhline(y=np.mean(memory_usage), color='b', linestyle='--', alpha=0.7,
+                label=f'Promedio ({np.mean(memory_usage):.1f}%)')
+    ax2.set_title('Uso de Memoria durante la sesión', fontweight='bold')
+    ax2.set_xlabel('Tiempo (segundos)')
+    ax2.set_ylabel('Memoria (%)')
+    ax2.grid(True, alpha=0.3)
+    ax2.legend()
+    ax2.set_ylim(0, 100)
+
+    plt.tight_layout()
+    plt.savefig(f'{reports_dir}/resources_report_{timestamp}.png', dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def _generate_gesture_accuracy_report(plt, session, reports_dir, timestamp):
+    """Genera reporte de gestos que produjeron una acción"""
+    series = gesture_series(session) if session["gestures"] else {}
+    gestures = [name for name, (attempts, _, _) in series.items() if attempts]
+    if not gestures:
+        return
+
+    accuracies = [series[name][1] / series[name][0] * 100 for name in gestures]
+
+    # Crear gráfico de barras
+    fig, ax1 = plt.subplots(figsize=(12, 6))
+    colors = ['#2E8B57' if acc >= 90 else '#FF6B35' if acc < 85 else '#FFD23F' for acc in accuracies]
+    bars = ax1.bar(gestures, accuracies, color=colors, alpha=0.8)
+
+    # Agregar etiquetas de porcentaje
+    for bar, acc in zip(bars, accuracies):
+        height = bar.get_height()
+        ax1.text(bar.get_x() + bar.get_width() / 2., height + 1,
+                 f'{acc:.1f}%', ha='center', va='bottom', fontweight='bold')
+
+    ax1.set_title('Gestos que Produjeron una Acción', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Acciones enviadas / intentos (%)')
+    ax1.set_ylim(0, 105)
+    ax1.grid(True, alpha=0.3, axis='y')
+    plt.setp(ax1.get_xticklabels(), rotation=45, ha='right')
+
+    plt.tight_layout()
+    plt.savefig(f'{reports_dir}/gesture_accuracy_{timestamp}.png', dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def _generate_responsiveness_report(plt, session, reports_dir, timestamp):
+    """Genera reporte de tiempo de respuesta"""
+    series = gesture_series(session) if session["gestures"] else {}
+    series = {name: times for name, (_, _, times) in series.items() if len(times)}
+    if not series:
+        return
+    all_times = np.concatenate(list(series.values()))
+
+    plt.figure(figsize=(12, 8))
+
+    # Histograma de tiempos de respuesta
+    plt.subplot(2, 1, 1)
+    plt.hist(all_times, bins=20, alpha=0.7, color='skyblue', edgecolor='black')
+    plt.axvline(np.mean(all_times), color='red', linestyle='--', linewidth=2,
+                label=f'Promedio: {np.mean(all_times):.1f}ms')
+    plt.axvline(np.median(all_times), color='green', linestyle='--', linewidth=2,
+                label=f'Mediana: {np.median(all_times):.1f}ms')
+    plt.title('Distribución de Tiempos de Respuesta', fontsize=14, fontweight='bold')
+    plt.xlabel('Tiempo de Respuesta (ms)')
+    plt.ylabel('Frecuencia')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+
+    # Box plot por gesto
+    plt.subplot(2, 1, 2)
+    bp = plt.boxplot(list(series.values()), patch_artist=True)
+    plt.xticks(range(1, len(series) + 1), list(series.keys()))
+    for patch in bp['boxes']:
+        patch.set_facecolor('lightblue')
+        patch.set_alpha(0.7)
+
+    plt.title('Tiempo de Respuesta por Gesto', fontsize=14, fontweight='bold')
+    plt.ylabel('Tiempo de Respuesta (ms)')
+    plt.xticks(rotation=45)
+    plt.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(f'{reports_dir}/responsiveness_{timestamp}.png', dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def _generate_latency_report(plt, session, reports_dir, timestamp):
+    """Genera gráfico de latencia por etapa y exporta la traza de la sesión"""
+    stages = stage_summary(session) if session["stages"] else {}
+    if not stages:
+        return
+
+    meta = session["meta"]
+    thread_names = {int(thread): name for thread, name in meta.get("thread_names", {}).items()}
+    write_chrome_trace(f'{reports_dir}/trace_{timestamp}.json', session["stages"],
+                       meta.get("stage_names", []), thread_names, pid=meta.get("pid", 0))
+
+    names = list(stages.keys())
+    positions = np.arange(len(names))
+    height = 0.25
+
+    plt.figure(figsize=(12, max(4, len(names) * 0.8)))
+    for offset, (key, color) in enumerate([("p50", '#2E8B57'), ("p95", '#FFD23F'), ("p99", '#FF6B35')]):
+        values = [stages[name][key] for name in names]
+        plt.barh(positions + (offset - 1) * height, values, height, color=color, alpha=0.8, label=key)
+
+    plt.yticks(positions, names)
+    plt.gca().invert_yaxis()
+    plt.title('Latencia por Etapa del Frame', fontsize=14, fontweight='bold')
+    plt.xlabel('Tiempo (ms)')
+    plt.grid(True, alpha=0.3, axis='x')
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(f'{reports_dir}/latency_breakdown_{timestamp}.png', dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def _describe(values, fmt="{:.1f}"):
+    """(promedio, mínimo, máximo) formateados; 0 si no hay datos"""
+    if len(values) == 0:
+        values = np.zeros(1)
+    return tuple(fmt.format(stat) for stat in (np.mean(values), np.min(values), np.max(values)))
+
+
+def _generate_summary_report(session, reports_dir, timestamp, session_duration):
+    """Genera reporte resumen en texto"""
+    meta = session["meta"]
+    fps_history = session["fps"].get("fps", np.zeros(0))
+    frame_ms = session["frames"].get("frame_ms", np.zeros(0))
+    cpu_usage = session["resources"].get("cpu", np.zeros(0))
+    memory_usage = session["resources"].get("memory", np.zeros(0))
+
+    fps_mean, fps_min, fps_max = _describe(fps_history)
+    frame_quantiles = np.percentile(frame_ms, [50, 95, 99]) if len(frame_ms) else np.zeros(3)
+    cpu_mean, _, cpu_max = _describe(cpu_usage)
+    memory_mean, _, _ = _describe(memory_usage)
+
+    stages = stage_summary(session) if session["stages"] else {}
+    stage_lines = "\n".join(
+        f"- {name}: {stats['p50']:.2f} / {stats['p95']:.2f} / {stats['p99']:.2f} ms ({stats['count']} muestras)"
+        for name, stats in stages.items()
+    ) or "- Sin datos de etapas"
+
+    summary = f"""
+# GESTIK - Reporte de Métricas de Sesión
+Generado: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Duración: {session_duration:.1f} segundos ({session_duration/60:.1f} minutos)
+
+## 📊 RENDIMIENTO GENERAL
+- Frames procesados: {meta.get('total_frames', len(frame_ms))}
+- FPS promedio: {fps_mean}
+- FPS mínimo: {fps_min}
+- FPS máximo: {fps_max}
+- Tiempo por frame p50/p95/p99: {frame_quantiles[0]:.1f} / {frame_quantiles[1]:.1f} / {frame_quantiles[2]:.1f} ms
+
+## ⏱️ LATENCIA POR ETAPA (p50 / p95 / p99)
+{stage_lines}
+
+## 💻 RECURSOS DEL SISTEMA
+- CPU promedio: {cpu_mean}%
+- Memoria promedio: {memory_mean}%
+- CPU máximo: {cpu_max}%
+
+## 🖐️ GESTOS (acciones enviadas / intentos)
+"""
+
+    series = gesture_series(session) if session["gestures"] else {}
+    for gesture, (attempts, successes, _) in series.items():
+        if attempts:
+            summary += f"- {gesture}: {successes / attempts * 100:.1f}% ({successes}/{attempts})\n"
+
+    all_times = [times for _, _, times in series.values() if len(times)]
+    if all_times:
+        all_times = np.concatenate(all_times)
+        p50, p95, p99 = np.percentile(all_times, [50, 95, 99])
+        summary += f"""
+## ⚡ RESPONSIVIDAD (captura del frame → tecla enviada)
+- Tiempo promedio: {np.mean(all_times):.1f}ms
+- p50 / p95 / p99: {p50:.1f} / {p95:.1f} / {p99:.1f} ms
+- Tiempo mínimo: {np.min(all_times):.1f}ms
+- Tiempo máximo: {np.max(all_times):.1f}ms
+- Desviación estándar: {np.std(all_times):.1f}ms
+"""
+
+    with open(f'{reports_dir}/summary_report_{timestamp}.txt', 'w', encoding='utf-8') as f:
+        f.write(summary)
+
+    print("📝 Reporte resumen generado")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera los reportes de una sesión de GESTIK")
+    parser.add_argument("session", help="Carpeta de la sesión (reports/sessions/<fecha>)")
+    parser.add_argument("--output", default="reports", help="Carpeta de salida de los reportes")
+    args = parser.parse_args()
+    generate_report(args.session, args.output)
@@ -0,0 +1,116 @@
+"""
+Registro binario de la sesión de métricas
+Cada canal (frames, recursos, gestos, etapas) acumula sus columnas en arreglos
+NumPy preasignados. Al llenarse un bloque se entrega a un hilo escritor que lo
+guarda como un archivo .npz independiente, así el registro crece por bloques
+sin reescribir nada y sin bloquear el hilo del frame. report_generator.py lee
+la carpeta de la sesión y genera los reportes en otro proceso.
+
+Estructura de la carpeta:
+    <sesión>/frames_00000.npz, frames_00001.npz, ...
+    <sesión>/gestures_00000.npz, ...
+    <sesión>/stages_00000.npz, ...
+    <sesión>/meta.json
+"""
+import glob
+import json
+import os
+import queue
+import threading
+
+import numpy as np
+
+
+class LogChannel:
+    """Serie de registros con columnas fijas, escrita en bloques .npz"""
+
+    def __init__(self, log, name, columns, chunk_size):
+        self.log = log
+        self.name = name
+        self.columns = columns  # {columna: dtype}
+        self.chunk_size = chunk_size
+        self._chunk_index = 0
+        self._new_chunk()
+
+    def _new_chunk(self):
+        self._data = {column: np.zeros(self.chunk_size, dtype=dtype)
+                      for column, dtype in self.columns.items()}
+        self._count = 0
+
+    def append(self, *values):
+        """Agrega un registro con un valor por columna (en el orden declarado)"""
+        row = self._count
+        for column, value in zip(self._data.values(), values):
+            column[row] = value
+        self._count += 1
+        if self._count == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Entrega el bloque actual (aunque esté incompleto) al hilo escritor"""
+        if self._count == 0:
+            return
+        chunk = {column: values[:self._count] for column, values in self._data.items()}
+        path = os.path.join(self.log.path, f"{self.name}_{self._chunk_index:05d}.npz")
+        self.log.write(path, chunk)
+        self._chunk_index += 1
+        self._new_chunk()
+
+
+class SessionLog:
+    def __init__(self, path, chunk_size=4096):
+        self.path = path
+        self.chunk_size = chunk_size
+        os.makedirs(path, exist_ok=True)
+
+        self.channels = {}
+        self._writes = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="gestik-sesion", daemon=True)
+        self._writer.start()
+
+    def channel(self, name, columns, chunk_size=None):
+        """Declara un canal con {columna: dtype}; retorna el LogChannel"""
+        channel = LogChannel(self, name, columns, chunk_size or self.chunk_size)
+        self.channels[name] = channel
+        return channel
+
+    def write(self, path, chunk):
+        self._writes.put((path, chunk))
+
+    def _write_loop(self):
+        while True:
+            item = self._writes.get()
+            if item is None:
+                return
+            path, chunk = item
+            try:
+                np.savez(path, **chunk)
+            except Exception as e:
+                print(f"Error guardando bloque de sesión {path}: {e}")
+
+    def close(self, meta=None, timeout=5.0):
+        """Vacía todos los canales, guarda meta.json y detiene el escritor"""
+        for channel in self.channels.values():
+            channel.flush()
+        self._writes.put(None)
+        self._writer.join(timeout)
+
+        with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta or {}, f, ensure_ascii=False, indent=2)
+
+
+def load_channel(path, name):
+    """Concatena los bloques de un canal; retorna {columna: arreglo} ({} si no hay)"""
+    files = sorted(glob.glob(os.path.join(path, f"{name}_*.npz")))
+    if not files:
+        return {}
+    chunks = [dict(np.load(file)) for file in files]
+    return {column: np.concatenate([chunk[column] for chunk in chunks]) for column in chunks[0]}
+
+
+def load_meta(path):
+    meta_path = os.path.join(path, "meta.json")
+    if not os.path.exists(meta_path):
+        return {}
+    with open(meta_path, encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,193 @@
+"""
+Trazas de latencia por etapa del frame
+Cada etapa (captura, flip, preprocesado, modelos, lógica de gestos, dibujo,
+visualización) se mide con perf_counter_ns. Registrar una medición solo guarda
+la duración en un buffer circular por etapa; los percentiles p50/p95/p99 se
+calculan sobre esa ventana cuando se piden. Con un canal del registro de
+sesión conectado (stream_to) cada evento se agrega a sus bloques .npz; sin él,
+los últimos eventos se guardan en un buffer acotado. Ambos pueden exportarse
+como JSON de Chrome trace (chrome://tracing o Perfetto).
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from streaming_stats import RingBuffer, Histogram
+
+# Límites de las cubetas del histograma por etapa (segundos)
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.02, 0.033, 0.05, 0.1, 0.25)
+
+# Columnas de los eventos, en el orden de record (ver export_events)
+EVENT_COLUMNS = {"stage": np.int16, "thread": np.uint64, "start_ns": np.int64, "duration_ns": np.int64}
+
+
+class _Span:
+    """Contexto que mide una etapa; se reutiliza la misma clase para todas"""
+
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class StageTracer:
+    def __init__(self, enabled=True, window=2048, max_events=100_000):
+        self.enabled = enabled
+        self.window = window  # Mediciones recientes por etapa para los percentiles
+        self.origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        # etapa -> [cantidad, total_ns, duraciones recientes (ms), histograma (s)]
+        self._stages = {}
+        self._events = deque(maxlen=max_events)  # (id de etapa, hilo, inicio_ns, duración_ns)
+        self._sink = None  # LogChannel con EVENT_COLUMNS; reemplaza al buffer
+        self._stage_ids = {}  # etapa -> id, en orden de aparición
+        self._thread_names = {}
+
+    def span(self, name):
+        """with tracer.span("etapa"): ... mide el bloque"""
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, start_ns, end_ns):
+        """Registra una etapa ya medida con perf_counter_ns"""
+        if not self.enabled:
+            return
+        duration = end_ns - start_ns
+        thread_id = threading.get_ident()
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                stage = self._stages[name] = [0, 0, RingBuffer(self.window), Histogram(STAGE_BUCKETS)]
+                self._stage_ids[name] = len(self._stage_ids)
+            stage[0] += 1
+            stage[1] += duration
+            stage[2].append(duration / 1_000_000)
+            stage[3].observe(duration / 1_000_000_000)
+            event = (self._stage_ids[name], thread_id, start_ns - self.origin_ns, duration)
+            if self._sink is not None:
+                self._sink.append(*event)
+            else:
+                self._events.append(event)
+            if thread_id not in self._thread_names:
+                self._thread_names[thread_id] = threading.current_thread().name
+
+    def stream_to(self, channel):
+        """
+        Envía los eventos a un LogChannel de session_log (con EVENT_COLUMNS) en
+        lugar del buffer; los eventos ya guardados se pasan primero al canal.
+        stream_to(None) lo desconecta antes de cerrar el registro.
+        """
+        with self._lock:
+            if channel is not None:
+                for event in self._events:
+                    channel.append(*event)
+                self._events.clear()
+            self._sink = channel
+
+    def stage_names(self):
+        """Nombres de las etapas; la posición es el id usado en los eventos"""
+        with self._lock:
+            return list(self._stage_ids)
+
+    def thread_names(self):
+        """{id de hilo: nombre} de los hilos que registraron etapas"""
+        with self._lock:
+            return dict(self._thread_names)
+
+    def summary(self):
+        """{etapa: {"count", "mean_ms", "p50", "p95", "p99"}} en milisegundos"""
+        with self._lock:
+            stages = [(name, count, total, recent.values())
+                      for name, (count, total, recent, _) in self._stages.items()]
+
+        summary = {}
+        for name, count, total, recent in stages:
+            p50, p95, p99 = np.percentile(recent, [50, 95, 99])
+            summary[name] = {
+                "count": count,
+                "mean_ms": total / count / 1_000_000,
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+            }
+        return summary
+
+    def histograms(self):
+        """{etapa: (cubetas acumuladas, suma en s, cantidad)} desde el inicio"""
+        with self._lock:
+            return {
+                name: (histogram.cumulative(), histogram.sum, histogram.count)
+                for name, (_, _, _, histogram) in self._stages.items()
+            }
+
+    def export_events(self):
+        """
+        Eventos del buffer como columnas NumPy (vacío si se envían a un canal):
+        retorna (columnas, nombres de etapas, {id de hilo: nombre})
+        """
+        with self._lock:
+            events = list(self._events)
+            stage_names = list(self._stage_ids)
+            thread_names = dict(self._thread_names)
+
+        columns = {column: np.array([event[i] for event in events], dtype=dtype)
+                   for i, (column, dtype) in enumerate(EVENT_COLUMNS.items())}
+        return columns, stage_names, thread_names
+
+    def dump_chrome_trace(self, path):
+        """Escribe los eventos guardados en formato Chrome trace (JSON)"""
+        columns, stage_names, thread_names = self.export_events()
+        return write_chrome_trace(path, columns, stage_names, thread_names)
+
+
+def write_chrome_trace(path, columns, stage_names, thread_names, pid=None):
+    """Convierte columnas de eventos (ver export_events) a Chrome trace JSON"""
+    pid = os.getpid() if pid is None else pid
+    trace = [
+        {
+            "name": stage_names[stage],
+            "ph": "X",  # Evento completo: inicio + duración
+            "ts": start / 1000,  # Microsegundos
+            "dur": duration / 1000,
+            "pid": pid,
+            "tid": thread_id,
+        }
+        for stage, thread_id, start, duration in zip(
+            columns["stage"].tolist(), columns["thread"].tolist(),
+            columns["start_ns"].tolist(), columns["duration_ns"].tolist(),
+        )
+    ]
+    for thread_id in {event["tid"] for event in trace}:
+        trace.append({
+            "name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id,
+            "args": {"name": thread_names.get(thread_id, str(thread_id))},
+        })
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+    return path
@@ -0,0 +1,218 @@
+"""
+Estadísticas en streaming con memoria acotada
+- RingBuffer: últimas N muestras en un arreglo NumPy preasignado
+- EWMA: promedio móvil exponencial en O(1)
+- OneEuroFilter: suavizado adaptativo (filtro One-Euro) de un arreglo por muestra
+- P2Quantile: percentil aproximado (algoritmo P² de Jain y Chlamtac) con
+  cinco marcadores, sin guardar las muestras
+- Histogram: conteos acumulados por cubeta fija (estilo Prometheus)
+Todas las actualizaciones son O(1) para poder registrarlas en cada frame.
+"""
+from bisect import bisect_left
+from itertools import accumulate
+
+import numpy as np
+
+
+class RingBuffer:
+    """Buffer circular de tamaño fijo sobre un arreglo NumPy"""
+
+    def __init__(self, capacity, dtype=np.float64):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._index = 0
+        self._count = 0
+
+    def append(self, value):
+        self._data[self._index] = value
+        self._index = (self._index + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def extend(self, values):
+        for value in np.asarray(values)[-self.capacity:]:
+            self.append(value)
+
+    def __len__(self):
+        return self._count
+
+    def values(self):
+        """Copia de las muestras en orden cronológico"""
+        if self._count < self.capacity:
+            return self._data[:self._count].copy()
+        return np.concatenate((self._data[self._index:], self._data[:self._index]))
+
+    def last(self, default=0.0):
+        if self._count == 0:
+            return default
+        return self._data[self._index - 1]
+
+    def clear(self):
+        self._index = 0
+        self._count = 0
+
+
+class EWMA:
+    """Promedio móvil exponencial; alpha es el peso de la muestra nueva"""
+
+    def __init__(self, alpha=0.1):
+        self.alpha = alpha
+        self.value = None
+
+    def update(self, sample):
+        if self.value is None:
+            self.value = sample
+        else:
+            self.value += self.alpha * (sample - self.value)
+        return self.value
+
+
+class OneEuroFilter:
+    """
+    Filtro One-Euro (Casiez et al.) aplicado elemento a elemento a un arreglo.
+    Con poco movimiento el corte es min_cutoff (Hz) y se elimina el temblor;
+    al moverse rápido el corte sube con beta y el retraso baja.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.derivative = None
+        self.t_ms = None
+
+    @staticmethod
+    def _alpha(dt, cutoff):
+        return 1.0 / (1.0 + 1.0 / (2 * np.pi * cutoff * dt))
+
+    def update(self, sample, t_ms):
+        """Filtra la muestra tomada en t_ms (milisegundos); retorna el valor suavizado"""
+        sample = np.asarray(sample, dtype=np.float64)
+        if self.value is None:
+            self.value = sample.copy()
+            self.derivative = np.zeros_like(sample)
+            self.t_ms = t_ms
+            return self.value
+        dt = (t_ms - self.t_ms) / 1000
+        if dt <= 0:
+            return self.value
+        self.t_ms = t_ms
+
+        derivative = (sample - self.value) / dt
+        self.derivative += self._alpha(dt, self.d_cutoff) * (derivative - self.derivative)
+        cutoff = self.min_cutoff + self.beta * np.abs(self.derivative)
+        self.value = self.value + self._alpha(dt, cutoff) * (sample - self.value)
+        return self.value
+
+
+class P2Quantile:
+    """Estimación en streaming del percentil q (0 < q < 1)"""
+
+    def __init__(self, q):
+        self.q = q
+        self.count = 0
+        self._heights = []  # Alturas de los cinco marcadores
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self._increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def update(self, sample):
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            heights.append(sample)
+            heights.sort()
+            return
+
+        # Celda en la que cae la muestra (ajustando los extremos)
+        if sample < heights[0]:
+            heights[0] = sample
+            cell = 0
+        elif sample >= heights[4]:
+            heights[4] = sample
+            cell = 3
+        else:
+            cell = 0
+            while sample >= heights[cell + 1]:
+                cell += 1
+
+        positions = self._positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Ajustar los marcadores intermedios con interpolación parabólica
+        for i in range(1, 4):
+            delta = self._desired[i] - positions[i]
+            if (delta >= 1 and positions[i + 1] - positions[i] > 1) or \
+                    (delta <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if delta > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i, step):
+        h, n = self._heights, self._positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i, step):
+        h, n = self._heights, self._positions
+        return h[i] + step * (h[i + step] - h[i]) / (n[i + step] - n[i])
+
+    @property
+    def value(self):
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            # Pocas muestras: percentil exacto sobre las guardadas
+            return float(np.percentile(self._heights, self.q * 100))
+        return self._heights[2]
+
+
+class StreamingQuantiles:
+    """Varios percentiles P² sobre la misma serie (p. ej. p50/p95/p99)"""
+
+    def __init__(self, quantiles=(0.5, 0.95, 0.99)):
+        self.estimators = {q: P2Quantile(q) for q in quantiles}
+
+    def update(self, sample):
+        for estimator in self.estimators.values():
+            estimator.update(sample)
+
+    @property
+    def count(self):
+        return next(iter(self.estimators.values())).count
+
+    def values(self):
+        """{"p50": valor, "p95": valor, ...}"""
+        return {f"p{round(q * 100):g}": estimator.value for q, estimator in self.estimators.items()}
+
+
+class Histogram:
+    """Conteo por cubetas con límites superiores inclusivos (le) y una cubeta +Inf"""
+
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """[(le, conteo acumulado), ...] terminando en ("+Inf", total)"""
+        labels = [f"{bound:g}" for bound in self.bounds] + ["+Inf"]
+        return list(zip(labels, accumulate(self.counts)))
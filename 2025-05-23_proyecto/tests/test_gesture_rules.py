@@ -0,0 +1,98 @@
+"""
+Compara la tabla de gestos con las reglas originales de GestureDetector,
+escritas tal cual sobre las diferencias de HandFeatures, en poses aleatorias
+y en poses con valores justo en los umbrales.
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from gesture_rules import GESTURE_SPEC, GESTURE_TABLE
+from hand_features import HandFeatures
+
+
+def baseline_gestures(tp, tm, dx_ip, dx_mcp, below_wrist):
+    """Reglas originales; tp / tm: tip_pip / tip_mcp de índice, medio, anular y meñique"""
+    i, m, r, p = tp
+    return {
+        "rock": i < -0.02 and m > 0.02 and r > 0.02 and p < -0.02,
+        "peace": i < -0.02 and m < -0.02 and r > 0.02 and p > 0.02,
+        "open_hand": (sum(a < -0.02 and b < -0.04 for a, b in zip(tp, tm)) >= 3
+                      and sum(b > 0.01 for b in tm) <= 1),
+        "pointing_up": i < -0.025 and m > -0.0125 and r > -0.0125 and p > -0.0125,
+        "pointing_down": (below_wrist > 0.025 and i > 0.025
+                          and m > -0.0125 and r > -0.0125 and p > -0.0125),
+        "pinky_up": p < -0.025 and i > -0.0125 and m > -0.0125 and r > -0.0125,
+        "thumb_right": dx_ip > 0.025 and dx_mcp > 0.025 and all(a > 0 for a in tp),
+        "thumb_left": dx_ip < -0.025 and dx_mcp < -0.025 and all(a > 0 for a in tp),
+        "fist": all(b >= 0.02 for b in tm) and not any(a < -0.03 for a in tp),
+    }
+
+
+def frame(features, n):
+    """Valores del frame n como floats de Python, igual que los landmarks originales"""
+    return ([float(v) for v in features.tip_pip[n, 1:]], [float(v) for v in features.tip_mcp[n, 1:]],
+            float(features.thumb_dx_ip[n]), float(features.thumb_dx_mcp[n]),
+            float(features.index_below_wrist[n]))
+
+
+def assert_same_as_baseline(features):
+    codes = GESTURE_TABLE.encode(features)
+    for n in range(len(codes)):
+        expected = baseline_gestures(*frame(features, n))
+        got = {name: GESTURE_TABLE.matches(codes[n], name) for name in expected}
+        assert got == expected, f"frame {n}: {frame(features, n)}"
+
+
+def random_poses(count, seed):
+    """Landmarks uniformes en la imagen (mitad) y concentrados en un cuadro pequeño (mitad)"""
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0.0, 1.0, (count, 21, 3)).astype(np.float32)
+    near = rng.uniform(0.45, 0.55, (count, 21, 3)).astype(np.float32)
+    half = count // 2
+    points[half:] = near[half:]
+    return HandFeatures(points)
+
+
+def boundary_poses(count, seed):
+    """Diferencias tomadas de los umbrales exactos, sus vecinos y valores intermedios"""
+    grid = np.array([0.0, 0.01, 0.0125, 0.02, 0.025, 0.03, 0.04, 0.1])
+    grid = np.concatenate((grid, -grid))
+    grid = np.concatenate((grid, np.nextafter(grid, np.inf), np.nextafter(grid, -np.inf)))
+    rng = np.random.default_rng(seed)
+    pick = lambda *shape: rng.choice(grid, shape)
+    return SimpleNamespace(tip_pip=pick(count, 5), tip_mcp=pick(count, 5), thumb_dx_ip=pick(count),
+                           thumb_dx_mcp=pick(count), index_below_wrist=pick(count))
+
+
+def test_random_poses_match_baseline():
+    assert_same_as_baseline(random_poses(20_000, seed=0))
+
+
+def test_boundary_poses_match_baseline():
+    assert_same_as_baseline(boundary_poses(20_000, seed=1))
+
+
+def test_random_poses_reach_every_gesture():
+    # Sin esto la comparación podría pasar con reglas que nunca coinciden
+    codes = GESTURE_TABLE.encode(random_poses(20_000, seed=0))
+    for rule in GESTURE_SPEC:
+        assert sum(GESTURE_TABLE.matches(code, rule["name"]) for code in codes) > 100, rule["name"]
+
+
+@pytest.mark.parametrize("make", [random_poses, boundary_poses])
+def test_batch_encode_equals_single_frames(make):
+    features = make(500, seed=3)
+    codes = GESTURE_TABLE.encode(features)
+    for n in range(len(codes)):
+        single = SimpleNamespace(tip_pip=features.tip_pip[n], tip_mcp=features.tip_mcp[n],
+                                 thumb_dx_ip=features.thumb_dx_ip[n], thumb_dx_mcp=features.thumb_dx_mcp[n],
+                                 index_below_wrist=features.index_below_wrist[n])
+        assert int(GESTURE_TABLE.encode(single)) == int(codes[n])
+
+
+def test_winner_follows_spec_order():
+    for code in range(len(GESTURE_TABLE.winner)):
+        matching = [rule["name"] for g, rule in enumerate(GESTURE_SPEC) if (code >> g) & 1]
+        assert GESTURE_TABLE.classify_code(code) == (matching[0] if matching else None)
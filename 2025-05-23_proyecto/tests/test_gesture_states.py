@@ -0,0 +1,135 @@
+"""
+Gestos por estado: cada estado elige solo entre los gestos que usa, en el
+orden en que los revisaban sus manejadores originales (cadenas de elif),
+aunque otras reglas con más prioridad global también coincidan.
+"""
+from types import MethodType, SimpleNamespace
+
+import pytest
+
+from game_states import GameState
+from gesture_detector import GestureDetector
+from gesture_rules import GESTURE_TABLE
+from main import GestureGameApp
+from test_gesture_rules import baseline_gestures, boundary_poses, frame, random_poses
+
+# Orden de los manejadores originales de main.py
+BASELINE_ORDER = {
+    "MAIN_MENU": ("pointing_up", "pointing_down", "open_hand", "fist"),
+    "DINO_GAME": ("open_hand", "fist"),
+    "LABERINTO_GAME": ("pointing_up", "open_hand", "pinky_up", "thumb_right"),
+}
+
+
+def make_hand(tp, tm, dx=0.0, below_wrist=0.0):
+    """Landmarks con las diferencias dadas; tp / tm de índice, medio, anular y meñique"""
+    points = [[0.5, 0.5, 0.0] for _ in range(21)]
+    for tip, tp_value, tm_value in zip((8, 12, 16, 20), tp, tm):
+        points[tip][1] = 0.5 + tm_value        # MCP en y=0.5
+        points[tip - 2][1] = points[tip][1] - tp_value
+    points[4][0] = 0.5 + dx                    # IP y MCP del pulgar en x=0.5
+    points[0][1] = points[8][1] - below_wrist  # Muñeca
+    return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in points])
+
+
+# Pulgar a la derecha con el índice hacia abajo
+THUMB_RIGHT_POINTING_DOWN = make_hand([0.03, 0.01, 0.01, 0.01], [0.03, 0.03, 0.03, 0.03],
+                                      dx=0.05, below_wrist=0.05)
+# Puño con el pulgar afuera
+FIST_THUMB_OUT = make_hand([0.01] * 4, [0.03] * 4, dx=0.05)
+# Rock con medio y anular cerrados
+ROCK_FIST = make_hand([-0.025, 0.03, 0.03, -0.025], [0.03] * 4)
+
+
+@pytest.mark.parametrize("make", [random_poses, boundary_poses])
+@pytest.mark.parametrize("state", BASELINE_ORDER)
+def test_state_candidates_follow_baseline_order(make, state):
+    features = make(5_000, seed=4)
+    codes = GESTURE_TABLE.encode(features)
+    for n in range(len(codes)):
+        baseline = baseline_gestures(*frame(features, n))
+        expected = tuple(g for g in BASELINE_ORDER[state] if baseline[g])
+        assert GESTURE_TABLE.candidates(codes[n], state) == expected, f"frame {n}: {frame(features, n)}"
+        assert GESTURE_TABLE.classify_code(codes[n], state) == (expected[0] if expected else None)
+
+
+@pytest.mark.parametrize("hand, state, expected", [
+    (THUMB_RIGHT_POINTING_DOWN, "LABERINTO_GAME", "thumb_right"),
+    (THUMB_RIGHT_POINTING_DOWN, "MAIN_MENU", "pointing_down"),
+    (FIST_THUMB_OUT, "DINO_GAME", "fist"),
+    (FIST_THUMB_OUT, "MAIN_MENU", "fist"),
+    (FIST_THUMB_OUT, "LABERINTO_GAME", "thumb_right"),
+])
+def test_overlapping_poses_pick_the_state_gesture(hand, state, expected):
+    detector = GestureDetector()
+    assert detector.classify(hand, state) == expected
+
+
+def test_overlapping_poses_overlap_globally():
+    # Sin esto las poses anteriores no probarían nada
+    detector = GestureDetector()
+    assert detector.classify(THUMB_RIGHT_POINTING_DOWN) == "pointing_down"
+    assert detector.matches(THUMB_RIGHT_POINTING_DOWN, "thumb_right")
+    assert detector.classify(FIST_THUMB_OUT) == "thumb_right"
+    assert detector.matches(FIST_THUMB_OUT, "fist")
+    assert detector.classify(ROCK_FIST) == "rock"
+    assert detector.matches(ROCK_FIST, "fist")
+
+
+def test_rock_is_timed_even_when_the_state_sees_a_fist():
+    detector = GestureDetector()
+    detector.detect_timed_gestures(ROCK_FIST, "DINO_GAME")
+    assert detector.rock_hold.active
+    assert detector.candidates(ROCK_FIST, "DINO_GAME") == ("fist",)
+
+
+def make_app(state):
+    """GestureGameApp mínima: detector real y juegos que registran las llamadas"""
+    calls = []
+    app = SimpleNamespace(
+        current_state=state,
+        gesture_detector=GestureDetector(),
+        metrics=SimpleNamespace(record_gesture_attempt=lambda *args, **kwargs: None),
+        menu_renderer=SimpleNamespace(navigate_up=lambda: calls.append("menu_up"),
+                                      navigate_down=lambda: calls.append("menu_down"),
+                                      get_selected_game=lambda: 0),
+        dino_game=SimpleNamespace(handle_gesture=lambda is_open: calls.append("jump") or True),
+        laberinto_game=SimpleNamespace(
+            handle_gesture=lambda direction, source=None: calls.append(direction) or True),
+    )
+    for name in ("handle_gestures", "handle_menu_gestures", "handle_dino_gestures",
+                 "handle_laberinto_gestures"):
+        setattr(app, name, MethodType(getattr(GestureGameApp, name), app))
+    return app, calls
+
+
+def test_laberinto_moves_right_on_thumb_with_pointing_down():
+    app, calls = make_app(GameState.LABERINTO_GAME)
+    app.handle_gestures(THUMB_RIGHT_POINTING_DOWN, None)
+    assert calls == ["right"]
+
+
+def test_menu_navigates_down_on_thumb_with_pointing_down():
+    app, calls = make_app(GameState.MAIN_MENU)
+    app.handle_gestures(THUMB_RIGHT_POINTING_DOWN, None)
+    assert calls == ["menu_down"]
+    assert app.gesture_detector.current_gesture == app.gesture_detector.gesture_table.rules["pointing_down"]["label"]
+
+
+@pytest.mark.parametrize("state", [GameState.MAIN_MENU, GameState.DINO_GAME])
+def test_fist_with_thumb_out_is_a_fist(state):
+    app, calls = make_app(state)
+    app.handle_gestures(FIST_THUMB_OUT, None)
+    assert calls == []
+    assert app.gesture_detector.current_gesture == app.gesture_detector.gesture_table.rules["fist"]["label"]
+
+
+def test_gesture_in_cooldown_yields_to_the_next_one():
+    # Índice hacia arriba con los demás dedos cerrados: también es puño
+    hand = make_hand([-0.026, 0.01, 0.01, 0.01], [0.03] * 4)
+    app, calls = make_app(GameState.MAIN_MENU)
+    assert app.gesture_detector.candidates(hand, "MAIN_MENU") == ("pointing_up", "fist")
+    app.handle_gestures(hand, None)
+    app.handle_gestures(hand, None)  # "pointing" en cooldown: pasa al puño
+    assert calls == ["menu_up"]
+    assert app.gesture_detector.current_gesture == app.gesture_detector.gesture_table.rules["fist"]["label"]
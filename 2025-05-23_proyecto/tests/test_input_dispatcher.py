@@ -0,0 +1,124 @@
+import threading
+import time
+
+import pytest
+
+from input_dispatcher import InputDispatcher, NullKeyboard
+
+
+class RecordingKeyboard(NullKeyboard):
+    """Guarda las teclas enviadas en orden"""
+
+    def __init__(self):
+        self.sent = []
+
+    def press(self, key):
+        self.sent.append(("press", key))
+
+    def release(self, key):
+        self.sent.append(("release", key))
+
+    def press_and_release(self, key):
+        self.sent.append(("tap", key))
+
+
+class BlockingKeyboard(RecordingKeyboard):
+    """Se queda bloqueado en el primer tap hasta que se libera"""
+
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.unblock = threading.Event()
+
+    def press_and_release(self, key):
+        self.entered.set()
+        self.unblock.wait(2.0)
+        super().press_and_release(key)
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "tiempo de espera agotado"
+        time.sleep(0.002)
+
+
+@pytest.fixture
+def keyboard():
+    return RecordingKeyboard()
+
+
+@pytest.fixture
+def dispatcher(keyboard):
+    dispatcher = InputDispatcher(keyboard)
+    yield dispatcher
+    dispatcher.stop()
+
+
+def test_identical_pending_events_are_coalesced(dispatcher, keyboard):
+    with dispatcher._condition:  # El hilo no envía nada mientras se encola
+        for _ in range(5):
+            dispatcher.tap("space")
+    wait_until(lambda: dispatcher.dispatched == 1)
+    assert keyboard.sent == [("tap", "space")]
+    assert dispatcher.coalesced == 4
+
+
+def test_press_release_press_behind_a_blocked_backend_is_kept():
+    keyboard = BlockingKeyboard()
+    dispatcher = InputDispatcher(keyboard)
+    try:
+        dispatcher.tap("z")
+        assert keyboard.entered.wait(2.0)  # El hilo está ocupado enviando "z"
+        dispatcher.press("a")
+        dispatcher.release("a")
+        dispatcher.press("a")
+        dispatcher.press("a")  # Repite el último pendiente: se descarta
+        keyboard.unblock.set()
+        wait_until(lambda: dispatcher.dispatched == 4)
+        assert keyboard.sent == [("tap", "z"), ("press", "a"), ("release", "a"), ("press", "a")]
+        assert dispatcher.is_down("a")
+        assert dispatcher.coalesced == 1
+    finally:
+        keyboard.unblock.set()
+        dispatcher.stop()
+
+
+def test_press_of_a_key_already_down_is_dropped(dispatcher, keyboard):
+    dispatcher.press("left")
+    wait_until(lambda: dispatcher.is_down("left"))
+    dispatcher.press("left")
+    dispatcher.release("right")  # No estaba presionada
+    wait_until(lambda: dispatcher.coalesced == 2)
+    assert keyboard.sent == [("press", "left")]
+
+
+def test_hold_releases_after_its_duration(dispatcher, keyboard):
+    dispatcher.hold("up", 30)
+    wait_until(lambda: dispatcher.is_down("up"))
+    wait_until(lambda: not dispatcher.is_down("up"))
+    assert keyboard.sent == [("press", "up"), ("release", "up")]
+
+
+def test_delayed_event_left_by_release_all_does_not_block_later_events(dispatcher, keyboard):
+    dispatcher.press("a")
+    wait_until(lambda: dispatcher.is_down("a"))
+    dispatcher.release("a", delay_ms=20)  # Queda en cola: release_all solo cancela "b"
+    dispatcher.release_all(keys=["b"])
+    wait_until(lambda: not dispatcher.is_down("a"))
+
+    dispatcher.press("a")
+    wait_until(lambda: dispatcher.is_down("a"))
+    dispatcher.release("a")
+    wait_until(lambda: not dispatcher.is_down("a"))
+    assert keyboard.sent == [("press", "a"), ("release", "a"), ("press", "a"), ("release", "a")]
+
+
+def test_release_all_cancels_pending_and_releases_keys(dispatcher, keyboard):
+    dispatcher.hold("down", 1000)
+    wait_until(lambda: dispatcher.is_down("down"))
+    dispatcher.release_all()
+    wait_until(lambda: not dispatcher.is_down("down"))
+    time.sleep(0.02)
+    assert keyboard.sent == [("press", "down"), ("release", "down")]
+    assert not dispatcher._queue
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from streaming_stats import P2Quantile, StreamingQuantiles
+
+DISTRIBUTIONS = {
+    "uniforme": lambda rng, n: rng.uniform(0, 100, n),
+    "normal": lambda rng, n: rng.normal(33, 5, n),
+    # Tiempos de frame: cola larga hacia la derecha
+    "lognormal": lambda rng, n: rng.lognormal(np.log(30), 0.5, n),
+}
+
+
+@pytest.mark.parametrize("q", [0.5, 0.95, 0.99])
+@pytest.mark.parametrize("name", DISTRIBUTIONS)
+def test_p2_matches_numpy_percentile(name, q):
+    samples = DISTRIBUTIONS[name](np.random.default_rng(0), 20_000)
+    estimator = P2Quantile(q)
+    for sample in samples.tolist():
+        estimator.update(sample)
+
+    exact = np.percentile(samples, q * 100)
+    # Rango del estimado dentro de la muestra: comparable entre distribuciones
+    rank = np.mean(samples <= estimator.value)
+    assert abs(rank - q) < 0.005, (estimator.value, exact)
+    assert estimator.value == pytest.approx(exact, rel=0.03)
+
+
+def test_few_samples_are_exact():
+    samples = [12.0, 3.0, 7.0, 30.0]
+    estimator = P2Quantile(0.5)
+    assert estimator.value is None
+    for sample in samples:
+        estimator.update(sample)
+    assert estimator.value == np.percentile(samples, 50)
+
+
+def test_streaming_quantiles_reports_every_percentile():
+    quantiles = StreamingQuantiles()
+    samples = np.random.default_rng(1).exponential(20, 5000)
+    for sample in samples.tolist():
+        quantiles.update(sample)
+    values = quantiles.values()
+    assert list(values) == ["p50", "p95", "p99"]
+    assert quantiles.count == 5000
+    assert values["p50"] < values["p95"] < values["p99"]
+    for key, q in (("p50", 50), ("p95", 95), ("p99", 99)):
+        assert values[key] == pytest.approx(np.percentile(samples, q), rel=0.05)
@@ -0,0 +1,119 @@
+"""
+Reloj y temporizadores comunes de GESTIK
+Todos los cooldowns, esperas y gestos sostenidos se miden en milisegundos sobre
+un único reloj monotónico. El reloj avanza una sola vez por frame (tick), así
+cada componente ve el mismo instante durante todo el procesamiento del frame y
+el comportamiento no depende de los FPS ni de cambios en la hora del sistema.
+"""
+import heapq
+import itertools
+import time
+
+
+def monotonic_ms():
+    """Milisegundos de un reloj monotónico (no retrocede con cambios de hora)"""
+    return time.monotonic_ns() / 1_000_000
+
+
+class FrameClock:
+    """Instante del frame actual más una cola de tareas programadas"""
+
+    def __init__(self):
+        self.now_ms = monotonic_ms()
+        # perf_counter_ns de la captura del frame en curso (para medir latencia)
+        self.frame_ns = time.perf_counter_ns()
+        self._tasks = []
+        self._counter = itertools.count()  # Desempate estable entre tareas
+
+    def tick(self, now_ms=None, frame_ns=None):
+        """
+        Avanza el reloj al instante del frame (o a now_ms, p. ej. al reproducir
+        una grabación) y ejecuta las tareas que ya vencieron. frame_ns es el
+        instante de captura del frame; las acciones del frame lo usan como origen.
+        """
+        self.now_ms = monotonic_ms() if now_ms is None else now_ms
+        self.frame_ns = time.perf_counter_ns() if frame_ns is None else frame_ns
+        while self._tasks and self._tasks[0][0] <= self.now_ms:
+            _, _, callback = heapq.heappop(self._tasks)
+            callback()
+        return self.now_ms
+
+    def since(self, start_ms):
+        """Milisegundos transcurridos desde start_ms hasta el frame actual"""
+        return self.now_ms - start_ms
+
+    def call_later(self, delay_ms, callback):
+        """Programa callback para el primer tick posterior a delay_ms"""
+        heapq.heappush(self._tasks, (self.now_ms + delay_ms, next(self._counter), callback))
+
+    def cooldown(self, duration_ms):
+        return Cooldown(self, duration_ms)
+
+    def hold(self, duration_ms, tolerance_ms=0):
+        return HoldTimer(self, duration_ms, tolerance_ms)
+
+
+class Cooldown:
+    """Tiempo mínimo entre dos disparos de la misma acción"""
+
+    def __init__(self, clock, duration_ms):
+        self.clock = clock
+        self.duration_ms = duration_ms
+        self.ready_at = None  # None: nunca disparado
+
+    def ready(self):
+        return self.ready_at is None or self.clock.now_ms >= self.ready_at
+
+    def trigger(self):
+        """Registra un disparo; el cooldown vuelve a estar listo en duration_ms"""
+        self.ready_at = self.clock.now_ms + self.duration_ms
+
+    def try_trigger(self):
+        """Dispara si el cooldown está listo; retorna si se disparó"""
+        if not self.ready():
+            return False
+        self.trigger()
+        return True
+
+    def remaining_ms(self):
+        if self.ready():
+            return 0
+        return self.ready_at - self.clock.now_ms
+
+    def reset(self):
+        self.ready_at = None
+
+
+class HoldTimer:
+    """
+    Gesto que debe mantenerse duration_ms. Si el gesto se pierde antes de
+    tolerance_ms desde el inicio se considera flickering y no se reinicia.
+    """
+
+    def __init__(self, clock, duration_ms, tolerance_ms=0):
+        self.clock = clock
+        self.duration_ms = duration_ms
+        self.tolerance_ms = tolerance_ms
+        self.start_ms = None
+
+    @property
+    def active(self):
+        return self.start_ms is not None
+
+    def start(self):
+        self.start_ms = self.clock.now_ms
+
+    def elapsed_ms(self):
+        return self.clock.since(self.start_ms) if self.active else 0
+
+    def remaining_ms(self):
+        return max(self.duration_ms - self.elapsed_ms(), 0)
+
+    def done(self):
+        return self.active and self.elapsed_ms() >= self.duration_ms
+
+    def in_tolerance(self):
+        return self.active and self.elapsed_ms() < self.tolerance_ms
+
+    def reset(self):
+        self.start_ms = None
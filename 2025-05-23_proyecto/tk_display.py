@@ -0,0 +1,82 @@
+"""
+Backend de visualización para tkinter
+Reutiliza un único buffer RGBA preasignado, una única PhotoImage y un único
+elemento del canvas que se actualizan en sitio en cada frame. La geometría de
+ajuste al canvas se calcula solo cuando cambia el tamaño del canvas o del frame.
+"""
+import tkinter as tk
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+
+class TkFrameDisplay:
+    def __init__(self, canvas, default_size=(1280, 720)):
+        self.canvas = canvas
+        # Tamaño del canvas mientras la ventana aún no se ha dibujado
+        self.canvas_size = default_size
+
+        self._frame_size = None
+        self._geometry = None  # (ancho, alto, x, y) de la imagen dentro del canvas
+        self._resized = None   # Buffer BGR redimensionado
+        self._rgba = None      # Buffer RGBA compartido con la imagen PIL
+        self._image = None
+        self._photo = None
+        self._item = None
+
+        canvas.bind("<Configure>", self._on_configure)
+
+    def _on_configure(self, event):
+        """Invalida la geometría cacheada cuando el canvas cambia de tamaño"""
+        if event.width > 1 and event.height > 1 and (event.width, event.height) != self.canvas_size:
+            self.canvas_size = (event.width, event.height)
+            self._geometry = None
+
+    def _layout(self, frame_width, frame_height):
+        """Calcula el ajuste manteniendo aspect ratio y preasigna los buffers"""
+        canvas_width, canvas_height = self.canvas_size
+        aspect_ratio = frame_width / frame_height
+        canvas_aspect_ratio = canvas_width / canvas_height
+
+        if aspect_ratio > canvas_aspect_ratio:
+            # La imagen es más ancha
+            new_width = canvas_width
+            new_height = int(canvas_width / aspect_ratio)
+        else:
+            # La imagen es más alta
+            new_height = canvas_height
+            new_width = int(canvas_height * aspect_ratio)
+
+        x = (canvas_width - new_width) // 2
+        y = (canvas_height - new_height) // 2
+        self._geometry = (new_width, new_height, x, y)
+        self._frame_size = (frame_width, frame_height)
+
+        self._resized = np.empty((new_height, new_width, 3), dtype=np.uint8)
+        self._rgba = np.empty((new_height, new_width, 4), dtype=np.uint8)
+        # RGBA permite que PIL use directamente la memoria del buffer (sin copia)
+        self._image = Image.frombuffer("RGBA", (new_width, new_height), self._rgba, "raw", "RGBA", 0, 1)
+        self._photo = ImageTk.PhotoImage("RGBA", (new_width, new_height))
+
+        if self._item is None:
+            self._item = self.canvas.create_image(x, y, anchor=tk.NW, image=self._photo)
+        else:
+            self.canvas.itemconfigure(self._item, image=self._photo)
+            self.canvas.coords(self._item, x, y)
+
+    def show(self, frame):
+        """Muestra un frame BGR de OpenCV en el canvas"""
+        frame_height, frame_width = frame.shape[:2]
+        if self._geometry is None or self._frame_size != (frame_width, frame_height):
+            self._layout(frame_width, frame_height)
+
+        new_width, new_height = self._geometry[:2]
+        if (new_width, new_height) != (frame_width, frame_height):
+            # Interpolación bilineal: suficiente para video y mucho más rápida que LANCZOS
+            cv2.resize(frame, (new_width, new_height), dst=self._resized,
+                       interpolation=cv2.INTER_LINEAR)
+            frame = self._resized
+
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA, dst=self._rgba)
+        self._photo.paste(self._image)
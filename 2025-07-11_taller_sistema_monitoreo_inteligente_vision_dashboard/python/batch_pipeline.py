@@ -0,0 +1,166 @@
+import queue
+import threading
+import time
+
+import cv2
+
+# ========================
+# MODO OFFLINE POR LOTES
+# ========================
+# Tres etapas conectadas por colas acotadas:
+#   lector (hilo)  →  inferencia por lotes de N frames  →  anotación y escritura (hilo)
+# Mientras YOLO procesa un lote, el lector ya decodifica el siguiente y el
+# escritor anota y guarda el anterior. Con un filtro de movimiento (gate) el
+# lector marca los frames sin cambios, que no pasan por YOLO y se escriben tal cual.
+# Si una etapa falla (el modelo, el lector o el escritor) las demás dejan de
+# esperar en las colas y run() relanza el error una vez terminados los hilos.
+
+_FIN = object()  # Marca de fin de video entre etapas
+_ESPERA = 0.1  # Segundos entre revisiones de la señal de parada en las colas
+
+
+class BatchPipeline:
+    def __init__(self, model, video_path, batch_size=8, output_path=None, on_results=None, queue_batches=2,
+                 gate=None):
+        self.model = model
+        self.video_path = video_path
+        self.batch_size = batch_size
+        self.output_path = output_path  # Video anotado (None: no se escribe)
+        self.on_results = on_results  # on_results(results, frame) en la etapa de escritura
+        self.gate = gate  # gate.check(frame) → False: frame sin movimiento
+        self.frames = queue.Queue(maxsize=batch_size * queue_batches)
+        self.inferred = queue.Queue(maxsize=queue_batches)
+        self._stop = threading.Event()  # Alguna etapa falló: las demás terminan
+        self._error = None
+
+        self.frame_count = 0
+        self.inferred_count = 0
+        self.batch_count = 0
+        self.inference_seconds = 0.0
+
+    def _fail(self, error):
+        """Guarda el primer error y avisa a las demás etapas que terminen"""
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+    def _put(self, items, item):
+        """put() que se rinde si otra etapa falló; retorna False en ese caso"""
+        while not self._stop.is_set():
+            try:
+                items.put(item, timeout=_ESPERA)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _get(self, items):
+        """get() que retorna _FIN si otra etapa falló"""
+        while not self._stop.is_set():
+            try:
+                return items.get(timeout=_ESPERA)
+            except queue.Empty:
+                pass
+        return _FIN
+
+    def _read_loop(self, cap):
+        try:
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if not self._put(self.frames, (frame, self.gate.check(frame) if self.gate else True)):
+                    return
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._put(self.frames, _FIN)
+
+    def _write_loop(self, fps):
+        writer = None
+        try:
+            while True:
+                item = self._get(self.inferred)
+                if item is _FIN:
+                    break
+                for frame, results in item:
+                    if results is not None and self.on_results:
+                        try:
+                            self.on_results(results, frame)
+                        except Exception as e:
+                            # Un error en un frame no debe detener (ni bloquear) el procesamiento
+                            print(f"[ERROR] Procesando detecciones: {e}")
+                    if self.output_path:
+                        annotated = results.plot() if results is not None else frame
+                        if writer is None:
+                            height, width = annotated.shape[:2]
+                            fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+                            writer = cv2.VideoWriter(self.output_path, fourcc, fps, (width, height))
+                        writer.write(annotated)
+        except Exception as e:
+            self._fail(e)
+        finally:
+            if writer is not None:
+                writer.release()
+
+    def _next_batch(self):
+        """Hasta batch_size (frame, inferir); retorna (frames, fin del video)"""
+        batch = []
+        while len(batch) < self.batch_size:
+            frame = self._get(self.frames)
+            if frame is _FIN:
+                return batch, True
+            batch.append(frame)
+        return batch, False
+
+    def run(self):
+        cap = cv2.VideoCapture(self.video_path)
+        if not cap.isOpened():
+            print(f"[ERROR] No se pudo abrir el video: {self.video_path}")
+            return None
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+        reader = threading.Thread(target=self._read_loop, args=(cap,), name="lector", daemon=True)
+        writer = threading.Thread(target=self._write_loop, args=(fps,), name="escritor", daemon=True)
+        start = time.perf_counter()
+        reader.start()
+        writer.start()
+
+        finished = False
+        try:
+            while not finished:
+                batch, finished = self._next_batch()
+                if not batch or self._stop.is_set():
+                    break
+                inference_start = time.perf_counter()
+                to_infer = [frame for frame, infer in batch if infer]
+                results = iter(self.model(to_infer, verbose=False) if to_infer else [])  # Una sola llamada por lote
+                self.inference_seconds += time.perf_counter() - inference_start
+                if not self._put(self.inferred, [(frame, next(results) if infer else None) for frame, infer in batch]):
+                    break
+                self.frame_count += len(batch)
+                self.inferred_count += len(to_infer)
+                self.batch_count += 1
+        except BaseException as e:  # También Ctrl+C: los hilos no deben quedar bloqueados
+            self._fail(e)
+        finally:
+            self._put(self.inferred, _FIN)
+            reader.join()
+            writer.join()
+            cap.release()
+
+        if self._error is not None:
+            raise self._error
+
+        elapsed = time.perf_counter() - start
+        stats = {
+            "frames": self.frame_count,
+            "lotes": self.batch_count,
+            "segundos": elapsed,
+            "fps": self.frame_count / elapsed if elapsed else 0.0,
+            "fps_inferencia": self.inferred_count / self.inference_seconds if self.inference_seconds else 0.0,
+            "sin_yolo": self.frame_count - self.inferred_count,
+        }
+        print(f"[INFO] {stats['frames']} frames en {elapsed:.1f} s → {stats['fps']:.1f} FPS "
+              f"(lotes de {self.batch_size}, solo inferencia: {stats['fps_inferencia']:.1f} FPS)")
+        return stats
@@ -0,0 +1,158 @@
+import atexit
+import csv
+import json
+import os
+import sqlite3
+import threading
+
+# ========================
+# LOG DE EVENTOS POR LOTES
+# ========================
+# Los eventos se acumulan en memoria y un hilo los escribe por lotes: cuando
+# el buffer llega a max_batch eventos o cada flush_interval segundos. El bucle
+# de detección solo agrega una tupla a una lista. Al cerrar (o al terminar el
+# programa) siempre se escribe lo pendiente. Los logs creados con menos
+# columnas (antes de "track") se migran al abrirlos: al CSV se le reescribe el
+# encabezado rellenando las filas viejas y a la tabla SQLite se le agregan las
+# columnas que faltan.
+
+COLUMNS = ("timestamp", "evento", "clase", "confianza", "track")  # track: id de la persona seguida o vacío
+
+
+class CsvBackend:
+    def __init__(self, path, columns=COLUMNS):
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new:
+            self._migrate(path, columns)
+        self.file = open(path, "a", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        if new:
+            self.writer.writerow(columns)
+            self.file.flush()
+
+    @staticmethod
+    def _migrate(path, columns):
+        """Reescribe un CSV con columnas anteriores al formato actual"""
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        header = tuple(rows[0]) if rows else ()
+        if header == tuple(columns):
+            return
+        if header != tuple(columns[:len(header)]):
+            raise ValueError(f"{path} tiene columnas {header}, se esperaban {tuple(columns)}")
+        padding = [""] * (len(columns) - len(header))
+        temp = path + ".tmp"
+        with open(temp, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(row + padding for row in rows[1:])
+        os.replace(temp, path)
+        print(f"[INFO] {path}: columnas agregadas al log ({', '.join(columns[len(header):])})")
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlBackend:
+    """Un objeto JSON por línea, solo se agrega al final"""
+
+    def __init__(self, path, columns=COLUMNS):
+        self.columns = columns
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, rows):
+        self.file.writelines(json.dumps(dict(zip(self.columns, row)), ensure_ascii=False) + "\n"
+                             for row in rows)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class SqliteBackend:
+    """Tabla eventos en modo WAL: los lectores (p. ej. un panel) no bloquean la escritura"""
+
+    def __init__(self, path, columns=COLUMNS):
+        # La conexión se crea aquí y se usa desde el hilo de escritura
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS eventos ({', '.join(columns)})")
+        # Una tabla creada con una versión anterior no tiene las columnas nuevas
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(eventos)")}
+        missing = [column for column in columns if column not in existing]
+        with self.conn:
+            for column in missing:
+                self.conn.execute(f"ALTER TABLE eventos ADD COLUMN {column}")
+        if missing:
+            print(f"[INFO] {path}: columnas agregadas a la tabla eventos ({', '.join(missing)})")
+        self.insert = (f"INSERT INTO eventos ({', '.join(columns)}) "
+                       f"VALUES ({', '.join('?' * len(columns))})")
+
+    def write(self, rows):
+        with self.conn:  # Una transacción por lote
+            self.conn.executemany(self.insert, rows)
+
+    def close(self):
+        self.conn.close()
+
+
+BACKENDS = {".csv": CsvBackend, ".jsonl": JsonlBackend, ".db": SqliteBackend, ".sqlite": SqliteBackend}
+
+
+def open_backend(path, columns=COLUMNS):
+    """Backend según la extensión del archivo (.csv, .jsonl, .db/.sqlite)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in BACKENDS:
+        raise ValueError(f"Formato de log no soportado: {path} (usa {', '.join(BACKENDS)})")
+    return BACKENDS[extension](path, columns)
+
+
+class EventSink:
+    def __init__(self, backend, max_batch=256, flush_interval=1.0):
+        self.backend = backend
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self.written = 0
+        self._thread = threading.Thread(target=self._flush_loop, name="eventos", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)  # Lo pendiente se escribe aunque no se llame close()
+
+    def emit(self, *row):
+        with self._cond:
+            self._buffer.append(row)
+            if len(self._buffer) >= self.max_batch:
+                self._cond.notify()
+
+    def _flush_loop(self):
+        while True:
+            with self._cond:
+                if not self._closed and len(self._buffer) < self.max_batch:
+                    self._cond.wait(self.flush_interval)
+                rows, self._buffer = self._buffer, []
+                closed = self._closed
+            if rows:
+                try:
+                    self.backend.write(rows)
+                    self.written += len(rows)
+                except Exception as e:
+                    print(f"[ERROR] No se pudieron escribir {len(rows)} eventos: {e}")
+            if closed:
+                return
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.backend.close()
+        atexit.unregister(self.close)
@@ -1,8 +1,16 @@
+import argparse
 import cv2
 from ultralytics import YOLO
-import pandas as pd
 from datetime import datetime
 import os
+import threading
+
+from batch_pipeline import BatchPipeline
+from event_sink import EventSink, open_backend
+from motion_gate import MotionGate
+from multi_stream import MultiStreamMonitor
+from snapshots import EventDeduplicator, SnapshotWriter
+from tracker import IoUTracker, TrackingDetector
 
 # ========================
 # CONFIGURACIÓN
@@ -11,60 +19,185 @@ import os
 VIDEO_PATH = "videos/videoSeguridad.mp4"
 CAPTURAS_DIR = "../capturas"
 LOGS_DIR = "../logs"
-LOG_FILE = os.path.join(LOGS_DIR, "eventos.csv")
+LOG_FILE = os.path.join(LOGS_DIR, "eventos.csv")  # .csv, .jsonl o .db (SQLite)
+BATCH_SIZE = 8  # Frames por llamada a YOLO en modo offline
+WORKERS = 2  # Instancias de YOLO en modo de varias fuentes
+VENTANA_EVENTOS_S = 5.0  # Una misma fuente solo genera un evento (y una captura) cada tantos segundos
+HILOS_CAPTURAS = 2  # Hilos que codifican y guardan los JPEG
+DETECTAR_CADA_MAX = 8  # Con --seguimiento en vivo: YOLO al menos cada tantos frames
 
 # Crear carpetas
 os.makedirs(CAPTURAS_DIR, exist_ok=True)
 os.makedirs(LOGS_DIR, exist_ok=True)
 
-# Crear log si no existe
-if not os.path.exists(LOG_FILE):
-    pd.DataFrame(columns=["timestamp", "evento", "clase", "confianza"]).to_csv(LOG_FILE, index=False)
+# Log de eventos: se abre al iniciar (ver __main__) y se escribe por lotes en segundo plano
+eventos = None
+capturas = None
+deduplicador = EventDeduplicator(VENTANA_EVENTOS_S)
 
-# Cargar modelo YOLOv8 (versión ligera)
-model = YOLO("yolov8n.pt")  # Usa yolov8s.pt o yolov8m.pt si quieres más precisión
 
 # ========================
-# LECTURA DE VIDEO
+# DETECCIONES
 # ========================
 
-cap = cv2.VideoCapture(VIDEO_PATH)
-if not cap.isOpened():
-    print(f"[ERROR] No se pudo abrir el video: {VIDEO_PATH}")
-    exit()
+def registrar_persona(frame, conf, fuente=None, track_id=None):
+    """Guarda captura y registra el evento (uno por ventana de tiempo y fuente, o por persona seguida)"""
+    # Varias personas en el frame o la misma persona quieta: un solo evento por ventana
+    key = fuente if track_id is None else (fuente, track_id)
+    if not deduplicador.accept(key):
+        return
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    prefix = "persona_" + "".join(f"{part}_" for part in (fuente, track_id) if part is not None)
+    filename = f"{prefix}{timestamp.replace(':', '-')}.jpg"
+
+    capturas.submit(frame, filename)  # Se codifica y escribe en otro hilo
+    eventos.emit(timestamp, "Persona detectada", "person", round(conf, 2), track_id)
+
+    track = f" - Track {track_id}" if track_id is not None else ""
+    print(f"[ALERTA] Persona detectada{track} - Confianza: {round(conf, 2)}")
 
-while True:
-    ret, frame = cap.read()
-    if not ret:
-        print("[INFO] Fin del video.")
-        break
 
-    # Inferencia
-    results = model(frame)[0]  # Primer frame del batch
+def procesar_detecciones(results, frame, fuente=None):
+    """Registra cada persona detectada por YOLO"""
     for box in results.boxes:
         cls_id = int(box.cls[0])
         conf = float(box.conf[0])
-        label = model.names[cls_id]
+        label = results.names[cls_id]
 
         if label == "person" and conf >= 0.6:
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            filename = f"persona_{timestamp.replace(':', '-')}.jpg"
-            filepath = os.path.join(CAPTURAS_DIR, filename)
+            registrar_persona(frame, conf, fuente)
 
-            cv2.imwrite(filepath, frame)
-            df = pd.DataFrame([[timestamp, "Persona detectada", label, round(conf, 2)]])
-            df.to_csv(LOG_FILE, mode='a', header=False, index=False)
 
-            print(f"[ALERTA] Persona detectada - Confianza: {round(conf, 2)}")
+def procesar_tracks(tracks, names, frame, fuente=None):
+    """Registra cada persona seguida, con su id de track"""
+    for track in tracks:
+        if names[track.cls] == "person" and track.conf >= 0.6:
+            registrar_persona(frame, track.conf, fuente, track.id)
 
-    # Mostrar frame con resultados
-    annotated_frame = results.plot()
-    resized = cv2.resize(annotated_frame, (960, 540))  # o (1280, 720)
-    cv2.imshow("Sistema de Monitoreo - YOLOv8", resized)
 
+def dibujar_tracks(frame, tracks, names):
+    annotated = frame.copy()
+    for track in tracks:
+        x1, y1, x2, y2 = (int(v) for v in track.box)
+        cv2.rectangle(annotated, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        cv2.putText(annotated, f"{names[track.cls]} #{track.id} {track.conf:.2f}", (x1, max(y1 - 6, 12)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+    return annotated
 
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        break
 
-cap.release()
-cv2.destroyAllWindows()
+# ========================
+# LECTURA DE VIDEO
+# ========================
+
+def monitoreo_en_vivo(model, video_path, k_max=1, gate=None):
+    """Monitoreo con ventana; con k_max > 1 YOLO se ejecuta cada K frames (K adaptativo) y un tracker cubre los demás.
+    Con gate, los frames sin movimiento no pasan por YOLO"""
+    detector = TrackingDetector(model, k_max=k_max) if k_max > 1 else None
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        print(f"[ERROR] No se pudo abrir el video: {video_path}")
+        return
+
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            print("[INFO] Fin del video.")
+            break
+
+        # Inferencia
+        if gate and not gate.check(frame):
+            annotated_frame = frame  # Escena quieta: sin YOLO
+        elif detector:
+            tracks, _ = detector.process(frame)
+            procesar_tracks(tracks, detector.names, frame)
+            annotated_frame = dibujar_tracks(frame, tracks, detector.names)
+        else:
+            results = model(frame)[0]  # Primer frame del batch
+            procesar_detecciones(results, frame)
+            annotated_frame = results.plot()
+
+        # Mostrar frame con resultados
+        resized = cv2.resize(annotated_frame, (960, 540))  # o (1280, 720)
+        cv2.imshow("Sistema de Monitoreo - YOLOv8", resized)
+
+
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+
+    cap.release()
+    cv2.destroyAllWindows()
+    if detector:
+        print(f"[INFO] YOLO ejecutado en {detector.detections} de {detector.frames} frames")
+    if gate:
+        gate.report()
+
+
+def monitoreo_offline(model, video_path, batch_size, output_path, seguimiento=False, gate=None):
+    """Procesa el video completo sin ventana: lectura, lotes de YOLO y escritura en paralelo"""
+    on_results = procesar_detecciones
+    if seguimiento:
+        # Los resultados llegan en orden a la etapa de escritura: el tracker solo asigna ids
+        tracker = IoUTracker()
+
+        def on_results(results, frame):
+            procesar_tracks(tracker.update_results(results), results.names, frame)
+
+    pipeline = BatchPipeline(model, video_path, batch_size, output_path, on_results=on_results, gate=gate)
+    stats = pipeline.run()
+    if gate:
+        gate.report()
+    return stats
+
+
+def monitoreo_multiple(sources, workers, batch_size):
+    """Varias cámaras o videos a la vez compartiendo un grupo de workers YOLO"""
+    detections_lock = threading.Lock()  # El log y las capturas se comparten entre workers
+
+    def on_results(stream_id, results, frame):
+        with detections_lock:
+            procesar_detecciones(results, frame, stream_id)
+
+    streams = {f"cam{i}": source for i, source in enumerate(sources)}
+    monitor = MultiStreamMonitor(streams, lambda: YOLO("yolov8n.pt"), workers, batch_size, on_results)
+    return monitor.run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sistema de monitoreo con YOLOv8")
+    parser.add_argument("--video", default=VIDEO_PATH)
+    parser.add_argument("--offline", action="store_true", help="procesar por lotes sin mostrar ventana")
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE, help="frames por lote (offline y --streams)")
+    parser.add_argument("--output", default=None, help="video anotado de salida en modo offline")
+    parser.add_argument("--streams", nargs="+", default=None, metavar="FUENTE",
+                        help="varios videos, URLs RTSP o índices de cámara a la vez")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="instancias de YOLO con --streams")
+    parser.add_argument("--log", default=LOG_FILE, help="log de eventos (.csv, .jsonl o .db)")
+    parser.add_argument("--movimiento", action="store_true",
+                        help="omitir YOLO en los frames sin movimiento (en vivo y offline)")
+    parser.add_argument("--seguimiento", action="store_true",
+                        help="ids de persona en el log; en vivo, YOLO cada K frames con un tracker entre medio")
+    args = parser.parse_args()
+    if args.streams and (args.movimiento or args.seguimiento):
+        # Los workers de MultiStreamMonitor no usan la compuerta ni el tracker
+        parser.error("--movimiento y --seguimiento no se admiten con --streams")
+
+    eventos = EventSink(open_backend(args.log))
+    capturas = SnapshotWriter(CAPTURAS_DIR, HILOS_CAPTURAS)
+
+    try:
+        if args.streams:
+            # Cada worker carga su propia instancia del modelo
+            monitoreo_multiple(args.streams, args.workers, args.batch)
+        else:
+            # Cargar modelo YOLOv8 (versión ligera)
+            model = YOLO("yolov8n.pt")  # Usa yolov8s.pt o yolov8m.pt si quieres más precisión
+            gate = MotionGate() if args.movimiento else None
+
+            if args.offline:
+                monitoreo_offline(model, args.video, args.batch, args.output, args.seguimiento, gate)
+            else:
+                monitoreo_en_vivo(model, args.video, DETECTAR_CADA_MAX if args.seguimiento else 1, gate)
+    finally:
+        capturas.close()
+        eventos.close()  # Escribe los eventos pendientes
+        print(f"[INFO] Detecciones repetidas suprimidas: {deduplicador.suppressed}")
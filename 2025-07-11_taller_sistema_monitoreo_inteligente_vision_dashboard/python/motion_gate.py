@@ -0,0 +1,60 @@
+import cv2
+import numpy as np
+
+# ========================
+# FILTRO DE MOVIMIENTO
+# ========================
+# Antes de YOLO se compara el frame, reducido a escala de grises de 160 px de
+# ancho, con un fondo que se actualiza lentamente (promedio móvil). Si casi
+# ningún píxel cambió, el frame no pasa por el modelo. Tras un cambio se siguen
+# procesando hold_frames frames, y cada max_skip frames se procesa uno aunque
+# no haya movimiento (una persona quieta termina formando parte del fondo).
+
+
+class MotionGate:
+    def __init__(self, width=160, pixel_threshold=25, min_changed=0.002, alpha=0.05,
+                 hold_frames=15, max_skip=150):
+        self.width = width
+        self.pixel_threshold = pixel_threshold  # Diferencia de gris para contar un píxel como cambiado
+        self.min_changed = min_changed  # Fracción de píxeles cambiados que cuenta como movimiento
+        self.alpha = alpha  # Velocidad con que el fondo absorbe los cambios (luz, sombras)
+        self.hold_frames = hold_frames
+        self.max_skip = max_skip
+        self._background = None
+        self._hold = 0
+        self._since_inference = 0
+        self.frames = 0
+        self.skipped = 0
+
+    def _prepare(self, frame):
+        height = max(1, round(frame.shape[0] * self.width / frame.shape[1]))
+        # INTER_LINEAR: INTER_AREA es varias veces más lento y el desenfoque ya suaviza el ruido
+        small = cv2.resize(frame, (self.width, height), interpolation=cv2.INTER_LINEAR)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def check(self, frame):
+        """True si el frame debe pasar por YOLO"""
+        self.frames += 1
+        gray = self._prepare(frame)
+        if self._background is None or self._background.shape != gray.shape:
+            self._background = gray.astype(np.float32)
+            self._hold = self.hold_frames
+        else:
+            diff = cv2.absdiff(gray, cv2.convertScaleAbs(self._background))
+            changed = np.count_nonzero(diff > self.pixel_threshold) / diff.size
+            cv2.accumulateWeighted(gray, self._background, self.alpha)
+            if changed >= self.min_changed:
+                self._hold = self.hold_frames
+
+        if self._hold > 0 or self._since_inference >= self.max_skip:
+            self._hold = max(self._hold - 1, 0)
+            self._since_inference = 0
+            return True
+        self._since_inference += 1
+        self.skipped += 1
+        return False
+
+    def report(self):
+        percent = 100 * self.skipped / self.frames if self.frames else 0.0
+        print(f"[INFO] Frames sin movimiento (sin YOLO): {self.skipped} de {self.frames} ({percent:.1f}%)")
@@ -0,0 +1,194 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+import cv2
+import numpy as np
+
+# ========================
+# MONITOREO DE VARIAS CÁMARAS
+# ========================
+# Cada fuente (video o RTSP) se decodifica en su propio hilo y deja sus frames
+# en una cola corta. Un grupo fijo de workers, cada uno con su instancia de
+# YOLO, arma lotes tomando un frame de cada fuente por turno (round robin):
+# una fuente con muchos frames pendientes no deja sin turno a las demás.
+# Las fuentes en vivo descartan el frame más viejo si la cola está llena; los
+# archivos esperan (no se pierde ningún frame). Si un lector o un worker
+# falla, el error se reporta y la fuente se cierra igual, así run() termina.
+
+
+class FairScheduler:
+    """Colas por fuente y armado de lotes por turnos"""
+
+    def __init__(self, max_pending=2):
+        self.max_pending = max_pending
+        self._cond = threading.Condition()
+        self._queues = OrderedDict()  # fuente → deque de (frame, instante de captura)
+        self._open = set()  # Fuentes que aún pueden enviar frames
+        self._turn = 0
+        self.dropped = {}
+
+    def add_stream(self, stream_id):
+        with self._cond:
+            self._queues[stream_id] = deque()
+            self._open.add(stream_id)
+            self.dropped[stream_id] = 0
+
+    def close_stream(self, stream_id):
+        with self._cond:
+            self._open.discard(stream_id)
+            self._cond.notify_all()
+
+    def put(self, stream_id, frame, live):
+        with self._cond:
+            pending = self._queues[stream_id]
+            if live:
+                if len(pending) >= self.max_pending:
+                    pending.popleft()
+                    self.dropped[stream_id] += 1
+            else:
+                while len(pending) >= self.max_pending:
+                    self._cond.wait()
+            pending.append((frame, time.perf_counter()))
+            self._cond.notify_all()
+
+    def next_batch(self, max_size):
+        """Hasta max_size (fuente, frame, captura); lista vacía cuando todo terminó"""
+        with self._cond:
+            while not any(self._queues.values()):
+                if not self._open:
+                    return []
+                self._cond.wait()
+
+            streams = list(self._queues)
+            batch = []
+            while len(batch) < max_size:
+                taken = False
+                for k in range(len(streams)):
+                    stream_id = streams[(self._turn + k) % len(streams)]
+                    pending = self._queues[stream_id]
+                    if pending and len(batch) < max_size:
+                        batch.append((stream_id,) + pending.popleft())
+                        taken = True
+                if not taken:
+                    break
+            # La siguiente ronda empieza por otra fuente
+            self._turn = (self._turn + 1) % len(streams)
+            self._cond.notify_all()  # Hay espacio para los lectores que esperan
+            return batch
+
+
+class StreamStats:
+    """Frames, latencia captura → resultado y FPS por fuente"""
+
+    def __init__(self, window=500):
+        self._lock = threading.Lock()
+        self.window = window
+        self.frames = {}
+        self.latencies = {}
+        self.start = time.perf_counter()
+
+    def record(self, stream_id, latency_s):
+        with self._lock:
+            self.frames[stream_id] = self.frames.get(stream_id, 0) + 1
+            self.latencies.setdefault(stream_id, deque(maxlen=self.window)).append(latency_s * 1000)
+
+    def report(self, dropped):
+        elapsed = time.perf_counter() - self.start
+        with self._lock:
+            total = sum(self.frames.values())
+            print(f"[INFO] {total} frames en {elapsed:.1f} s → {total / elapsed:.1f} FPS en total")
+            for stream_id, frames in self.frames.items():
+                p50, p95 = np.percentile(self.latencies[stream_id], [50, 95])
+                print(f"[INFO]   {stream_id}: {frames / elapsed:.1f} FPS, latencia p50 {p50:.0f} ms, "
+                      f"p95 {p95:.0f} ms, descartados {dropped.get(stream_id, 0)}")
+
+
+class MultiStreamMonitor:
+    def __init__(self, sources, model_factory, workers=2, batch_size=8, on_results=None, realtime=False):
+        self.sources = sources  # {id: ruta o URL}
+        self.model_factory = model_factory  # Una instancia del modelo por worker
+        self.workers = workers
+        self.batch_size = batch_size
+        self.on_results = on_results  # on_results(stream_id, results, frame), desde los workers
+        self.realtime = realtime  # Archivos a su velocidad original (simula cámaras)
+        self.scheduler = FairScheduler()
+        self.stats = StreamStats()
+
+    @staticmethod
+    def _is_live(source):
+        return str(source).isdigit() or str(source).startswith(("rtsp://", "http://", "https://"))
+
+    def _read_loop(self, stream_id, source):
+        live = self._is_live(source)
+        cap = None
+        try:
+            cap = cv2.VideoCapture(int(source) if str(source).isdigit() else source)
+            if not cap.isOpened():
+                print(f"[ERROR] No se pudo abrir la fuente {stream_id}: {source}")
+                return
+            interval = 1.0 / (cap.get(cv2.CAP_PROP_FPS) or 30.0)
+            next_frame = time.perf_counter()
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if self.realtime and not live:
+                    next_frame += interval
+                    time.sleep(max(0.0, next_frame - time.perf_counter()))
+                self.scheduler.put(stream_id, frame, live)
+            print(f"[INFO] Fin de la fuente {stream_id}")
+        except Exception as e:
+            print(f"[ERROR] Leyendo la fuente {stream_id}: {e}")
+        finally:
+            # Sin esto los workers esperarían frames de la fuente para siempre
+            if cap is not None:
+                cap.release()
+            self.scheduler.close_stream(stream_id)
+
+    def _worker_loop(self):
+        try:
+            model = self.model_factory()
+        except Exception as e:
+            print(f"[ERROR] No se pudo crear el modelo del worker: {e}")
+            return
+        while True:
+            batch = self.scheduler.next_batch(self.batch_size)
+            if not batch:
+                return
+            try:
+                results = model([frame for _, frame, _ in batch], verbose=False)
+            except Exception as e:
+                # Se pierde solo este lote; el worker sigue con los siguientes
+                print(f"[ERROR] Inferencia de un lote de {len(batch)} frames: {e}")
+                continue
+            done = time.perf_counter()
+            for (stream_id, frame, captured), result in zip(batch, results):
+                self.stats.record(stream_id, done - captured)
+                if self.on_results:
+                    try:
+                        self.on_results(stream_id, result, frame)
+                    except Exception as e:
+                        print(f"[ERROR] Procesando detecciones de {stream_id}: {e}")
+
+    def run(self, report_every=5.0):
+        for stream_id in self.sources:
+            self.scheduler.add_stream(stream_id)
+        for stream_id, source in self.sources.items():
+            threading.Thread(target=self._read_loop, args=(stream_id, source),
+                             name=f"lector-{stream_id}", daemon=True).start()
+        workers = [threading.Thread(target=self._worker_loop, name=f"worker-{i}", daemon=True)
+                   for i in range(self.workers)]
+        for worker in workers:
+            worker.start()
+
+        try:
+            while any(worker.is_alive() for worker in workers):
+                for worker in workers:
+                    worker.join(report_every)
+                self.stats.report(self.scheduler.dropped)
+        except KeyboardInterrupt:
+            print("[INFO] Interrumpido por usuario")
+            self.stats.report(self.scheduler.dropped)
+        return self.stats
+
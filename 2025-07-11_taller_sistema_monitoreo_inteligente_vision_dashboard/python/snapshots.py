@@ -0,0 +1,85 @@
+import os
+import queue
+import threading
+import time
+
+import cv2
+
+# ========================
+# CAPTURAS SIN BLOQUEAR LA INFERENCIA
+# ========================
+# EventDeduplicator decide si una detección es un evento nuevo: una misma
+# clave (fuente, o fuente + track) solo genera un evento cada window_s
+# segundos. SnapshotWriter codifica a JPEG y escribe en disco desde un grupo
+# de hilos; si la cola está llena la captura se descarta en vez de frenar el
+# bucle de detección.
+
+_FIN = object()
+
+
+class EventDeduplicator:
+    def __init__(self, window_s=5.0):
+        self.window_s = window_s
+        self._last = {}  # clave → instante del último evento aceptado
+        self.suppressed = 0
+
+    def accept(self, key, now=None):
+        now = time.monotonic() if now is None else now
+        last = self._last.get(key)
+        if last is not None and now - last < self.window_s:
+            self.suppressed += 1
+            return False
+        self._last[key] = now
+        # Olvidar claves viejas (tracks que ya no están)
+        if len(self._last) > 1024:
+            self._last = {k: t for k, t in self._last.items() if now - t < self.window_s}
+        return True
+
+
+class SnapshotWriter:
+    def __init__(self, directory, workers=2, max_pending=16, quality=90):
+        self.directory = directory
+        self.params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.written = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._write_loop, name=f"capturas-{i}", daemon=True)
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, frame, filename):
+        """Encola la captura; retorna False si se descartó por cola llena"""
+        try:
+            self.pending.put_nowait((frame, filename))
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def _write_loop(self):
+        while True:
+            item = self.pending.get()
+            if item is _FIN:
+                return
+            frame, filename = item
+            try:
+                ok, jpeg = cv2.imencode(".jpg", frame, self.params)
+                if not ok:
+                    raise ValueError("no se pudo codificar")
+                with open(os.path.join(self.directory, filename), "wb") as f:
+                    f.write(jpeg.tobytes())
+                with self._lock:
+                    self.written += 1
+            except Exception as e:
+                print(f"[ERROR] Guardando captura {filename}: {e}")
+
+    def close(self):
+        """Espera a que se escriban las capturas pendientes"""
+        for _ in self._threads:
+            self.pending.put(_FIN)
+        for thread in self._threads:
+            thread.join()
+        print(f"[INFO] Capturas guardadas: {self.written}, descartadas por cola llena: {self.dropped}")
@@ -0,0 +1,72 @@
+import threading
+
+import pytest
+
+import batch_pipeline
+from batch_pipeline import BatchPipeline
+from test_multi_stream import FakeCapture
+
+
+class FailingResult:
+    def plot(self):
+        raise RuntimeError("no se pudo anotar")
+
+
+def run_with_timeout(pipeline, timeout=5.0):
+    """Ejecuta run() en otro hilo; retorna (estadísticas, excepción)"""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["stats"] = pipeline.run()
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "run() no terminó"
+    # El lector y el escritor también terminaron
+    assert not any(t.name in ("lector", "escritor") and t.is_alive() for t in threading.enumerate())
+    return outcome.get("stats"), outcome.get("error")
+
+
+@pytest.fixture
+def capture(monkeypatch):
+    options = {}
+    monkeypatch.setattr(batch_pipeline.cv2, "VideoCapture", lambda source: FakeCapture(source, **options))
+    return options
+
+
+def test_run_processes_every_frame(capture):
+    seen = []
+    pipeline = BatchPipeline(lambda frames, verbose: [object()] * len(frames), "a.mp4", batch_size=5,
+                             on_results=lambda results, frame: seen.append(results))
+    stats, error = run_with_timeout(pipeline)
+    assert error is None
+    assert stats["frames"] == 12 and stats["lotes"] == 3
+    assert len(seen) == 12
+
+
+def test_model_error_is_raised_in_the_caller(capture):
+    capture["frames"] = 200  # El lector queda bloqueado en la cola llena
+
+    def model(frames, verbose):
+        raise RuntimeError("sin memoria")
+
+    _, error = run_with_timeout(BatchPipeline(model, "a.mp4", batch_size=2))
+    assert isinstance(error, RuntimeError) and str(error) == "sin memoria"
+
+
+def test_reader_error_is_raised_in_the_caller(capture):
+    capture["fail_at"] = 3
+    _, error = run_with_timeout(BatchPipeline(lambda frames, verbose: [None] * len(frames), "a.mp4"))
+    assert str(error) == "cámara desconectada"
+
+
+def test_writer_error_is_raised_in_the_caller(capture, tmp_path):
+    capture["frames"] = 200
+    pipeline = BatchPipeline(lambda frames, verbose: [FailingResult()] * len(frames), "a.mp4", batch_size=2,
+                             output_path=str(tmp_path / "salida.mp4"))
+    _, error = run_with_timeout(pipeline)
+    assert str(error) == "no se pudo anotar"
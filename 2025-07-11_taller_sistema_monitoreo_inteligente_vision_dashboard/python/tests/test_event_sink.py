@@ -0,0 +1,159 @@
+import csv
+import json
+import sqlite3
+import time
+
+import pytest
+
+from event_sink import COLUMNS, CsvBackend, EventSink, SqliteBackend, open_backend
+
+OLD_COLUMNS = COLUMNS[:4]  # Formato anterior a la columna track
+
+
+def test_csv_written_before_track_is_migrated(tmp_path):
+    path = tmp_path / "eventos.csv"
+    path.write_text("timestamp,evento,clase,confianza\n2025-07-11_10-00-00,persona_detectada,person,0.90\n",
+                    encoding="utf-8")
+    sink = EventSink(CsvBackend(str(path)))
+    sink.emit("2025-07-11_10-00-05", "persona_detectada", "person", "0.80", 7)
+    sink.close()
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows == [list(COLUMNS),
+                    ["2025-07-11_10-00-00", "persona_detectada", "person", "0.90", ""],
+                    ["2025-07-11_10-00-05", "persona_detectada", "person", "0.80", "7"]]
+
+
+def test_sqlite_table_without_track_gets_the_column(tmp_path):
+    path = str(tmp_path / "eventos.db")
+    conn = sqlite3.connect(path)
+    conn.execute(f"CREATE TABLE eventos ({', '.join(OLD_COLUMNS)})")
+    conn.execute("INSERT INTO eventos VALUES ('t0', 'persona_detectada', 'person', '0.90')")
+    conn.commit()
+    conn.close()
+
+    sink = EventSink(SqliteBackend(path))
+    sink.emit("t1", "persona_detectada", "person", "0.80", 7)
+    sink.close()
+
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT timestamp, track FROM eventos ORDER BY timestamp").fetchall()
+    conn.close()
+    assert rows == [("t0", None), ("t1", 7)]
+    assert sink.written == 1
+
+
+def test_csv_with_unrelated_columns_is_rejected(tmp_path):
+    path = tmp_path / "otro.csv"
+    path.write_text("fecha,valor\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        CsvBackend(str(path))
+    assert path.read_text(encoding="utf-8") == "fecha,valor\n"
+
+
+ROWS = [("2025-07-11_10-00-00", "persona_detectada", "person", "0.90", ""),
+        ("2025-07-11_10-00-01", "persona_detectada", "person", "0.85", 3)]
+
+
+def read_rows(path):
+    """Filas del log como tuplas de texto, sin encabezado"""
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            return [tuple(row) for row in csv.reader(f)][1:]
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            return [tuple(str(event[column]) for column in COLUMNS) for event in map(json.loads, f)]
+    conn = sqlite3.connect(path)
+    rows = conn.execute(f"SELECT {', '.join(COLUMNS)} FROM eventos").fetchall()
+    conn.close()
+    return [tuple(str(value) for value in row) for row in rows]
+
+
+@pytest.mark.parametrize("extension", [".csv", ".jsonl", ".db"])
+def test_every_backend_keeps_all_rows(tmp_path, extension):
+    path = str(tmp_path / f"eventos{extension}")
+    sink = EventSink(open_backend(path))
+    for row in ROWS:
+        sink.emit(*row)
+    sink.close()
+    assert sink.written == len(ROWS)
+    assert read_rows(path) == [tuple(str(value) for value in row) for row in ROWS]
+
+
+def test_reopened_csv_appends_without_repeating_the_header(tmp_path):
+    path = str(tmp_path / "eventos.csv")
+    for row in ROWS:
+        sink = EventSink(open_backend(path))
+        sink.emit(*row)
+        sink.close()
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(COLUMNS)
+    assert len(rows) == 1 + len(ROWS)
+
+
+def test_sqlite_uses_wal(tmp_path):
+    backend = SqliteBackend(str(tmp_path / "eventos.db"))
+    assert backend.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    backend.close()
+
+
+def test_unknown_extension_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        open_backend(str(tmp_path / "eventos.txt"))
+
+
+class CountingBackend:
+    def __init__(self):
+        self.batches = []
+        self.closed = False
+
+    def write(self, rows):
+        self.batches.append(list(rows))
+
+    def close(self):
+        self.closed = True
+
+
+def test_full_buffer_is_written_as_one_batch_without_waiting_for_the_interval():
+    backend = CountingBackend()
+    sink = EventSink(backend, max_batch=4, flush_interval=60.0)
+    for n in range(4):
+        sink.emit(n)
+    deadline = time.monotonic() + 2.0
+    while not backend.batches and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert backend.batches == [[(0,), (1,), (2,), (3,)]]
+    sink.close()
+
+
+def test_close_writes_pending_rows_and_closes_the_backend():
+    backend = CountingBackend()
+    sink = EventSink(backend, max_batch=1000, flush_interval=60.0)
+    sink.emit("a")
+    sink.emit("b")
+    sink.close()
+    assert [row for batch in backend.batches for row in batch] == [("a",), ("b",)]
+    assert backend.closed
+    sink.close()  # Cerrar dos veces no falla
+
+
+def test_write_errors_do_not_stop_the_sink():
+    class FailingOnce(CountingBackend):
+        def write(self, rows):
+            if not self.batches:
+                self.batches.append(None)
+                raise OSError("disco lleno")
+            super().write(rows)
+
+    backend = FailingOnce()
+    sink = EventSink(backend, max_batch=1, flush_interval=60.0)
+    sink.emit("perdido")
+    deadline = time.monotonic() + 2.0
+    while not backend.batches and time.monotonic() < deadline:
+        time.sleep(0.005)
+    sink.emit("escrito")
+    sink.close()
+    assert backend.batches[1:] == [[("escrito",)]]
+    assert sink.written == 1
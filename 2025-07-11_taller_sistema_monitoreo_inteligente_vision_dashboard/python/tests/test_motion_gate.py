@@ -0,0 +1,65 @@
+import numpy as np
+
+from motion_gate import MotionGate
+
+
+def still_frame():
+    frame = np.full((360, 640, 3), 90, np.uint8)
+    frame[100:200, 100:300] = 160  # Fondo con algo de estructura
+    return frame
+
+
+def moving_frame(n):
+    frame = still_frame()
+    x = 50 + 20 * n
+    frame[200:320, x:x + 60] = 250  # Objeto que se desplaza
+    return frame
+
+
+def run(gate, frames):
+    return [gate.check(frame) for frame in frames]
+
+
+def test_static_scene_is_skipped_after_the_hold():
+    gate = MotionGate(hold_frames=5, max_skip=1000)
+    decisions = run(gate, [still_frame()] * 30)
+    # El primer frame inicializa el fondo y abre la ventana de hold_frames
+    assert decisions[:5] == [True] * 5
+    assert not any(decisions[5:])
+    assert gate.skipped == 25 and gate.frames == 30
+
+
+def test_motion_reopens_the_gate_for_hold_frames():
+    gate = MotionGate(hold_frames=5, max_skip=1000)
+    run(gate, [still_frame()] * 20)
+    moving = run(gate, [moving_frame(n) for n in range(10)])
+    assert all(moving)
+    after = run(gate, [still_frame()] * 20)
+    # La ventana de hold_frames incluye el último frame con movimiento
+    assert after[:4] == [True] * 4
+    assert not any(after[4:])
+
+
+def test_small_noise_does_not_count_as_motion():
+    gate = MotionGate(hold_frames=3, max_skip=1000)
+    rng = np.random.default_rng(0)
+    frames = [np.clip(still_frame().astype(int) + rng.integers(-8, 9, (360, 640, 3)), 0, 255).astype(np.uint8)
+              for _ in range(20)]
+    decisions = run(gate, frames)
+    assert not any(decisions[3:])
+
+
+def test_max_skip_forces_a_periodic_inference():
+    gate = MotionGate(hold_frames=1, max_skip=10)
+    decisions = run(gate, [still_frame()] * 45)
+    forced = [n for n, infer in enumerate(decisions) if infer]
+    assert forced == [0, 11, 22, 33, 44]
+
+
+def test_resolution_change_resets_the_background():
+    gate = MotionGate(hold_frames=2, max_skip=1000)
+    run(gate, [still_frame()] * 10)
+    # Otra proporción: la imagen reducida cambia de forma y el fondo se reinicia
+    square = np.full((480, 480, 3), 90, np.uint8)
+    decisions = run(gate, [square] * 3)
+    assert decisions == [True, True, False]
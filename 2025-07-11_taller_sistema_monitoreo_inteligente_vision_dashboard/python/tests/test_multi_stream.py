@@ -0,0 +1,124 @@
+import threading
+from collections import Counter
+
+import numpy as np
+
+import multi_stream
+from multi_stream import FairScheduler, MultiStreamMonitor
+
+
+def fill(scheduler, stream_id, count, live=True):
+    for n in range(count):
+        scheduler.put(stream_id, (stream_id, n), live)
+
+
+def test_batches_alternate_between_streams():
+    scheduler = FairScheduler(max_pending=100)
+    for stream_id in ("a", "b", "c"):
+        scheduler.add_stream(stream_id)
+    fill(scheduler, "a", 30)  # Fuente con muchos frames pendientes
+    fill(scheduler, "b", 3)
+    fill(scheduler, "c", 3)
+
+    batch = scheduler.next_batch(6)
+    assert Counter(stream_id for stream_id, _, _ in batch) == {"a": 2, "b": 2, "c": 2}
+    # Dentro de cada fuente se respeta el orden de llegada
+    assert [frame for stream_id, frame, _ in batch if stream_id == "a"] == [("a", 0), ("a", 1)]
+
+
+def test_small_batches_rotate_the_first_stream():
+    scheduler = FairScheduler(max_pending=100)
+    for stream_id in ("a", "b", "c"):
+        scheduler.add_stream(stream_id)
+        fill(scheduler, stream_id, 10)
+    firsts = [scheduler.next_batch(1)[0][0] for _ in range(6)]
+    assert firsts == ["a", "b", "c", "a", "b", "c"]
+
+
+def test_live_stream_drops_oldest_frame():
+    scheduler = FairScheduler(max_pending=2)
+    scheduler.add_stream("cam")
+    fill(scheduler, "cam", 5, live=True)
+    assert [frame for _, frame, _ in scheduler.next_batch(8)] == [("cam", 3), ("cam", 4)]
+    assert scheduler.dropped["cam"] == 3
+
+
+def test_file_stream_waits_instead_of_dropping():
+    scheduler = FairScheduler(max_pending=2)
+    scheduler.add_stream("file")
+    reader = threading.Thread(target=fill, args=(scheduler, "file", 6, False))
+    reader.start()
+    received = []
+    while len(received) < 6:
+        received += [frame for _, frame, _ in scheduler.next_batch(1)]
+    reader.join(1.0)
+    assert received == [("file", n) for n in range(6)]
+    assert scheduler.dropped["file"] == 0
+
+
+def test_next_batch_ends_when_streams_are_closed_and_empty():
+    scheduler = FairScheduler()
+    scheduler.add_stream("a")
+    fill(scheduler, "a", 1)
+    scheduler.close_stream("a")
+    assert len(scheduler.next_batch(4)) == 1
+    assert scheduler.next_batch(4) == []
+
+
+class FakeCapture:
+    """Entrega frames negros; con fail_at lanza una excepción en ese read()"""
+
+    def __init__(self, source, frames=12, fail_at=None):
+        self.frames = frames
+        self.fail_at = fail_at
+        self.reads = 0
+
+    def isOpened(self):
+        return True
+
+    def get(self, prop):
+        return 30.0
+
+    def read(self):
+        self.reads += 1
+        if self.reads == self.fail_at:
+            raise RuntimeError("cámara desconectada")
+        if self.reads > self.frames:
+            return False, None
+        return True, np.zeros((4, 4, 3), np.uint8)
+
+    def release(self):
+        pass
+
+
+def run_with_timeout(monitor, timeout=5.0):
+    thread = threading.Thread(target=monitor.run, kwargs={"report_every": 0.2}, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "run() no terminó"
+
+
+def test_run_finishes_when_a_reader_fails(monkeypatch):
+    captures = {"ok.mp4": {}, "falla.mp4": {"fail_at": 3}}
+    monkeypatch.setattr(multi_stream.cv2, "VideoCapture", lambda source: FakeCapture(source, **captures[source]))
+    seen = Counter()
+    monitor = MultiStreamMonitor({"ok": "ok.mp4", "falla": "falla.mp4"},
+                                 lambda: (lambda frames, verbose: [None] * len(frames)),
+                                 on_results=lambda stream_id, result, frame: seen.update([stream_id]))
+    run_with_timeout(monitor)
+    assert seen == {"ok": 12, "falla": 2}
+
+
+def test_run_finishes_when_the_model_fails(monkeypatch):
+    monkeypatch.setattr(multi_stream.cv2, "VideoCapture", lambda source: FakeCapture(source))
+    calls = Counter()
+
+    def model(frames, verbose):
+        calls["lotes"] += 1
+        if calls["lotes"] == 1:
+            raise RuntimeError("sin memoria")
+        return [None] * len(frames)
+
+    monitor = MultiStreamMonitor({"a": "a.mp4"}, lambda: model, workers=1, batch_size=2)
+    run_with_timeout(monitor)
+    assert calls["lotes"] > 1  # El worker siguió después del error
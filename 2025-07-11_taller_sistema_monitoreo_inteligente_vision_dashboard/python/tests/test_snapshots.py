@@ -0,0 +1,37 @@
+from snapshots import EventDeduplicator
+
+
+def test_same_key_is_suppressed_within_the_window():
+    dedup = EventDeduplicator(window_s=5.0)
+    assert dedup.accept("cam0", now=100.0)
+    assert not dedup.accept("cam0", now=101.0)
+    assert not dedup.accept("cam0", now=104.9)
+    assert dedup.accept("cam0", now=105.0)
+    assert dedup.suppressed == 2
+
+
+def test_window_restarts_from_the_last_accepted_event():
+    dedup = EventDeduplicator(window_s=5.0)
+    assert dedup.accept("cam0", now=0.0)
+    assert not dedup.accept("cam0", now=4.0)  # Suprimido: no reinicia la ventana
+    assert dedup.accept("cam0", now=5.0)
+    assert not dedup.accept("cam0", now=9.0)
+
+
+def test_keys_are_independent():
+    dedup = EventDeduplicator(window_s=5.0)
+    assert dedup.accept(("cam0", 1), now=0.0)
+    assert dedup.accept(("cam0", 2), now=1.0)
+    assert dedup.accept(("cam1", 1), now=1.0)
+    assert not dedup.accept(("cam0", 1), now=2.0)
+
+
+def test_old_keys_are_forgotten_without_breaking_recent_ones():
+    dedup = EventDeduplicator(window_s=5.0)
+    for track in range(1100):
+        dedup.accept(track, now=track * 0.001)
+    now = 1100 * 0.001 + 4.0
+    assert not dedup.accept(1099, now=now)  # Reciente: sigue en la ventana
+    assert len(dedup._last) <= 1100
+    dedup.accept("nueva", now=1000.0)
+    assert len(dedup._last) == 1
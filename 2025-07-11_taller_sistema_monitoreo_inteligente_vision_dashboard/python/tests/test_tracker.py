@@ -0,0 +1,109 @@
+import numpy as np
+
+from tracker import IoUTracker, TrackingDetector, iou_matrix
+
+PERSON, CAR = 0, 1
+
+
+def detections(*boxes, cls=PERSON):
+    boxes = np.array(boxes, dtype=float).reshape(-1, 4)
+    return boxes, np.full(len(boxes), 0.9), np.full(len(boxes), cls, dtype=int)
+
+
+def ids(tracks):
+    return sorted(track.id for track in tracks)
+
+
+def test_iou_matrix():
+    a = np.array([[0, 0, 10, 10]], dtype=float)
+    b = np.array([[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30]], dtype=float)
+    np.testing.assert_allclose(iou_matrix(a, b), [[1.0, 50 / 150, 0.0]])
+
+
+def test_moving_boxes_keep_their_ids():
+    tracker = IoUTracker()
+    first = tracker.update(*detections([0, 0, 10, 20], [100, 0, 110, 20]))
+    assert ids(first) == [1, 2]
+    for step in range(1, 10):
+        tracks = tracker.update(*detections([100 + 2 * step, 0, 110 + 2 * step, 20],
+                                            [2 * step, 0, 10 + 2 * step, 20]))
+        by_x = sorted(tracks, key=lambda track: track.box[0])
+        assert [track.id for track in by_x] == [1, 2]
+    assert not tracker.changed
+
+
+def test_each_detection_goes_to_the_best_overlapping_track():
+    tracker = IoUTracker()
+    tracker.update(*detections([0, 0, 10, 10], [8, 0, 18, 10]))
+    # Ambas cajas se solapan con los dos tracks; la asociación es por mayor IoU
+    tracks = tracker.update(*detections([7, 0, 17, 10], [1, 0, 11, 10]))
+    assert {track.id: track.box[0] for track in tracks} == {1: 1.0, 2: 7.0}
+
+
+def test_classes_are_not_mixed():
+    tracker = IoUTracker()
+    tracker.update(*detections([0, 0, 10, 10]))
+    tracks = tracker.update(*detections([0, 0, 10, 10], cls=CAR))
+    assert ids(tracks) == [2]
+    assert tracker.changed
+
+
+def test_tracks_survive_a_few_misses_then_are_dropped():
+    tracker = IoUTracker(max_misses=2)
+    tracker.update(*detections([0, 0, 10, 10]))
+    empty = detections()
+    for _ in range(2):
+        assert tracker.update(*empty) == []
+        assert ids(tracker.tracks) == [1]  # Sigue guardado, aunque no visible
+    tracks = tracker.update(*detections([0, 0, 10, 10]))
+    assert ids(tracks) == [1]
+    for _ in range(3):
+        tracker.update(*empty)
+    assert tracker.tracks == []
+    assert tracker.changed
+
+
+def test_predict_moves_tracks_with_their_velocity():
+    tracker = IoUTracker()
+    tracker.update(*detections([0, 0, 10, 10]))
+    tracker.update(*detections([4, 0, 14, 10]))
+    (track,) = tracker.predict()
+    assert track.box[0] > 4
+
+
+class FakeResults:
+    def __init__(self, boxes):
+        self.boxes = boxes
+        self.names = {PERSON: "person"}
+
+
+class FakeBoxes:
+    class _Tensor:
+        def __init__(self, array):
+            self.array = np.asarray(array)
+
+        def cpu(self):
+            return self
+
+        def numpy(self):
+            return self.array
+
+    def __init__(self, boxes):
+        self.xyxy = self._Tensor(np.array(boxes, dtype=float).reshape(-1, 4))
+        self.conf = self._Tensor(np.full(len(self.xyxy.array), 0.9))
+        self.cls = self._Tensor(np.zeros(len(self.xyxy.array)))
+
+
+def test_detector_skips_yolo_while_the_scene_is_still():
+    calls = []
+
+    def model(frame, verbose):
+        calls.append(frame)
+        return [FakeResults(FakeBoxes([[0, 0, 10, 40]]))]
+
+    detector = TrackingDetector(model, k_max=4)
+    ran = [detector.process(n)[1] for n in range(20)]
+    assert ran[:2] == [True, True]
+    assert sum(ran) < 20
+    assert detector.k == 4
+    assert len(calls) == detector.detections == sum(ran)
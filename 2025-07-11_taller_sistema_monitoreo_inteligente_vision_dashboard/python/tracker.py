@@ -0,0 +1,148 @@
+import numpy as np
+
+# ========================
+# SEGUIMIENTO ENTRE DETECCIONES
+# ========================
+# IoUTracker asocia las cajas de YOLO con los tracks del frame anterior por
+# IoU (como SORT, con velocidad constante en lugar de filtro de Kalman) y le da
+# a cada objeto un id estable. TrackingDetector ejecuta YOLO solo cada K frames
+# y en los intermedios mueve los tracks según su velocidad. K se adapta al
+# movimiento de la escena: sube mientras los objetos casi no se mueven y baja
+# cuando se mueven rápido o aparecen/desaparecen objetos.
+
+
+def iou_matrix(a, b):
+    """IoU entre cada caja de a (n, 4) y de b (m, 4), en formato x1, y1, x2, y2"""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+class Track:
+    def __init__(self, track_id, box, conf, cls):
+        self.id = track_id
+        self.box = box  # Posición actual (detectada o estimada)
+        self.conf = conf
+        self.cls = cls
+        self.velocity = np.zeros(4)  # Desplazamiento de la caja por frame
+        self.misses = 0  # Detecciones seguidas sin asociar
+        self._detected_box = box
+        self._frames_since_detection = 0
+
+    def predict(self):
+        self.box = self.box + self.velocity
+        self._frames_since_detection += 1
+
+    def correct(self, box, conf):
+        elapsed = max(self._frames_since_detection, 1)
+        measured = (box - self._detected_box) / elapsed
+        self.velocity = 0.5 * self.velocity + 0.5 * measured
+        self.box = self._detected_box = box
+        self.conf = conf
+        self.misses = 0
+        self._frames_since_detection = 0
+
+    def motion(self):
+        """Desplazamiento del centro por frame, relativo al alto de la caja"""
+        dx = (self.velocity[0] + self.velocity[2]) / 2
+        dy = (self.velocity[1] + self.velocity[3]) / 2
+        return float(np.hypot(dx, dy) / max(self.box[3] - self.box[1], 1.0))
+
+
+class IoUTracker:
+    def __init__(self, iou_threshold=0.3, max_misses=3):
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses  # Detecciones sin asociar antes de olvidar el track
+        self.tracks = []
+        self._next_id = 1
+        self.changed = False  # En la última detección aparecieron o se perdieron tracks
+
+    def predict(self):
+        for track in self.tracks:
+            track.predict()
+        return self.visible()
+
+    def update(self, boxes, confs, classes):
+        """Asocia las detecciones de un frame (sin predict previo en ese frame)"""
+        for track in self.tracks:
+            track.predict()
+        unmatched = set(range(len(boxes)))
+        if self.tracks and len(boxes):
+            iou = iou_matrix(np.array([t.box for t in self.tracks]), boxes)
+            iou[np.array([t.cls for t in self.tracks])[:, None] != classes[None, :]] = 0
+            # Asociación golosa: primero los pares con mayor IoU
+            while True:
+                t, d = np.unravel_index(np.argmax(iou), iou.shape)
+                if iou[t, d] < self.iou_threshold:
+                    break
+                self.tracks[t].correct(boxes[d], float(confs[d]))
+                self.tracks[t].misses = -1  # Marca de asociado en este frame
+                unmatched.discard(d)
+                iou[t, :] = 0
+                iou[:, d] = 0
+
+        lost = 0
+        for track in self.tracks:
+            track.misses += 1
+            lost += track.misses > self.max_misses
+        self.tracks = [t for t in self.tracks if t.misses <= self.max_misses]
+        for d in sorted(unmatched):
+            track = Track(self._next_id, boxes[d], float(confs[d]), int(classes[d]))
+            self._next_id += 1
+            self.tracks.append(track)
+        self.changed = bool(lost or unmatched)
+        return self.visible()
+
+    def update_results(self, results):
+        """update() con las cajas de un resultado de YOLO"""
+        boxes = results.boxes
+        return self.update(boxes.xyxy.cpu().numpy().astype(float), boxes.conf.cpu().numpy(),
+                           boxes.cls.cpu().numpy().astype(int))
+
+    def visible(self):
+        """Tracks asociados en la última detección"""
+        return [t for t in self.tracks if t.misses == 0]
+
+
+class TrackingDetector:
+    def __init__(self, model, tracker=None, k_max=8, slow=0.02, fast=0.08):
+        self.model = model
+        self.tracker = tracker or IoUTracker()
+        self.k_max = k_max
+        self.slow = slow  # Movimiento entre detecciones (fracción del alto) para espaciarlas más
+        self.fast = fast  # ... y para volver a detectar más seguido
+        self.k = 1
+        self.names = {}
+        self._since_detection = 0
+        self.frames = 0
+        self.detections = 0
+
+    def process(self, frame):
+        """Tracks visibles en el frame; retorna (tracks, si se ejecutó YOLO)"""
+        self.frames += 1
+        if self._since_detection + 1 < self.k:
+            self._since_detection += 1
+            return self.tracker.predict(), False
+
+        results = self.model(frame, verbose=False)[0]
+        self.names = results.names
+        tracks = self.tracker.update_results(results)
+        self._since_detection = 0
+        self.detections += 1
+        self._adapt(tracks)
+        return tracks, True
+
+    def _adapt(self, tracks):
+        if self.tracker.changed:
+            self.k = 1
+            return
+        motion = max((t.motion() for t in tracks), default=0.0) * self.k
+        if motion > self.fast:
+            self.k = max(1, self.k // 2)
+        elif motion < self.slow:
+            self.k = min(self.k_max, self.k + 1)